@@ -1,205 +1,296 @@
-import json
-import warnings
+import argparse
+import logging
 import os
-import time
-from datetime import datetime
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 
-import pandas as pd
 from tqdm import tqdm
 
-from classes.competition import Competition
+from classes.async_crawl_engine import AsyncCrawlEngine
 from classes.competition_scraper import CompetitionScraper
-from classes.player import Player
+from classes.crawl_journal import CrawlJournal
+from classes.crawl_logging import add_logging_arguments, configure_logging
+from classes.delta_refresh import DeltaRefresh
+from classes.http_client import HttpClient
+from classes.jsonl_writer import COMPRESSIONS, EXTENSIONS, JsonlWriter
+from classes.metrics import PROFILERS, STAGES, CrawlMetrics, StageProfiler, set_default_metrics
+from classes.performance_refresh import PERFORMANCE_MODES, PerformanceRefresh
+from classes.pipeline_crawl_engine import PipelineCrawlEngine
+from classes.player_registry import DEFAULT_MAX_PLAYERS, PlayerRegistry
 from classes.player_scraper import PlayerScraper
+from classes.rate_limiter import RateLimiter
+from classes.response_cache import ResponseCache
 from classes.team import Team
 from classes.team_scraper import TeamScraper
-from helpers import extract_team_id, player_to_dict, convert_to_serializable
+from classes.table_export import export_rows
+from crawler import (DEFAULT_COMPETITIONS, JSONL_FILENAME, OUTPUT_DIR, crawl_team_rows, ensure_output_dir, fetch_squad,
+                     finish_team, load_competitions, team_filename, team_is_finished, team_key)
+from export_tables import load_rows
+from helpers import DEFAULT_PARSER, PARSERS, extract_team_id
 
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
-def log_progress(message):
-    """Loggt eine Nachricht mit Zeitstempel."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] {message}")
-
-# Erstelle output Verzeichnis falls es nicht existiert
-if not os.path.exists('output'):
-    os.makedirs('output')
-
-# Competitions laden
-log_progress("Lade Competitions aus JSON...")
-df_comp = pd.read_json("competitions_tm_germany.json")
-
-# nur comp 0,1,2,5
-df_comp = df_comp[df_comp["name"].isin(["Bundesliga", "2. Bundesliga", "3. Liga", "Regionalliga West"])]
-
-competitions = []
-for _, row in df_comp.iterrows():
-    competition = Competition(
-        name=row["name"],
-        base_url=row["url"],
-        season=2024
-    )
-    competitions.append(competition)
-
-# CompetitionScraper um Teams zu holen
-log_progress("Starte CompetitionScraper...")
-c_scraper = CompetitionScraper(competitions)
-c_scraper.scrape_all()
-
-all_rows = []
-player_scraper = PlayerScraper()
-
-competition_progress = tqdm(competitions, desc="Competitions", unit="competition")
-
-for comp in competition_progress:
-    competition_name = comp.name
-    competition_season = comp.season
-    competition_url = comp.get_season_url()
-    competition_id = comp.competition_id
-
-    log_progress(f"Starte Scraping für Competition: {competition_name}")
-
-    # Teams scrapen
-    teams = comp.teams.items()
-    team_progress = tqdm(teams, desc=f"Teams in {comp.name}", unit="team", leave=False)
-    for team_name, team_url in team_progress:
-        team_id = extract_team_id(team_url)
-        team_obj = Team(name=team_name, url=team_url, team_id=team_id)
-
-        # Prüfe, ob das Team bereits gespeichert wurde
-        team_filename = f"output/{competition_name}_{team_name}_{team_id}.json"
-        if os.path.exists(team_filename):
-            log_progress(f"Team {team_name} ({team_id}) bereits vorhanden, überspringe...")
-            continue
-
-        log_progress(f"Starte Scraping für Team: {team_name} ({team_id})")
-        t_scraper = TeamScraper(team_obj)
-        try:
-            player_basic_info_list = t_scraper.fetch_player_urls()
-            log_progress(f"Gefundene Spieler für {team_name}: {len(player_basic_info_list)}")
-        except Exception as e:
-            log_progress(f"FEHLER beim Abrufen der Spieler für Team {team_name}: {str(e)}")
-            continue
-
-        team_rows = []  # Liste für die Spieler des aktuellen Teams
-
-        # Jeden Spieler flach machen
-        for p_info in player_basic_info_list:
-            try:
-                p_obj = Player(player_id=p_info["player_id"], player_url=p_info["player_url"])
-                player_url_name = p_info["player_url"].split("/")[-4]
-
-                log_progress(f"Starte Scraping für Spieler: {player_url_name} ({p_info['player_id']})")
-                
-                # Hole alle Stammdaten in einem Durchgang
-                basic_data = player_scraper.scrape_all_basic_data(p_obj.player_url)
-                if basic_data is None:
-                    log_progress(f"FEHLER: Konnte keine Stammdaten für Spieler {p_obj.player_id} holen")
-                    continue
-
-                log_progress(f"Stammdaten erfolgreich für {player_url_name}")
-
-                # Setze die Stammdaten
-                p_obj.set_name(basic_data['name'])
-                p_obj.set_birthday_height(basic_data['birthday'], basic_data['height'])
-                p_obj.set_nationalities(basic_data['nationalities'])
-                p_obj.set_positions(basic_data['main_position'], basic_data['side_positions'])
-                p_obj.set_preferred_foot(basic_data['preferred_foot'])
-                p_obj.set_social_media(basic_data['social_media'])
-                p_obj.set_contract_info(
-                    basic_data['current_club'],
-                    basic_data['in_team_since'],
-                    basic_data['contract_until'],
-                    basic_data['last_extension']
-                )
-                p_obj.set_player_agent(basic_data['player_agent'])
-                p_obj.set_birth_place(basic_data['birth_place'])
-
-                # Hole die zusätzlichen Daten
-                log_progress(f"Hole Marktwert-Historie für {player_url_name}")
-                try:
-                    p_obj.set_market_value_history(player_scraper.scrape_market_value_history(p_obj.player_id))
-                    if p_obj.market_value_history is not None and not p_obj.market_value_history.empty:
-                        p_obj.set_market_value(p_obj.market_value_history["mw"].iloc[-1])
-                    else:
-                        p_obj.set_market_value(None)
-                except Exception as e:
-                    log_progress(f"FEHLER bei Marktwert-Historie für {player_url_name}: {e}")
-                    p_obj.set_market_value_history(pd.DataFrame())
-                    p_obj.set_market_value(None)
-
-                log_progress(f"Hole Leistungsdaten für {player_url_name}")
-                try:
-                    performance_data = player_scraper.scrape_performance_data(p_obj.player_id, p_obj.player_url)
-                    p_obj.set_performance_data(performance_data if performance_data else [])
-                except Exception as e:
-                    log_progress(f"FEHLER bei Leistungsdaten für {player_url_name}: {e}")
-                    p_obj.set_performance_data([])
-
-                # player_data holen
-                player_data = player_to_dict(p_obj)
-
-                # Komplexe Felder in JSON-Strings umwandeln
-                def to_json_str(value):
-                    if value is None:
-                        return None
-                    if isinstance(value, pd.DataFrame):
-                        return value.to_dict(orient='records')
-                    if isinstance(value, list):
-                        # Prüfe den Typ, den wir zurückgeben
-                        log_progress(f"Performance-Daten Typ: {type(value)}")
-                        return value  # Liste direkt zurückgeben, da sie bereits das richtige Format hat
-                    return json.dumps(value, ensure_ascii=False)
-
-                # Debug-Ausgabe für den Performance-Daten-Typ
-                if player_data["performance_data"] is not None:
-                    log_progress(f"Performance-Daten-Typ für {player_url_name}: {type(player_data['performance_data'])}")
-                
-                row = {
-                    "competition_name": competition_name,
-                    "competition_season": competition_season,
-                    "competition_url": competition_url,
-                    "competition_id": competition_id,
-                    "team_name": team_name,
-                    "team_id": team_id,
-                    "team_url": team_url,
-                    "player_id": player_data["player_id"],
-                    "player_name": player_data["player_name"],
-                    "player_url": player_data["player_url"],
-                    "birthday": player_data["birthday"],
-                    "height": player_data["height"],
-                    "nationalities": to_json_str(player_data["nationalities"]),
-                    "main_position": player_data["main_position"],
-                    "side_positions": to_json_str(player_data["side_positions"]),
-                    "preferred_foot": player_data["preferred_foot"],
-                    "social_media": to_json_str(player_data["social_media"]),
-                    "market_value": player_data["market_value"],
-                    "market_value_history": to_json_str(player_data["market_value_history"]),
-                    "current_club": player_data["current_club"],
-                    "in_team_since": player_data["in_team_since"],
-                    "contract_until": player_data["contract_until"],
-                    "last_extension": player_data["last_extension"],
-                    "player_agent": player_data["player_agent"],
-                    "birth_place": player_data["birth_place"],
-                    "performance_data": player_data["performance_data"]  # Direkt verwenden, keine Konvertierung
-                }
-
-                team_rows.append(row)
-                all_rows.append(row)
-                log_progress(f"Spieler {player_url_name} erfolgreich verarbeitet")
+logger = logging.getLogger("app")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scraped Spielerprofile von transfermarkt.de")
+    parser.add_argument("--competitions-file", default="competitions_tm_germany.json",
+                        help="JSON-Datei mit den Competitions")
+    parser.add_argument("--competition", action="append", dest="competitions",
+                        help="Name einer Competition (mehrfach möglich, Standard: die vier Ligen aus app.py)")
+    parser.add_argument("--season", type=int, default=2024)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--output-format", choices=["json", "jsonl"], default="json",
+                        help="json: eine Datei pro Team, jsonl: ein Strom mit einer Zeile pro Spieler")
+    parser.add_argument("--compression", choices=COMPRESSIONS, default="none",
+                        help="Kompression des JSONL-Stroms (zstd benötigt das Paket zstandard)")
+    parser.add_argument("--engine", choices=["sequential", "threads", "async", "pipeline"], default="sequential",
+                        help="sequential: ein Spieler nach dem anderen, threads: Spieler eines Teams im Thread-Pool, "
+                             "async: nebenläufige Crawl-Engine, pipeline: Stufen mit eigenen Workern und "
+                             "begrenzten Warteschlangen")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Anzahl gleichzeitig verarbeiteter Spieler (nur --engine threads)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Maximale Anzahl gleichzeitiger Scraping-Tasks (nur --engine async)")
+    parser.add_argument("--competition-workers", type=int, default=1,
+                        help="Threads, die Teamlisten der Competitions holen (nur --engine pipeline)")
+    parser.add_argument("--team-workers", type=int, default=2,
+                        help="Threads, die Kader holen (nur --engine pipeline)")
+    parser.add_argument("--player-workers", type=int, default=8,
+                        help="Threads, die Spieler scrapen (nur --engine pipeline)")
+    parser.add_argument("--queue-size", type=int, default=64,
+                        help="Maximale Länge der Warteschlangen zwischen den Stufen (nur --engine pipeline)")
+    parser.add_argument("--requests-per-second", type=float, default=0.5,
+                        help="Maximale Rate für HTML-Seiten pro Host (0 = unbegrenzt)")
+    parser.add_argument("--api-requests-per-second", type=float, default=1.0,
+                        help="Maximale Rate für die Marktwert-API pro Host (0 = unbegrenzt)")
+    parser.add_argument("--base-url", default=None,
+                        help="Schickt alle Anfragen an diesen Server statt an transfermarkt.de (z.B. Benchmark-Server)")
+    parser.add_argument("--pool-size", type=int, default=10,
+                        help="Anzahl der Keep-Alive-Verbindungen im gemeinsamen HTTP-Pool")
+    parser.add_argument("--page-cache-size", type=int, default=32,
+                        help="Maximale Anzahl gecachter Profilseiten")
+    parser.add_argument("--page-cache-mb", type=float, default=None,
+                        help="Optionales Speicherbudget des Profilseiten-Caches in MB")
+    parser.add_argument("--compress-page-cache", action="store_true",
+                        help="Cacht komprimiertes HTML statt geparster BeautifulSoup-Bäume")
+    parser.add_argument("--parser", choices=PARSERS, default=DEFAULT_PARSER,
+                        help="HTML-Parser für BeautifulSoup (Standard: lxml, falls installiert)")
+    parser.add_argument("--typed", action="store_true",
+                        help="Speichert Leistungsdaten als Zahlen und Geburtstag/Marktwert-Daten als ISO-Datum")
+    parser.add_argument("--cache-db", default=None,
+                        help="SQLite-Datei für den persistenten HTTP-Antwort-Cache")
+    parser.add_argument("--offline", action="store_true",
+                        help="Beantwortet alle Anfragen nur aus dem Cache (benötigt --cache-db)")
+    parser.add_argument("--journal", default=None,
+                        help="SQLite-Datei für das Crawl-Journal; ein neuer Lauf setzt beim ersten offenen "
+                             "Spieler fort")
+    parser.add_argument("--delta", action="store_true",
+                        help="Inkrementeller Lauf: aktualisiert vorhandene Team-Dateien und scraped nur "
+                             "geänderte Spieler")
+    parser.add_argument("--max-age-days", type=float, default=7,
+                        help="Im Delta-Modus werden Spieler spätestens nach so vielen Tagen neu geholt")
+    parser.add_argument("--lite", action="store_true",
+                        help="Liest die Stammdaten aus der ausführlichen Kaderansicht statt von jeder Profilseite "
+                             "(ohne Berater, Social Media, Geburtsort, Nebenpositionen, Verein, Verlängerung)")
+    parser.add_argument("--performance", choices=PERFORMANCE_MODES, default="career",
+                        help="career: ganze Karriere pro Spieler, season: nur nicht abgeschlossene Saisons pro "
+                             "Spieler, team: laufende Saison des Kaders von der Leistungsdaten-Seite des Vereins; "
+                             "Karrieren nur für Spieler ohne gespeicherte Historie")
+    parser.add_argument("--no-player-dedup", action="store_true",
+                        help="Holt Spieler, die in mehreren Kadern stehen, für jeden Kader erneut")
+    parser.add_argument("--player-registry-size", type=int, default=DEFAULT_MAX_PLAYERS,
+                        help="Maximale Anzahl Spieler, die für weitere Kader im Speicher bleiben")
+    parser.add_argument("--export-dir", default=None,
+                        help="Exportiert nach dem Crawl normalisierte Tabellen (Parquet) in dieses Verzeichnis")
+    parser.add_argument("--timings", action="store_true",
+                        help="Gibt am Ende die Zeitmessung der Anfragen pro Endpunkt aus")
+    parser.add_argument("--metrics-out", default=None,
+                        help="Schreibt die Metriken des Laufs als Prometheus-Text (.prom/.txt) oder JSON")
+    parser.add_argument("--profile-stage", action="append", choices=STAGES, default=[],
+                        help="Profiliert eine Stufe (mehrfach möglich)")
+    parser.add_argument("--profiler", choices=PROFILERS, default="cprofile")
+    parser.add_argument("--profile-dir", default="profiles", help="Zielverzeichnis der Profile")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    if args.offline and not args.cache_db:
+        parser.error("--offline benötigt --cache-db")
+    return args
+
+
+def create_player_scraper(args, client):
+    cache_bytes = int(args.page_cache_mb * 1024 * 1024) if args.page_cache_mb else None
+    return PlayerScraper(client=client, cache_size=args.page_cache_size, cache_bytes=cache_bytes,
+                         cache_raw_html=args.compress_page_cache, parser=args.parser,
+                         typed=args.typed)
+
+
+def run_sequential(competitions, output_dir, client, player_scraper, parser, player_executor=None,
+                   fetch_executor=None, journal=None, delta=None, writer=None, registry=None, lite=False,
+                   performance=None):
+    # CompetitionScraper um Teams zu holen
+    logger.info("Starte CompetitionScraper...")
+    c_scraper = CompetitionScraper(competitions, client=client, parser=parser)
+    c_scraper.scrape_all()
+
+    competition_progress = tqdm(competitions, desc="Competitions", unit="competition")
+
+    for comp in competition_progress:
+        logger.info("Starte Scraping für Competition: %s", comp.name)
+
+        # Teams scrapen
+        teams = comp.teams.items()
+        team_progress = tqdm(teams, desc=f"Teams in {comp.name}", unit="team", leave=False)
+        for team_name, team_url in team_progress:
+            team_id = extract_team_id(team_url)
+            team_obj = Team(name=team_name, url=team_url, team_id=team_id)
 
+            # Prüfe, ob das Team bereits gespeichert wurde
+            filename = team_filename(comp, team_name, team_id, output_dir)
+            key = team_key(comp, team_id)
+            if team_is_finished(filename, journal, key, delta, refresh=performance is not None):
+                logger.info("Team %s (%s) bereits vorhanden, überspringe...", team_name, team_id)
+                continue
+
+            logger.info("Starte Scraping für Team: %s (%s)", team_name, team_id)
+            t_scraper = TeamScraper(team_obj, client=client, parser=parser, detailed=lite)
+            try:
+                player_basic_info_list = fetch_squad(t_scraper, journal, key)
+                logger.info("Gefundene Spieler für %s: %d", team_name, len(player_basic_info_list))
             except Exception as e:
-                log_progress(f"FEHLER bei Verarbeitung von Spieler {p_info['player_id']}: {e}")
+                logger.error("Fehler beim Abrufen der Spieler für Team %s: %s", team_name, e)
                 continue
+            if performance is not None:
+                performance.prepare_squad(comp, team_obj, player_basic_info_list)
+
+            # Jeden Spieler flach machen
+            team_rows = crawl_team_rows(player_scraper, comp, team_obj, player_basic_info_list,
+                                        player_executor, fetch_executor, journal, delta, writer, registry)
+
+            # Speichere die Daten des aktuellen Teams in einer JSON-Datei
+            finish_team(filename, team_rows, journal, key, writer)
+
+
+def main():
+    args = parse_args()
+    configure_logging(args.log_level, args.log_format, args.log_file, args.log_sample_rate)
+    ensure_output_dir(args.output_dir)
+
+    # Competitions laden
+    logger.info("Lade Competitions aus JSON...")
+    competitions = load_competitions(args.competitions_file, args.competitions or DEFAULT_COMPETITIONS, args.season)
+
+    # Ein gemeinsamer Connection-Pool für alle Scraper, mindestens so groß wie die Zahl gleichzeitiger Anfragen
+    if args.engine == "async":
+        pool_size = max(args.pool_size, args.concurrency)
+    elif args.engine == "threads":
+        pool_size = max(args.pool_size, args.workers * 3)
+    elif args.engine == "pipeline":
+        pool_size = max(args.pool_size, args.competition_workers + args.team_workers + args.player_workers)
+    else:
+        pool_size = args.pool_size
+    # Prozessweite Metriken, damit auch Scraper ohne eigenen Parameter (z.B. im Async-Engine) hineinschreiben
+    profiler = StageProfiler(args.profile_stage, args.profiler, args.profile_dir) if args.profile_stage else None
+    metrics = CrawlMetrics(profiler)
+    set_default_metrics(metrics)
+    rate_limiter = RateLimiter(html_rate=args.requests_per_second, api_rate=args.api_requests_per_second)
+    response_cache = ResponseCache(args.cache_db, offline=args.offline) if args.cache_db else None
+    client = HttpClient(pool_size=pool_size, rate_limiter=rate_limiter, response_cache=response_cache,
+                        metrics=metrics, base_url=args.base_url)
+    journal = CrawlJournal(args.journal) if args.journal else None
+    delta = DeltaRefresh(args.output_dir, args.max_age_days) if args.delta else None
+    registry = None if args.no_player_dedup else PlayerRegistry(args.player_registry_size)
+    performance = None
+    if args.performance != "career":
+        performance = PerformanceRefresh(args.output_dir, args.performance, client=client, parser=args.parser,
+                                         typed=args.typed, previous=delta.previous if delta else None)
+    writer = None
+    if args.output_format == "jsonl":
+        # Mit Journal wird der Strom eines abgebrochenen Laufs fortgesetzt, sonst neu begonnen
+        jsonl_path = os.path.join(args.output_dir, JSONL_FILENAME + EXTENSIONS[args.compression])
+        writer = JsonlWriter(jsonl_path, args.compression, append=journal is not None)
+
+    if args.engine == "async":
+        player_scraper = create_player_scraper(args, client)
+        engine = AsyncCrawlEngine(
+            competitions,
+            concurrency=args.concurrency,
+            output_dir=args.output_dir,
+            client=client,
+            parser=args.parser,
+            typed=args.typed,
+            journal=journal,
+            delta=delta,
+            writer=writer,
+            registry=registry,
+            lite=args.lite,
+            performance=performance,
+            player_scraper=player_scraper
+        )
+        engine.run()
+        logger.info("Profilseiten-Cache: %s", player_scraper.soup_cache.stats())
+    elif args.engine == "pipeline":
+        player_scraper = create_player_scraper(args, client)
+        engine = PipelineCrawlEngine(
+            competitions,
+            player_scraper,
+            output_dir=args.output_dir,
+            client=client,
+            parser=args.parser,
+            competition_workers=args.competition_workers,
+            team_workers=args.team_workers,
+            player_workers=args.player_workers,
+            queue_size=args.queue_size,
+            journal=journal,
+            delta=delta,
+            writer=writer,
+            registry=registry,
+            lite=args.lite,
+            performance=performance
+        )
+        engine.run()
+        logger.info("Profilseiten-Cache: %s", player_scraper.soup_cache.stats())
+    elif args.engine == "threads":
+        player_scraper = create_player_scraper(args, client)
+        # Getrennte Pools: Spieler-Tasks warten auf ihre Abrufe und dürfen diese nicht blockieren
+        with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="player") as player_executor, \
+                ThreadPoolExecutor(max_workers=args.workers * 2, thread_name_prefix="fetch") as fetch_executor:
+            run_sequential(competitions, args.output_dir, client, player_scraper, args.parser,
+                           player_executor, fetch_executor, journal, delta, writer, registry, args.lite,
+                           performance)
+        logger.info("Profilseiten-Cache: %s", player_scraper.soup_cache.stats())
+    else:
+        player_scraper = create_player_scraper(args, client)
+        run_sequential(competitions, args.output_dir, client, player_scraper, args.parser, journal=journal,
+                       delta=delta, writer=writer, registry=registry, lite=args.lite, performance=performance)
+        logger.info("Profilseiten-Cache: %s", player_scraper.soup_cache.stats())
+
+    if args.timings:
+        client.print_timing_summary()
+    if response_cache is not None:
+        logger.info("Antwort-Cache: %s", response_cache.stats())
+    if writer is not None:
+        writer.close()
+        logger.info("%d Spieler in %s geschrieben", writer.rows, writer.path)
+    if delta is not None:
+        delta.save()
+        logger.info("Delta-Modus: %s", delta.stats())
+    if registry is not None:
+        logger.info("Spieler-Registry: %s", registry.stats())
+    if performance is not None:
+        logger.info("Leistungsdaten: %s", performance.stats())
+    if args.export_dir:
+        export_rows(load_rows(args.output_dir), args.export_dir)
+    if journal is not None:
+        logger.info("Crawl-Journal: %s", journal.stats())
+        journal.close()
+    metrics.print_summary()
+    if args.metrics_out:
+        metrics.write(args.metrics_out)
+        logger.info("Metriken gespeichert in %s", args.metrics_out)
+    client.close()
 
-        # Speichere die Daten des aktuellen Teams in einer JSON-Datei
-        team_filename = f"output/{competition_name}_{team_name}_{team_id}.json"
-        with open(team_filename, 'w', encoding='utf-8') as f:
-            json.dump(team_rows, f, ensure_ascii=False, indent=2, default=convert_to_serializable)
-        log_progress(f"Team-Daten gespeichert in {team_filename}")
 
-# Speichere alle Daten in einer JSON-Datei
-#with open("output/all_data.json", 'w', encoding='utf-8') as f:
-#    json.dump(all_rows, f, ensure_ascii=False, indent=2, default=convert_to_serializable)
-#log_progress("Alle Daten gespeichert in output/all_data.json")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+End-to-End-Benchmark der Crawl-Engines gegen den lokalen Ersatz-Server (benchmarks/stub_server.py).
+
+Startet den Server, lässt app.py bzw. sharded_crawl.py als eigenen Prozess mit --base-url gegen
+ihn laufen und misst Spieler pro Minute, die Parse-Zeit pro Endpunkt (aus --metrics-out) und
+den Spitzen-Speicher des Crawl-Prozesses. Jedes Ergebnis wird mit Commit und Einstellungen an
+benchmarks/results/crawl_benchmark.jsonl angehängt und mit dem letzten Lauf derselben
+Einstellungen verglichen.
+
+Beispiele:
+    python benchmarks/crawl_benchmark.py --engine sequential --engine threads --engine async --engine pipeline
+    python benchmarks/crawl_benchmark.py --engine sharded --processes 4 --latency-ms 80 --teams 18
+    python benchmarks/crawl_benchmark.py --cache-db crawl_cache.sqlite --competition Bundesliga
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stub_server import add_server_arguments, server_from_args  # noqa: E402
+
+ENGINES = ["sequential", "threads", "async", "pipeline", "sharded"]
+DEFAULT_RESULTS = os.path.join(ROOT, "benchmarks", "results", "crawl_benchmark.jsonl")
+UNLIMITED_RATES = ["--requests-per-second", "0", "--api-requests-per-second", "0"]
+
+
+def git_revision():
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unbekannt"
+    return revision + ("-dirty" if dirty else "")
+
+
+def crawl_command(engine, args, base_url, work_dir):
+    """Kommandozeile für einen Crawl in work_dir; die Metriken landen in work_dir/metrics*.json."""
+    output_dir = os.path.join(work_dir, "output")
+    metrics_out = os.path.join(work_dir, "metrics.json")
+    competitions = [option for name in args.competitions for option in ("--competition", name)]
+    if engine == "sharded":
+        return [sys.executable, os.path.join(ROOT, "sharded_crawl.py"), "run",
+                "--queue", os.path.join(work_dir, "queue.sqlite"), "--output-dir", output_dir,
+                "--processes", str(args.processes), "--base-url", base_url, "--metrics-out", metrics_out,
+                *competitions, *UNLIMITED_RATES]
+    return [sys.executable, os.path.join(ROOT, "app.py"), "--engine", engine, "--output-dir", output_dir,
+            "--workers", str(args.workers), "--concurrency", str(args.concurrency),
+            "--team-workers", str(args.team_workers), "--player-workers", str(args.player_workers),
+            "--base-url", base_url, "--metrics-out", metrics_out, *competitions, *UNLIMITED_RATES]
+
+
+def run_crawl(command, log_path):
+    """Führt den Crawl aus; gibt Laufzeit in Sekunden und Spitzen-Speicher in MiB zurück."""
+    with open(log_path, "w", encoding="utf-8") as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=ROOT, stdout=log, stderr=subprocess.STDOUT)
+        # wait4 liefert die Ressourcen dieses Kindprozesses (inkl. seiner Worker-Prozesse)
+        _, status, usage = os.wait4(process.pid, 0)
+        duration = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"Crawl fehlgeschlagen (Exit-Code {process.returncode}), siehe {log_path}")
+    # ru_maxrss ist unter Linux in KiB, unter macOS in Bytes
+    peak_rss = usage.ru_maxrss / 1024 if sys.platform != "darwin" else usage.ru_maxrss / 1024 / 1024
+    return duration, peak_rss
+
+
+def count_players(output_dir):
+    players = 0
+    for path in glob.glob(os.path.join(output_dir, "*.json")):
+        if os.path.basename(path) == "all_data.json":
+            continue
+        with open(path, encoding="utf-8") as f:
+            players += len(json.load(f))
+    return players
+
+
+def stage_times(work_dir):
+    """Mittlere Dauer pro Stufe und Endpunkt in ms, über die Metrik-Dateien aller Prozesse summiert."""
+    totals = {}
+    for path in glob.glob(os.path.join(work_dir, "metrics*.json")):
+        with open(path, encoding="utf-8") as f:
+            metrics = json.load(f)
+        for histogram in metrics["histograms"]:
+            if histogram["name"] != "stage_seconds":
+                continue
+            key = f"{histogram['labels']['stage']}/{histogram['labels']['endpoint']}"
+            total = totals.setdefault(key, [0.0, 0])
+            total[0] += histogram["sum"]
+            total[1] += histogram["count"]
+    return {key: round(seconds / count * 1000, 3) for key, (seconds, count) in sorted(totals.items()) if count}
+
+
+def run_benchmark(engine, args):
+    server = server_from_args(args)
+    try:
+        with tempfile.TemporaryDirectory(prefix=f"crawl-benchmark-{engine}-") as work_dir:
+            command = crawl_command(engine, args, server.base_url, work_dir)
+            duration, peak_rss = run_crawl(command, os.path.join(work_dir, "crawl.log"))
+            players = count_players(os.path.join(work_dir, "output"))
+            stages = stage_times(work_dir)
+            if args.keep_log:
+                with open(os.path.join(work_dir, "crawl.log"), encoding="utf-8") as f:
+                    sys.stdout.write(f.read())
+    finally:
+        server.shutdown()
+    server_stats = server.stats()
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "label": args.label,
+        "engine": engine,
+        "config": config_of(engine, args),
+        "players": players,
+        "seconds": round(duration, 3),
+        "players_per_minute": round(players / duration * 60, 1) if duration else 0.0,
+        "peak_rss_mb": round(peak_rss, 1),
+        "requests": server_stats["requests"],
+        "injected_503": server_stats["injected_503"],
+        "stage_ms": stages,
+    }
+
+
+def config_of(engine, args):
+    """Einstellungen, die ein Ergebnis mit früheren vergleichbar machen."""
+    config = {
+        "competitions": args.competitions,
+        "teams": args.teams,
+        "players": args.players,
+        "replay": bool(args.cache_db),
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "fail_rate": args.fail_rate,
+    }
+    if engine == "threads":
+        config["workers"] = args.workers
+    elif engine == "async":
+        config["concurrency"] = args.concurrency
+    elif engine == "pipeline":
+        config["team_workers"] = args.team_workers
+        config["player_workers"] = args.player_workers
+    elif engine == "sharded":
+        config["processes"] = args.processes
+    return config
+
+
+def previous_result(results_path, result):
+    if not os.path.exists(results_path):
+        return None
+    previous = None
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry["engine"] == result["engine"] and entry["config"] == result["config"]:
+                previous = entry
+    return previous
+
+
+def change(current, before):
+    return f"{(current - before) / before * 100:+.1f}%" if before else "n/a"
+
+
+def print_result(result, previous):
+    print(f"{result['engine']}: {result['players']} Spieler in {result['seconds']:.1f}s, "
+          f"{result['players_per_minute']:.1f} Spieler/min, Spitzen-Speicher {result['peak_rss_mb']:.1f} MiB, "
+          f"{result['requests']} Anfragen ({result['injected_503']} x 503)")
+    for stage, milliseconds in result["stage_ms"].items():
+        if stage.startswith("parse/"):
+            print(f"    {stage:<24} {milliseconds:8.3f} ms")
+    if previous is not None:
+        print(f"    gegenüber {previous['revision']} ({previous['timestamp']}): "
+              f"Spieler/min {change(result['players_per_minute'], previous['players_per_minute'])}, "
+              f"Speicher {change(result['peak_rss_mb'], previous['peak_rss_mb'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-End-Benchmark gegen den lokalen Ersatz-Server")
+    parser.add_argument("--engine", action="append", choices=ENGINES, dest="engines",
+                        help="Zu messende Engine (mehrfach möglich, Standard: sequential)")
+    parser.add_argument("--competition", action="append", dest="competitions",
+                        help="Name aus competitions_tm_germany.json (mehrfach möglich, Standard: Bundesliga)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--team-workers", type=int, default=2)
+    parser.add_argument("--player-workers", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=2)
+    add_server_arguments(parser)
+    parser.set_defaults(teams=4)
+    parser.add_argument("--label", default=None, help="Freitext, der mit dem Ergebnis gespeichert wird")
+    parser.add_argument("--results", default=DEFAULT_RESULTS, help="JSONL-Datei der gespeicherten Ergebnisse")
+    parser.add_argument("--no-save", action="store_true", help="Ergebnis nur ausgeben")
+    parser.add_argument("--keep-log", action="store_true", help="Gibt die Ausgabe des Crawls mit aus")
+    args = parser.parse_args()
+    args.engines = args.engines or ["sequential"]
+    args.competitions = args.competitions or ["Bundesliga"]
+
+    for engine in args.engines:
+        result = run_benchmark(engine, args)
+        print_result(result, previous_result(args.results, result))
+        if not args.no_save:
+            os.makedirs(os.path.dirname(args.results), exist_ok=True)
+            with open(args.results, "a", encoding="utf-8") as f:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Synthetische Transfermarkt-Seiten für Benchmarks.
+
+Die Seiten bilden die Struktur nach, die die Scraper lesen (table.items, info-table,
+detail-position), und sind mit Navigation, Skripten und Werbeblöcken auf eine realistische
+Größe aufgefüllt. Spieler-IDs leiten sich aus der Team-ID ab, der erste Spieler jedes
+Kaders ist Torwart.
+"""
+import json
+
+PLAYERS_PER_TEAM = 25
+TEAMS_PER_COMPETITION = 18
+SEASONS = [("24/25", 2024), ("23/24", 2023), ("22/23", 2022), ("21/22", 2021), ("20/21", 2020)]
+
+
+def _chrome(body, title="Transfermarkt"):
+    """Umgibt den Inhalt mit Kopf, Navigation und Fußbereich wie auf transfermarkt.de."""
+    nav = "".join(
+        f'<li class="main-navbar__item"><a href="/navigation/{i}" title="Menüpunkt {i}" class="main-navbar__link">'
+        f'<span class="main-navbar__text">Menüpunkt {i}</span></a><ul class="main-navbar__submenu">'
+        + "".join(f'<li><a href="/navigation/{i}/{j}">Unterpunkt {i}.{j}</a></li>' for j in range(12))
+        + "</ul></li>"
+        for i in range(30)
+    )
+    teasers = "".join(
+        f'<div class="box teaser"><h2 class="content-box-headline">Nachricht {i}</h2><div class="teaser__body">'
+        f'<a href="/news/{i}"><img src="https://img.example/{i}.jpg" alt="Bild {i}" loading="lazy"/></a>'
+        f'<p>Transfergerücht {i}: Verein A beobachtet Spieler B, Marktwert steigt um {i},5 Mio. €.</p></div></div>'
+        for i in range(40)
+    )
+    script = "<script>window.dataLayer = window.dataLayer || [];" + "dataLayer.push({event: 'x'});" * 200 + "</script>"
+    footer = "".join(f'<a href="/footer/{i}" class="footer-link">Footer {i}</a>' for i in range(120))
+    return (
+        f'<!DOCTYPE html><html lang="de"><head><meta charset="utf-8"/><title>{title}</title>'
+        f'<link rel="stylesheet" href="/app.css"/>{script}</head><body>'
+        f'<header class="tm-header"><nav class="main-navbar"><ul>{nav}</ul></nav></header>'
+        f'<main><div class="row"><div class="large-8 columns">{body}</div>'
+        f'<aside class="large-4 columns">{teasers}</aside></div></main>'
+        f'<footer class="footer">{footer}</footer>{script}</body></html>'
+    )
+
+
+def team_ids(competition_id, teams=TEAMS_PER_COMPETITION):
+    base = sum(map(ord, competition_id)) * 100
+    return [base + i for i in range(teams)]
+
+
+def player_ids(team_id, players=PLAYERS_PER_TEAM):
+    return [int(team_id) * 100 + i for i in range(players)]
+
+
+def is_goalkeeper(player_id):
+    return int(player_id) % 100 == 0
+
+
+def competition_page(competition_id, teams=TEAMS_PER_COMPETITION):
+    rows = "".join(
+        f'<tr class="{"odd" if i % 2 else "even"}"><td class="zentriert no-border-rechts">'
+        f'<a href="/verein-{team_id}/startseite/verein/{team_id}/saison_id/2024"><img alt="Verein {team_id}"/></a></td>'
+        f'<td class="hauptlink no-border-links"><a href="/verein-{team_id}/startseite/verein/{team_id}/saison_id/2024">'
+        f'Verein {team_id}</a></td><td class="zentriert">{PLAYERS_PER_TEAM}</td><td class="zentriert">26,1</td>'
+        f'<td class="zentriert">11</td><td class="rechts">2,00 Mio. €</td><td class="rechts">50,00 Mio. €</td></tr>'
+        for i, team_id in enumerate(team_ids(competition_id, teams))
+    )
+    table = (f'<div class="responsive-table"><table class="items"><thead><tr><th>Verein</th><th></th><th>Kader</th>'
+             f'<th>ø-Alter</th><th>Legionäre</th><th>ø-Marktwert</th><th>Gesamtmarktwert</th></tr></thead>'
+             f'<tbody>{rows}</tbody></table></div>')
+    return _chrome(table, f"Wettbewerb {competition_id}")
+
+
+def squad_page(team_id, players=PLAYERS_PER_TEAM):
+    rows = ""
+    for i, player_id in enumerate(player_ids(team_id, players)):
+        position = "Torwart" if is_goalkeeper(player_id) else "Innenverteidiger"
+        rows += (
+            f'<tr class="{"odd" if i % 2 else "even"}"><td class="zentriert rueckennummer">'
+            f'<div class="rn_nummer">{i + 1}</div></td><td class="posrela"><table class="inline-table"><tr>'
+            f'<td rowspan="2"><img src="https://img.example/p{player_id}.jpg" title="Spieler {player_id}"/></td>'
+            f'<td class="hauptlink"><a href="/spieler-{player_id}/profil/spieler/{player_id}">Spieler {player_id}</a>'
+            f'</td></tr><tr><td>{position}</td></tr></table></td>'
+            f'<td class="zentriert">27.03.1996 (28)</td>'
+            f'<td class="zentriert"><img title="Deutschland" class="flaggenrahmen"/><br/>'
+            f'<img title="Polen" class="flaggenrahmen"/></td>'
+            f'<td class="zentriert">1,{80 + i % 15}m</td><td class="zentriert">rechts</td>'
+            f'<td class="zentriert">01.07.2020</td>'
+            f'<td class="zentriert"><a title="Vorheriger Verein" href="/v"><img/></a></td>'
+            f'<td class="zentriert">30.06.2026</td>'
+            f'<td class="rechts hauptlink"><a href="/spieler-{player_id}/marktwertverlauf/spieler/{player_id}">'
+            f'{i + 1},50 Mio. €</a></td></tr>'
+        )
+    head = ('<thead><tr><th>#</th><th>Spieler</th><th>Geb./Alter</th><th>Nat.</th><th>Größe</th><th>Fuß</th>'
+            '<th>Im Team seit</th><th>Vor Verein</th><th>Vertrag</th><th>Marktwert</th></tr></thead>')
+    table = f'<div class="responsive-table"><table class="items">{head}<tbody>{rows}</tbody></table></div>'
+    return _chrome(table, f"Kader {team_id}")
+
+
+def profile_page(player_id):
+    player_id = int(player_id)
+    goalkeeper = is_goalkeeper(player_id)
+    position = "Torwart" if goalkeeper else "Innenverteidiger"
+    side_positions = "" if goalkeeper else (
+        '<dl><dt class="detail-position__title">Nebenposition:</dt>'
+        '<dd class="detail-position__position">Linker Verteidiger</dd>'
+        '<dd class="detail-position__position">Defensives Mittelfeld</dd></dl>'
+    )
+
+    def field(label, value):
+        return (f'<span class="info-table__content info-table__content--regular">{label}</span>'
+                f'<span class="info-table__content info-table__content--bold">{value}</span>')
+
+    info_table = (
+        '<div class="info-table info-table--right-space ">'
+        + field("Geb./Alter:", '<a href="/aktuell/waspassiertheute/aktuell/new/datum/1996-03-27">27.03.1996 (28)</a>')
+        + field("Geburtsort:", '<span title="Gelsenkirchen">Gelsenkirchen</span>&nbsp;<img title="Deutschland"/>')
+        + field("Größe:", "1,93&nbsp;m")
+        + field("Staatsbürgerschaft:", '<img title="Deutschland"/>&nbsp;&nbsp;Deutschland<br/><img title="Polen"/>&nbsp;&nbsp;Polen')
+        + field("Position:", "Abwehr - " + position)
+        + field("Fuß:", "rechts")
+        + field("Spielerberater:", '<a href="/berater/beraterfirma/berater/1">Berater GmbH</a>')
+        + '<span class="info-table__content info-table__content--regular">Aktueller Verein:</span>'
+          '<span class="info-table__content info-table__content--bold info-table__content--flex">'
+          '<a title="FC Beispiel" href="/fc-beispiel/startseite/verein/1"><img/></a>'
+          '<a title="FC Beispiel" href="/fc-beispiel/startseite/verein/1">FC Beispiel</a></span>'
+        + field("Im Team seit:", "01.07.2020")
+        + field("Vertrag bis:", "30.06.2026")
+        + field("Letzte Verlängerung:", "05.05.2023")
+        + field("Ausrüster:", "Nike")
+        + field("Social Media:", f'<div class="socialmedia-icons"><a href="https://instagram.com/p{player_id}" '
+                                 f'title="Instagram" class="instagram"></a><a href="https://x.com/p{player_id}" '
+                                 f'title="X" class="twitter"></a></div>')
+        + "</div>"
+    )
+    body = (
+        '<header class="data-header"><div class="data-header__headline-container">'
+        '<h1 class="data-header__headline-wrapper">\n<span class="data-header__shirt-number">#4</span>\n'
+        f'Spieler {player_id}</h1></div></header>'
+        f'<div class="box"><h2 class="content-box-headline">Daten &amp; Fakten</h2>{info_table}</div>'
+        '<div class="detail-position"><div class="detail-position__box">'
+        '<dl><dt class="detail-position__title">Hauptposition:</dt>'
+        f'<dd class="detail-position__position">{position}</dd></dl>{side_positions}</div></div>'
+    )
+    return _chrome(body, f"Spieler {player_id}")
+
+
+def performance_page(player_id, season=None):
+    player_id = int(player_id)
+    goalkeeper = is_goalkeeper(player_id)
+    seasons = [entry for entry in SEASONS if season is None or entry[1] == int(season)]
+    rows = ""
+    for label, _ in seasons:
+        for competition in ("Bundesliga", "DFB-Pokal"):
+            club = '<a title="FC Beispiel" href="/v"><img/></a>'
+            comp = f'<a title="{competition}" href="/w">{competition}</a>'
+            if goalkeeper:
+                cells = [label, "<img/>", comp, club, "30", "28", "1,52", "-", "-", "2", "1", "3", "-", "-",
+                         "25", "9", "2.520'"]
+            else:
+                cells = [label, "<img/>", comp, club, "30", "28", "1,52", "5", "3", "-", "4", "7", "6", "-", "1",
+                         "2", "412'", "2.061'"]
+            rows += '<tr class="odd">' + "".join(f'<td class="zentriert">{c}</td>' for c in cells) + "</tr>"
+
+    def th(title):
+        return f'<th><span title="{title}">{title[:2]}</span></th>'
+
+    head = "<thead><tr><th>Saison</th><th></th><th>Wettbewerb</th><th>Verein</th>" + th("Im Kader") + \
+        th("Einsätze") + th("Punkte pro Spiel") + th("Tore")
+    if goalkeeper:
+        head += th("Eigentore") + th("Einwechslungen") + th("Auswechslungen") + th("Gelbe Karten") + \
+            th("Gelb-Rote Karten") + th("Rote Karten") + th("Gegentore") + th("Zu-Null-Spiele") + \
+            th("Gespielte Minuten")
+    else:
+        head += th("Vorlagen") + th("Eigentore") + th("Einwechslungen") + th("Auswechslungen") + \
+            th("Gelbe Karten") + th("Gelb-Rote Karten") + th("Rote Karten") + th("Elfmetertore") + \
+            th("Minuten pro Tor") + th("Gespielte Minuten")
+    head += "</tr></thead>"
+    table = f'<div class="responsive-table"><table class="items">{head}<tbody>{rows}</tbody></table></div>'
+    return _chrome(table, f"Leistungsdaten {player_id}")
+
+
+def club_performance_page(team_id, players=PLAYERS_PER_TEAM):
+    rows = ""
+    for i, player_id in enumerate(player_ids(team_id, players)):
+        goalkeeper = is_goalkeeper(player_id)
+        position = "Torwart" if goalkeeper else "Innenverteidiger"
+        if goalkeeper:
+            cells = ["28", "<img/>", "30", "28", "-", "-", "-", "-", "1", "3", "-", "-", "25", "9", "1,52", "2.520'"]
+        else:
+            cells = ["28", "<img/>", "30", "28", "5", "3", "-", "4", "7", "6", "-", "1", "-", "-", "1,52", "2.061'"]
+        rows += (
+            f'<tr class="{"odd" if i % 2 else "even"}"><td class="zentriert">{i + 1}</td>'
+            f'<td class="posrela"><table class="inline-table"><tr>'
+            f'<td class="hauptlink"><a href="/spieler-{player_id}/leistungsdaten/spieler/{player_id}">'
+            f'Spieler {player_id}</a></td></tr><tr><td>{position}</td></tr></table></td>'
+            + "".join(f'<td class="zentriert">{c}</td>' for c in cells) + "</tr>"
+        )
+
+    def th(title):
+        return f'<th><span title="{title}">{title[:2]}</span></th>'
+
+    head = ("<thead><tr><th>#</th><th>Spieler</th><th>Alter</th><th>Nat.</th>" + th("Im Kader") + th("Einsätze")
+            + th("Tore") + th("Vorlagen") + th("Eigentore") + th("Einwechslungen") + th("Auswechslungen")
+            + th("Gelbe Karten") + th("Gelb-Rote Karten") + th("Rote Karten") + th("Gegentore")
+            + th("Zu-Null-Spiele") + th("Punkte pro Spiel") + th("Einsatzminuten") + "</tr></thead>")
+    header = ('<header class="data-header"><div class="data-header__headline-container">'
+              f'<h1 class="data-header__headline-wrapper">Verein {team_id}</h1></div></header>')
+    table = f'<div class="responsive-table"><table class="items">{head}<tbody>{rows}</tbody></table></div>'
+    return _chrome(header + table, f"Leistungsdaten Verein {team_id}")
+
+
+def market_value_json(player_id):
+    points = [
+        {"x": 1593554400000, "y": 100000, "mw": "100 Tsd. €", "datum_mw": "01.07.2020", "verein": "FC Beispiel",
+         "age": "24", "wappen": ""},
+        {"x": 1704067200000, "y": 1500000, "mw": "1,50 Mio. €", "datum_mw": "01.01.2024", "verein": "FC Beispiel",
+         "age": "27", "wappen": ""},
+    ]
+    return json.dumps({"list": points, "current": "1,50 Mio. €", "highest": "1,50 Mio. €"})
+
+
+def pages_by_type():
+    """Je eine Beispielseite pro Seitentyp."""
+    return {
+        "competition": competition_page("L1"),
+        "squad": squad_page(team_ids("L1")[0]),
+        "profile": profile_page(player_ids(team_ids("L1")[0])[1]),
+        "performance": performance_page(player_ids(team_ids("L1")[0])[1]),
+    }
@@ -0,0 +1,114 @@
+"""
+Misst die Startzeit eines Crawl-Prozesses und den Rechenaufwand pro Spieler ohne Netzwerk.
+
+Startzeit: Import von app.py in einem frischen Interpreter (wie bei jedem Worker-Prozess).
+Pro Spieler: crawl_player_row mit Profil, Marktwert-Historie und Leistungsdaten aus den
+synthetischen Seiten in benchmarks/fixtures.py, also Parsen und Aufbereiten ohne Wartezeiten.
+
+Beispiel:
+    python benchmarks/overhead_benchmark.py --players 200
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PLAYER_ID = re.compile(r"(?:spieler|graph)/(\d+)")
+STARTUP_SNIPPET = "import sys, app; print(int('pandas' in sys.modules), int('numpy' in sys.modules))"
+
+
+class FixtureClient:
+    """Beantwortet die Anfragen des PlayerScraper mit den synthetischen Seiten."""
+
+    def get(self, url):
+        from benchmarks import fixtures
+        from classes.http_client import classify_endpoint
+        from classes.response_cache import CachedResponse
+
+        endpoint = classify_endpoint(url)
+        player_id = int(PLAYER_ID.search(url).group(1))
+        if endpoint == "market_value":
+            body = fixtures.market_value_json(player_id)
+        elif endpoint == "performance":
+            body = fixtures.performance_page(player_id)
+        else:
+            body = fixtures.profile_page(player_id)
+        return CachedResponse(url, 200, body.encode("utf-8"), "utf-8", {}, from_cache=False)
+
+
+def measure_startup(repeat):
+    """Median der Importzeit von app.py in Sekunden und ob pandas/numpy dabei geladen wurden."""
+    samples = []
+    loaded = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", STARTUP_SNIPPET], cwd=ROOT, capture_output=True, text=True,
+                                check=True)
+        samples.append(time.perf_counter() - start)
+        loaded = result.stdout.split()
+    return statistics.median(samples), loaded[0] == "1", loaded[1] == "1"
+
+
+def measure_per_player(players):
+    """Mittlere Zeit pro Spieler in Millisekunden für crawl_player_row mit vorab erzeugten Seiten."""
+    from benchmarks import fixtures
+    from classes.competition import Competition
+    from classes.player_scraper import PlayerScraper
+    from classes.team import Team
+    from crawler import crawl_player_row
+
+    competition = Competition(name="Bundesliga", season=2024,
+                              base_url="https://www.transfermarkt.de/bundesliga/startseite/wettbewerb/L1")
+    team_id = fixtures.team_ids("L1")[0]
+    team = Team(name="Verein", url=f"https://www.transfermarkt.de/verein/startseite/verein/{team_id}",
+                team_id=str(team_id))
+    player_ids = [team_id * 100 + i % fixtures.PLAYERS_PER_TEAM for i in range(players)]
+
+    # Seiten vorab erzeugen, damit nur Parsen und Aufbereiten gemessen werden
+    pages = {}
+    client = FixtureClient()
+
+    class CachedFixtureClient:
+        def get(self, url):
+            if url not in pages:
+                pages[url] = client.get(url)
+            return pages[url]
+
+    scraper = PlayerScraper(client=CachedFixtureClient(), cache_size=1)
+    infos = [{"player_id": str(pid), "player_url": f"https://www.transfermarkt.de/spieler-{pid}/profil/spieler/{pid}"}
+             for pid in player_ids]
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            # Aufwärmen: erzeugt die Seiten eines Kaders
+            for p_info in infos[:fixtures.PLAYERS_PER_TEAM]:
+                crawl_player_row(scraper, competition, team, p_info)
+            start = time.perf_counter()
+            for p_info in infos:
+                crawl_player_row(scraper, competition, team, p_info)
+            duration = time.perf_counter() - start
+        finally:
+            sys.stdout = stdout
+    return duration / len(infos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startzeit und Aufwand pro Spieler")
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5, help="Anzahl Messungen der Startzeit")
+    args = parser.parse_args()
+
+    startup, pandas_loaded, numpy_loaded = measure_startup(args.repeat)
+    print(f"Start (import app):  {startup * 1000:8.1f} ms   pandas geladen: {'ja' if pandas_loaded else 'nein'}, "
+          f"numpy geladen: {'ja' if numpy_loaded else 'nein'}")
+    print(f"Pro Spieler:         {measure_per_player(args.players):8.2f} ms   ({args.players} Spieler, ohne Netzwerk)")
+
+
+if __name__ == "__main__":
+    main()
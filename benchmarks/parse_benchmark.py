@@ -0,0 +1,115 @@
+"""
+Misst die Parse-Zeit der Transfermarkt-Seiten mit verschiedenen Parsern und Teil-Parsing.
+
+Beispiele:
+    python benchmarks/parse_benchmark.py                           # synthetische Seiten
+    python benchmarks/parse_benchmark.py --pages saved_pages/      # gespeicherte Seiten, z.B. profile_neuer.html
+    python benchmarks/parse_benchmark.py --cache-db crawl_cache.sqlite
+"""
+import argparse
+import glob
+import os
+import sqlite3
+import statistics
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes.http_client import classify_endpoint  # noqa: E402
+from helpers import ITEMS_TABLE_ONLY, PROFILE_REGIONS_ONLY, make_soup  # noqa: E402
+
+PAGE_TYPES = ["competition", "squad", "profile", "performance"]
+STRAINERS = {
+    "competition": ITEMS_TABLE_ONLY,
+    "squad": ITEMS_TABLE_ONLY,
+    "profile": PROFILE_REGIONS_ONLY,
+    "performance": ITEMS_TABLE_ONLY,
+}
+
+
+def load_synthetic_pages():
+    from benchmarks.fixtures import pages_by_type
+    return {page_type: [html] for page_type, html in pages_by_type().items()}
+
+
+def load_page_directory(directory):
+    """Lädt gespeicherte Seiten; der Dateiname beginnt mit dem Seitentyp (z.B. profile_27004.html)."""
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        page_type = os.path.basename(path).split("_")[0]
+        if page_type in PAGE_TYPES:
+            with open(path, encoding="utf-8") as f:
+                pages.setdefault(page_type, []).append(f.read())
+    return pages
+
+
+def load_cache_db(path, limit):
+    """Lädt Seiten aus einem ResponseCache (--cache-db von app.py)."""
+    pages = {}
+    connection = sqlite3.connect(path)
+    for url, body, encoding in connection.execute("SELECT url, body, encoding FROM responses WHERE status_code = 200"):
+        page_type = classify_endpoint(url)
+        if page_type in PAGE_TYPES and len(pages.get(page_type, [])) < limit:
+            pages.setdefault(page_type, []).append(zlib.decompress(body).decode(encoding or "utf-8"))
+    connection.close()
+    return pages
+
+
+def available_parsers():
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        parsers.append("lxml")
+    except ImportError:
+        print("lxml ist nicht installiert, es wird nur html.parser gemessen.")
+    return parsers
+
+
+def time_parse(html_pages, parser, parse_only, repeat):
+    """Median der Parse-Zeit pro Seite in Millisekunden."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in html_pages:
+            make_soup(html, parse_only, parser)
+        samples.append((time.perf_counter() - start) / len(html_pages) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse-Benchmark für die Transfermarkt-Scraper")
+    parser.add_argument("--pages", help="Verzeichnis mit gespeicherten Seiten (<typ>_<name>.html)")
+    parser.add_argument("--cache-db", help="SQLite-Antwort-Cache aus app.py --cache-db")
+    parser.add_argument("--limit", type=int, default=20, help="Maximale Seiten pro Typ aus dem Cache")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = load_page_directory(args.pages)
+    elif args.cache_db:
+        pages = load_cache_db(args.cache_db, args.limit)
+    else:
+        pages = load_synthetic_pages()
+
+    parsers = available_parsers()
+    print(f"{'Seitentyp':<12} {'Seiten':>6} {'KiB':>6}  {'Variante':<24} {'ms/Seite':>9} {'Speedup':>8}")
+    for page_type in PAGE_TYPES:
+        html_pages = pages.get(page_type)
+        if not html_pages:
+            continue
+        size = sum(len(html) for html in html_pages) / len(html_pages) / 1024
+        baseline = None
+        for parser_name in parsers:
+            for label, parse_only in (("voll", None), ("SoupStrainer", STRAINERS[page_type])):
+                duration = time_parse(html_pages, parser_name, parse_only, args.repeat)
+                if baseline is None:
+                    baseline = duration
+                variant = f"{parser_name} {label}"
+                print(f"{page_type:<12} {len(html_pages):>6} {size:>6.0f}  {variant:<24} {duration:>9.2f} "
+                      f"{baseline / duration:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
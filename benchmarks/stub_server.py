@@ -0,0 +1,185 @@
+"""
+Lokaler Ersatz-Server für transfermarkt.de, damit Crawls ohne Zugriff auf die echte Seite gemessen
+werden können.
+
+Beantwortet Competition-, Kader-, Profil-, Leistungsdaten- (auch pro Verein) und Marktwert-API-
+Anfragen mit den synthetischen Seiten aus benchmarks/fixtures.py oder spielt mit --cache-db die
+Antworten eines früheren Crawls aus dem Antwort-Cache ab. Latenz und 503-Antworten lassen sich einstellen.
+Die Crawler werden mit --base-url auf den Server umgeleitet.
+
+Beispiel:
+    python benchmarks/stub_server.py --port 8765 --latency-ms 80 --fail-rate 0.01
+    python app.py --base-url http://127.0.0.1:8765 --requests-per-second 0 --api-requests-per-second 0
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import fixtures  # noqa: E402
+from classes.http_client import TRANSFERMARKT_URL  # noqa: E402
+
+MARKET_VALUE_PATH = re.compile(r"/ceapi/marketValueDevelopment/graph/(\d+)")
+PERFORMANCE_PATH = re.compile(r"/leistungsdatendetails/spieler/(\d+)/saison/(\d*)")
+CLUB_PERFORMANCE_PATH = re.compile(r"/leistungsdaten/verein/(\d+)")
+PROFILE_PATH = re.compile(r"/profil/spieler/(\d+)")
+SQUAD_PATH = re.compile(r"/(?:startseite|kader)/verein/(\d+)")
+COMPETITION_PATH = re.compile(r"/wettbewerb/(\w+)")
+
+HTML = "text/html; charset=utf-8"
+JSON = "application/json; charset=utf-8"
+
+
+class FixtureSite:
+    """Erzeugt die Antwort auf einen Pfad aus den synthetischen Seiten oder einem Antwort-Cache."""
+
+    def __init__(self, teams=fixtures.TEAMS_PER_COMPETITION, players=fixtures.PLAYERS_PER_TEAM, cache_db=None):
+        self.teams = teams
+        self.players = players
+        self.cache = None
+        if cache_db:
+            from classes.response_cache import ResponseCache
+            self.cache = ResponseCache(cache_db, offline=True)
+
+    def respond(self, path):
+        """Gibt (Status, Content-Type, Body) zurück."""
+        if self.cache is not None:
+            return self._replay(path)
+
+        match = MARKET_VALUE_PATH.search(path)
+        if match:
+            return 200, JSON, fixtures.market_value_json(match.group(1))
+        match = PERFORMANCE_PATH.search(path)
+        if match:
+            return 200, HTML, fixtures.performance_page(match.group(1), match.group(2) or None)
+        match = CLUB_PERFORMANCE_PATH.search(path)
+        if match:
+            return 200, HTML, fixtures.club_performance_page(match.group(1), self.players)
+        match = PROFILE_PATH.search(path)
+        if match:
+            return 200, HTML, fixtures.profile_page(match.group(1))
+        match = SQUAD_PATH.search(path)
+        if match:
+            return 200, HTML, fixtures.squad_page(match.group(1), self.players)
+        match = COMPETITION_PATH.search(path)
+        if match:
+            return 200, HTML, fixtures.competition_page(match.group(1), self.teams)
+        return 404, HTML, ""
+
+    def _replay(self, path):
+        cached = self.cache.lookup(TRANSFERMARKT_URL + path)
+        if cached is None:
+            return 404, HTML, ""
+        response = cached[0]
+        return response.status_code, response.headers.get("Content-Type", HTML), response.content
+
+
+class StubServer(ThreadingHTTPServer):
+    """HTTP-Server mit einstellbarer Latenz und zufällig eingestreuten 503-Antworten."""
+
+    daemon_threads = True
+
+    def __init__(self, site, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, fail_rate=0.0, seed=0):
+        super().__init__((host, port), StubHandler)
+        self.site = site
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.injected_503 = 0
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def delay_and_fail(self):
+        """Wartet die Latenz ab und entscheidet, ob die Anfrage mit 503 beantwortet wird."""
+        with self.lock:
+            self.requests += 1
+            delay = self.latency + self.random.uniform(0, self.jitter) if self.jitter else self.latency
+            fail = self.fail_rate > 0 and self.random.random() < self.fail_rate
+            if fail:
+                self.injected_503 += 1
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def stats(self):
+        with self.lock:
+            return {"requests": self.requests, "injected_503": self.injected_503}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-Alive wie bei transfermarkt.de
+    # Header und Body gehen getrennt raus; ohne TCP_NODELAY kostet das mit Delayed ACK 40 ms pro Antwort
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.server.delay_and_fail():
+            status, content_type, body = 503, HTML, "Service Unavailable"
+        else:
+            status, content_type, body = self.server.site.respond(self.path)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(site, **kwargs):
+    """Startet den Server in einem Hintergrund-Thread und gibt ihn zurück (server.shutdown() beendet ihn)."""
+    server = StubServer(site, **kwargs)
+    threading.Thread(target=server.serve_forever, name="stub-server", daemon=True).start()
+    return server
+
+
+def add_server_arguments(parser):
+    parser.add_argument("--teams", type=int, default=fixtures.TEAMS_PER_COMPETITION, help="Teams pro Competition")
+    parser.add_argument("--players", type=int, default=fixtures.PLAYERS_PER_TEAM, help="Spieler pro Kader")
+    parser.add_argument("--cache-db", default=None, help="Spielt die Antworten dieses Antwort-Caches ab")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Antwortzeit jeder Anfrage")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Zufällige zusätzliche Antwortzeit (0 bis Wert)")
+    parser.add_argument("--fail-rate", type=float, default=0, help="Anteil der Anfragen, die mit 503 scheitern")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def server_from_args(args, port=0):
+    site = FixtureSite(args.teams, args.players, args.cache_db)
+    return start_server(site, port=port, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                        fail_rate=args.fail_rate, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokaler Ersatz-Server für transfermarkt.de")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_args(args, args.port)
+    print(f"Ersatz-Server läuft auf {server.base_url} (Strg+C beendet)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    server.shutdown()
+    print(f"Anfragen: {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
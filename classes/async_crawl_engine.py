@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from classes.competition_scraper import CompetitionScraper
+from classes.player_scraper import PlayerScraper
+from classes.team import Team
+from classes.team_scraper import TeamScraper
+from crawler import OUTPUT_DIR, crawl_player_row, fetch_squad, finish_team, team_filename, team_is_finished, team_key
+from helpers import extract_team_id
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCrawlEngine:
+    """
+    Nebenläufige Crawl-Engine auf Basis von asyncio.
+
+    Competitions, Teams und Spieler werden als eigene Tasks ausgeführt. Die blockierenden
+    Scraper laufen in einem eigenen Thread-Pool mit so vielen Threads wie die globale
+    Nebenläufigkeit erlaubt (der Standard-Executor von asyncio hat höchstens min(32, CPUs + 4)). Das
+    Request-Budget pro Host setzt der RateLimiter des gemeinsamen HttpClient durch.
+    Die Team-Dateien werden genau so geschrieben wie im sequentiellen Modus.
+    """
+
+    def __init__(self, competitions, concurrency=8, output_dir=OUTPUT_DIR, client=None, parser=None, typed=False,
+                 journal=None, delta=None, writer=None, registry=None, lite=False, performance=None,
+                 player_scraper=None):
+        self.competitions = competitions if isinstance(competitions, list) else [competitions]
+        # Ein PlayerScraper für alle Spieler, wie im Thread- und Pipeline-Modus; sein Profilseiten-Cache
+        # ist thread-sicher und durch die Cache-Optionen begrenzt
+        self.player_scraper = player_scraper or PlayerScraper(client=client, parser=parser, typed=typed)
+        self.client = client
+        self.parser = parser
+        self.typed = typed
+        self.journal = journal
+        self.delta = delta
+        self.writer = writer
+        self.registry = registry
+        self.lite = lite
+        self.performance = performance
+        self.concurrency = concurrency
+        self.output_dir = output_dir
+        self.semaphore = None
+        self.executor = None
+
+    async def _run_blocking(self, func, *args):
+        """Führt einen blockierenden Scraper-Aufruf innerhalb der globalen Nebenläufigkeit aus."""
+        async with self.semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def crawl_player(self, comp, team_obj, p_info):
+        return await self._run_blocking(crawl_player_row, self.player_scraper, comp, team_obj, p_info, None,
+                                        self.journal, self.delta, self.writer, self.registry)
+
+    async def crawl_team(self, comp, team_name, team_url):
+        team_id = extract_team_id(team_url)
+        team_obj = Team(name=team_name, url=team_url, team_id=team_id)
+
+        # Prüfe, ob das Team bereits gespeichert wurde
+        filename = team_filename(comp, team_name, team_id, self.output_dir)
+        key = team_key(comp, team_id)
+        if team_is_finished(filename, self.journal, key, self.delta, refresh=self.performance is not None):
+            logger.info("Team %s (%s) bereits vorhanden, überspringe...", team_name, team_id)
+            return
+
+        logger.info("Starte Scraping für Team: %s (%s)", team_name, team_id)
+        t_scraper = TeamScraper(team_obj, client=self.client, parser=self.parser, detailed=self.lite)
+        try:
+            player_basic_info_list = await self._run_blocking(fetch_squad, t_scraper, self.journal, key)
+            logger.info("Gefundene Spieler für %s: %d", team_name, len(player_basic_info_list))
+        except Exception as e:
+            logger.error("Fehler beim Abrufen der Spieler für Team %s: %s", team_name, e)
+            return
+        if self.performance is not None:
+            await self._run_blocking(self.performance.prepare_squad, comp, team_obj, player_basic_info_list)
+
+        # gather behält die Reihenfolge des Kaders bei, die Team-Datei bleibt deterministisch
+        rows = await asyncio.gather(*(self.crawl_player(comp, team_obj, p_info) for p_info in player_basic_info_list))
+        team_rows = [row for row in rows if row is not None]
+
+        await asyncio.get_running_loop().run_in_executor(self.executor, finish_team, filename, team_rows,
+                                                         self.journal, key, self.writer)
+
+    async def crawl_competition(self, comp):
+        logger.info("Starte Scraping für Competition: %s", comp.name)
+        c_scraper = CompetitionScraper(comp, client=self.client, parser=self.parser)
+        try:
+            await self._run_blocking(c_scraper.fetch_team_urls, comp)
+        except Exception as e:
+            logger.error("Fehler beim Abrufen der Teams für %s: %s", comp.name, e)
+            return
+        logger.info("Found %d teams for %s", len(comp.teams), comp.name)
+
+        await asyncio.gather(*(self.crawl_team(comp, team_name, team_url)
+                               for team_name, team_url in comp.teams.items()))
+
+    async def crawl(self):
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        # Die Scraper belegen höchstens concurrency Threads (Semaphore), der zusätzliche bleibt für die Team-Dateien
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency + 1, thread_name_prefix="crawl")
+        try:
+            await asyncio.gather(*(self.crawl_competition(comp) for comp in self.competitions))
+        finally:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def run(self):
+        """Startet den Crawl und blockiert, bis alle Competitions verarbeitet sind."""
+        start = time.monotonic()
+        asyncio.run(self.crawl())
+        logger.info("Async-Crawl abgeschlossen in %.1f Sekunden", time.monotonic() - start)
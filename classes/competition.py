@@ -1,4 +1,6 @@
 class Competition:
+    __slots__ = ("name", "season", "base_url", "competition_id", "teams")
+
     def __init__(self, name, season, base_url):
         self.name = name
         self.season = season
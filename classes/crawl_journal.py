@@ -0,0 +1,168 @@
+import json
+import sqlite3
+import threading
+import time
+
+from helpers import convert_to_serializable
+
+DONE = "done"
+FAILED = "failed"
+RUNNING = "running"
+INCOMPLETE = "incomplete"
+
+ENDPOINTS = ("profile", "market_value", "performance")
+
+
+class CrawlJournal:
+    """
+    Dauerhaftes Protokoll eines Crawls in SQLite.
+
+    Pro Team werden Kaderliste und Status gespeichert, pro Spieler die fertige Ausgabezeile
+    und pro Spieler und Endpunkt (Profil, Marktwert-Historie, Leistungsdaten) das Ergebnis.
+    Nach einem Abbruch setzt ein neuer Lauf mit demselben Journal beim ersten offenen Spieler
+    fort; fehlgeschlagene Endpunkte werden erneut abgerufen, erfolgreiche wiederverwendet.
+    WAL mit synchronous=NORMAL hält einen Eintrag nach jeder Anfrage billig.
+    Ein Journal gehört zu genau einem Crawl (eine Saison, ein Satz Competitions).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS teams (
+                team_key TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                squad TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS players (
+                team_key TEXT NOT NULL,
+                player_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                row TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (team_key, player_id)
+            );
+            CREATE TABLE IF NOT EXISTS endpoints (
+                player_id TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (player_id, endpoint)
+            );
+        """)
+        self.connection.commit()
+
+    def _write(self, sql, params):
+        with self.lock:
+            self.connection.execute(sql, params)
+            self.connection.commit()
+
+    def _read_one(self, sql, params):
+        with self.lock:
+            return self.connection.execute(sql, params).fetchone()
+
+    @staticmethod
+    def _dumps(value):
+        return json.dumps(value, ensure_ascii=False, default=convert_to_serializable)
+
+    # Teams
+
+    def team_status(self, team_key):
+        row = self._read_one("SELECT status FROM teams WHERE team_key = ?", (team_key,))
+        return row[0] if row else None
+
+    def squad(self, team_key):
+        """Gespeicherte Kaderliste eines Teams oder None."""
+        row = self._read_one("SELECT squad FROM teams WHERE team_key = ?", (team_key,))
+        return json.loads(row[0]) if row and row[0] else None
+
+    def record_squad(self, team_key, players):
+        self._write(
+            "INSERT INTO teams (team_key, status, squad, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(team_key) DO UPDATE SET status = excluded.status, squad = excluded.squad, "
+            "updated_at = excluded.updated_at",
+            (team_key, RUNNING, self._dumps(players), time.time())
+        )
+
+    def finish_team(self, team_key):
+        """Schließt ein Team ab: done, wenn jeder Spieler des Kaders fertig ist, sonst incomplete."""
+        squad = self.squad(team_key) or []
+        with self.lock:
+            done = self.connection.execute(
+                "SELECT COUNT(*) FROM players WHERE team_key = ? AND status = ?", (team_key, DONE)
+            ).fetchone()[0]
+        status = DONE if done >= len(squad) else INCOMPLETE
+        self._write("UPDATE teams SET status = ?, updated_at = ? WHERE team_key = ?",
+                    (status, time.time(), team_key))
+        return status
+
+    # Spieler
+
+    def player_row(self, team_key, player_id):
+        """Ausgabezeile eines fertigen Spielers oder None."""
+        row = self._read_one("SELECT row FROM players WHERE team_key = ? AND player_id = ? AND status = ?",
+                             (team_key, str(player_id), DONE))
+        return json.loads(row[0]) if row else None
+
+    def record_player(self, team_key, player_id, status, row=None, error=None):
+        self._write(
+            "INSERT INTO players (team_key, player_id, status, row, error, attempts, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, 1, ?) "
+            "ON CONFLICT(team_key, player_id) DO UPDATE SET status = excluded.status, row = excluded.row, "
+            "error = excluded.error, attempts = attempts + 1, updated_at = excluded.updated_at",
+            (team_key, str(player_id), status, self._dumps(row) if row is not None else None,
+             str(error) if error is not None else None, time.time())
+        )
+
+    # Endpunkte
+
+    def endpoint_payload(self, player_id, endpoint):
+        """
+        Returns:
+        - tuple: (True, payload) für einen erfolgreich abgerufenen Endpunkt, sonst (False, None).
+        """
+        row = self._read_one("SELECT payload FROM endpoints WHERE player_id = ? AND endpoint = ? AND status = ?",
+                             (str(player_id), endpoint, DONE))
+        if row is None:
+            return False, None
+        return True, json.loads(row[0])
+
+    def record_endpoint(self, player_id, endpoint, status, payload=None, error=None):
+        self._write(
+            "INSERT INTO endpoints (player_id, endpoint, status, payload, error, attempts, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, 1, ?) "
+            "ON CONFLICT(player_id, endpoint) DO UPDATE SET status = excluded.status, payload = excluded.payload, "
+            "error = excluded.error, attempts = attempts + 1, updated_at = excluded.updated_at",
+            (str(player_id), endpoint, status, self._dumps(payload) if payload is not None else None,
+             str(error) if error is not None else None, time.time())
+        )
+
+    def endpoints_complete(self, player_id):
+        """True, wenn alle Endpunkte eines Spielers erfolgreich abgerufen wurden."""
+        with self.lock:
+            done = self.connection.execute(
+                "SELECT COUNT(*) FROM endpoints WHERE player_id = ? AND status = ?", (str(player_id), DONE)
+            ).fetchone()[0]
+        return done == len(ENDPOINTS)
+
+    def stats(self):
+        stats = {}
+        with self.lock:
+            for table in ("teams", "players", "endpoints"):
+                stats[table] = dict(self.connection.execute(
+                    f"SELECT status, COUNT(*) FROM {table} GROUP BY status"
+                ).fetchall())
+        return stats
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,166 @@
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+
+# Logging über die Standardbibliothek: Aufrufer legen Einträge nur in eine Queue, Formatieren und
+# Schreiben übernimmt ein eigener Thread (QueueListener, siehe DeferredQueueHandler). Competition-, Team- und Spieler-ID kommen
+# aus einem Kontext (log_context) und stehen in jedem Eintrag, der darin geschrieben wird.
+
+LOG_FORMATS = ["text", "json"]
+LOG_LEVELS = ["debug", "info", "warning", "error"]
+CONTEXT_FIELDS = ("competition_id", "team_id", "player_id")
+TEXT_FORMAT = "[%(asctime)s] %(levelname)-7s %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_log_context = contextvars.ContextVar("log_context", default={})
+_listener = None
+
+
+@contextmanager
+def log_context(**ids):
+    """Setzt IDs (z.B. competition_id, team_id, player_id) für alle Einträge innerhalb des Blocks."""
+    token = _log_context.set({**_log_context.get(), **{key: str(value) for key, value in ids.items()}})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Hängt die IDs des aktuellen log_context an den Eintrag, noch im Thread des Aufrufers."""
+
+    def filter(self, record):
+        context = _log_context.get()
+        for field in CONTEXT_FIELDS:
+            setattr(record, field, context.get(field))
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Lässt DEBUG-Einträge von Spielern nur für einen Anteil der Spieler durch.
+
+    Die Auswahl hängt an der Spieler-ID, damit alle Zeilen eines ausgewählten Spielers erhalten
+    bleiben. INFO und höher sowie Einträge ohne Spieler werden nie verworfen.
+    """
+
+    def __init__(self, sample_rate):
+        super().__init__()
+        self.threshold = int(sample_rate * 10000)
+
+    def filter(self, record):
+        if record.levelno >= logging.INFO or record.player_id is None:
+            return True
+        return zlib.crc32(record.player_id.encode("utf-8")) % 10000 < self.threshold
+
+
+class JsonFormatter(logging.Formatter):
+    """Eine JSON-Zeile pro Eintrag mit Zeit, Level, Logger, Nachricht und den Kontext-IDs."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Legt Einträge unformatiert in die Queue. Der QueueHandler der Standardbibliothek formatiert
+    schon in prepare(), also im Thread des Aufrufers; hier werden Zeitstempel, Layout, JSON und
+    Tracebacks erst im QueueListener-Thread formatiert. Nur die Nachricht wird sofort mit ihren
+    Argumenten zusammengesetzt, weil sich veränderliche Argumente bis dahin ändern könnten.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class ConsoleHandler(logging.Handler):
+    """Schreibt über tqdm.write nach stderr, damit laufende Fortschrittsbalken nicht zerrissen werden."""
+
+    def emit(self, record):
+        try:
+            from tqdm import tqdm
+            tqdm.write(self.format(record), file=sys.stderr)
+        except Exception:
+            self.handleError(record)
+
+
+def configure_logging(level="info", log_format="text", log_file=None, sample_rate=1.0):
+    """
+    Richtet das Logging für einen Prozess ein; mehrfacher Aufruf ersetzt die vorherige Einrichtung.
+
+    Args:
+    - level (str): debug, info, warning oder error.
+    - log_format (str): text oder json (eine JSON-Zeile pro Eintrag).
+    - log_file (str): Schreibt in diese Datei statt nach stderr.
+    - sample_rate (float): Anteil der Spieler, deren DEBUG-Zeilen geschrieben werden.
+    """
+    global _listener
+    shutdown_logging()
+
+    if log_file:
+        handler = logging.FileHandler(log_file, encoding="utf-8")
+    else:
+        handler = ConsoleHandler()
+    handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+
+    queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(ContextFilter())
+    if sample_rate < 1.0:
+        queue_handler.addFilter(SamplingFilter(sample_rate))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+    # Die Debug-Ausgaben von urllib3 (eine Zeile pro Verbindung) sind selten hilfreich
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Schreibt alle wartenden Einträge und beendet den Logging-Thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def add_logging_arguments(parser):
+    parser.add_argument("--log-level", choices=LOG_LEVELS, default="info",
+                        help="debug zeigt zusätzlich jeden Schritt pro Spieler")
+    parser.add_argument("--log-format", choices=LOG_FORMATS, default="text",
+                        help="json schreibt eine JSON-Zeile pro Eintrag mit Competition-, Team- und Spieler-ID")
+    parser.add_argument("--log-file", default=None, help="Schreibt das Log in diese Datei statt nach stderr")
+    parser.add_argument("--log-sample-rate", type=float, default=1.0,
+                        help="Anteil der Spieler, deren Debug-Zeilen geschrieben werden (z.B. 0.05)")
+
+
+atexit.register(shutdown_logging)
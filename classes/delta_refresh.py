@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from crawler import load_previous_rows
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60
+STATE_FILENAME = ".scraped_at.json"
+
+
+class DeltaRefresh:
+    """
+    Inkrementeller Lauf: scraped nur Spieler, die sich seit dem letzten Lauf geändert haben.
+
+    Ein Spieler wird neu geholt, wenn er in keiner früheren Team-Datei dieses Teams steht
+    (neu oder gewechselt), wenn der Marktwert auf der Kaderseite vom gespeicherten abweicht
+    oder wenn seine Daten älter als `max_age_days` sind. Sonst wird die alte Zeile übernommen.
+    Der Zeitpunkt des letzten Abrufs pro Spieler steht in `.scraped_at.json` im Ausgabeverzeichnis;
+    für Spieler ohne Eintrag zählt die Änderungszeit ihrer Team-Datei.
+    """
+
+    def __init__(self, output_dir, max_age_days=7):
+        self.output_dir = output_dir
+        self.max_age = max_age_days * DAY
+        self.previous = load_previous_rows(output_dir)
+        self.state_path = os.path.join(output_dir, STATE_FILENAME)
+        self.scraped_at = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding='utf-8') as f:
+                self.scraped_at = json.load(f)
+        self.reused = 0
+        self.refreshed = {}
+        self.lock = threading.Lock()
+
+    def refresh_reason(self, competition, team_obj, p_info):
+        """Grund für einen neuen Abruf oder None, wenn die alte Zeile weiterverwendet werden kann."""
+        player_id = str(p_info["player_id"])
+        entry = self.previous.get(player_id)
+        if entry is None:
+            return "neu"
+        row, file_mtime = entry
+        if str(row.get("team_id")) != str(team_obj.team_id) or \
+                row.get("competition_id") != competition.competition_id or \
+                row.get("competition_season") != competition.season:
+            return "Vereinswechsel"
+        if p_info.get("market_value") is not None and p_info["market_value"] != row.get("market_value"):
+            return "Marktwert geändert"
+        if time.time() - self.scraped_at.get(player_id, file_mtime) > self.max_age:
+            return "veraltet"
+        return None
+
+    def reusable_row(self, competition, team_obj, p_info):
+        """Alte Zeile des Spielers, wenn er nicht neu geholt werden muss, sonst None."""
+        reason = self.refresh_reason(competition, team_obj, p_info)
+        with self.lock:
+            if reason is None:
+                self.reused += 1
+                return self.previous[str(p_info["player_id"])][0]
+            self.refreshed[reason] = self.refreshed.get(reason, 0) + 1
+        logger.debug("Spieler %s wird neu geholt: %s", p_info["player_id"], reason)
+        return None
+
+    def mark_scraped(self, player_id):
+        with self.lock:
+            self.scraped_at[str(player_id)] = time.time()
+
+    def save(self):
+        with self.lock:
+            with open(self.state_path, 'w', encoding='utf-8') as f:
+                json.dump(self.scraped_at, f)
+
+    def stats(self):
+        with self.lock:
+            return {"reused": self.reused, "refreshed": dict(self.refreshed)}
@@ -0,0 +1,260 @@
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from classes.metrics import get_default_metrics
+from classes.rate_limiter import get_default_rate_limiter
+
+try:
+    import brotli  # noqa: F401  (urllib3 dekodiert br automatisch, wenn brotli installiert ist)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+TRANSFERMARKT_URL = "https://www.transfermarkt.de"
+
+
+class OfflineCacheMiss(Exception):
+    """Im Offline-Modus fehlt die URL im Antwort-Cache; ein neuer Versuch ändert daran nichts."""
+
+# Verbindungsaufbau (TCP + TLS) pro Thread, wird von den Connection-Klassen unten hochgezählt
+_connect_times = threading.local()
+
+
+def _record_connect_time(seconds):
+    _connect_times.total = getattr(_connect_times, "total", 0.0) + seconds
+
+
+def _pop_connect_time():
+    seconds = getattr(_connect_times, "total", 0.0)
+    _connect_times.total = 0.0
+    return seconds
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter, dessen Verbindungen die Zeit für den Verbindungsaufbau messen."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def classify_endpoint(url):
+    """Ordnet eine Transfermarkt-URL einer Endpunkt-Klasse zu (z.B. 'profile' oder 'market_value')."""
+    if "/ceapi/marketValueDevelopment/graph/" in url:
+        return "market_value"
+    if "/leistungsdatendetails/" in url:
+        return "performance"
+    if "/profil/spieler/" in url:
+        return "profile"
+    if "/leistungsdaten/verein/" in url:
+        return "team_performance"
+    if "/verein/" in url:
+        return "squad"
+    if "/wettbewerb/" in url:
+        return "competition"
+    return "other"
+
+
+class RequestTiming:
+    """Zeitmessung einer einzelnen Anfrage (alle Zeiten in Sekunden)."""
+
+    def __init__(self, url, status_code, throttle, connect, wait, transfer, size):
+        self.url = url
+        self.endpoint = classify_endpoint(url)
+        self.status_code = status_code
+        self.throttle = throttle  # Wartezeit im Rate-Limiter vor dem Senden
+        self.connect = connect  # Verbindungsaufbau (0 bei wiederverwendeter Keep-Alive-Verbindung)
+        self.wait = wait  # Anfrage senden bis Header empfangen, ohne Verbindungsaufbau
+        self.transfer = transfer  # Übertragung des Bodys
+        self.size = size  # Bytes nach Dekompression
+
+    @property
+    def total(self):
+        return self.connect + self.wait + self.transfer
+
+    def to_dict(self):
+        return {
+            "url": self.url,
+            "endpoint": self.endpoint,
+            "status_code": self.status_code,
+            "throttle": self.throttle,
+            "connect": self.connect,
+            "wait": self.wait,
+            "transfer": self.transfer,
+            "total": self.total,
+            "size": self.size,
+        }
+
+
+class HttpClient:
+    """
+    Gemeinsame HTTP-Schicht für alle Scraper.
+
+    Hält eine requests.Session mit Connection-Pool und Keep-Alive, fordert komprimierte
+    Antworten an und misst für jede Anfrage Verbindungsaufbau, Wartezeit und Übertragung.
+    Jede Anfrage läuft durch den gemeinsamen RateLimiter, der auch die Antwort-Codes sieht.
+    Rate-Limit-Wartezeit, Netzwerkzeit und Bytes gehen zusätzlich in die CrawlMetrics.
+    Mit einem ResponseCache werden frische Antworten ohne Netzwerkzugriff beantwortet.
+    Mit `base_url` gehen alle Anfragen an transfermarkt.de stattdessen an diesen Server (z.B.
+    den Benchmark-Server); Scraper, Cache und Ausgabe sehen weiterhin die Original-URLs.
+    HTTP/2 wird von requests nicht unterstützt, Keep-Alive spart aber bereits den
+    TCP/TLS-Handshake bei jeder Folgeanfrage.
+    """
+
+    DEFAULT_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36",
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "Connection": "keep-alive",
+    }
+
+    def __init__(self, pool_size=10, timeout=30, headers=None, max_timings=10000, rate_limiter=None,
+                 response_cache=None, metrics=None, base_url=None):
+        self.timeout = timeout
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_default_rate_limiter()
+        self.metrics = metrics if metrics is not None else get_default_metrics()
+        self.session = requests.Session()
+        self.session.headers.update(self.DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+
+        adapter = _TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.timings = deque(maxlen=max_timings)
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        """Führt eine GET-Anfrage über die gemeinsame Session aus, bei Bedarf über den Antwort-Cache."""
+        endpoint = classify_endpoint(url)
+        with self.metrics.stage("fetch", endpoint):
+            if self.response_cache is None:
+                return self._fetch(url, None, **kwargs)
+            response = self.response_cache.get(
+                url, lambda cache_url, headers: self._fetch(cache_url, headers, **kwargs))
+        if getattr(response, "from_cache", False):
+            self.metrics.record_cache_hit(endpoint)
+        return response
+
+    def _fetch(self, url, extra_headers, **kwargs):
+        """Sendet die Anfrage über Rate-Limiter und Connection-Pool und misst die Zeiten."""
+        kwargs.setdefault("timeout", self.timeout)
+        if extra_headers:
+            kwargs["headers"] = {**kwargs.get("headers", {}), **extra_headers}
+        throttle = self.rate_limiter.acquire(url)
+        _pop_connect_time()
+        start = time.perf_counter()
+        response = self.session.get(self.request_url(url), stream=True, **kwargs)
+        headers_received = time.perf_counter()
+        content = response.content  # lädt den Body, gibt die Verbindung danach an den Pool zurück
+        done = time.perf_counter()
+        self.rate_limiter.report(url, response.status_code)
+
+        connect = _pop_connect_time()
+        timing = RequestTiming(
+            url=url,
+            status_code=response.status_code,
+            throttle=throttle,
+            connect=connect,
+            wait=max(headers_received - start - connect, 0.0),
+            transfer=done - headers_received,
+            size=len(content),
+        )
+        with self._lock:
+            self.timings.append(timing)
+        self.metrics.record_request(timing.endpoint, timing.status_code, throttle, timing.total, timing.size)
+        return response
+
+    def request_url(self, url):
+        """Die tatsächlich angefragte URL, bei gesetzter base_url auf den Ersatz-Server umgeschrieben."""
+        if self.base_url and url.startswith(TRANSFERMARKT_URL):
+            return self.base_url + url[len(TRANSFERMARKT_URL):]
+        return url
+
+    def timing_summary(self):
+        """Fasst die gemessenen Zeiten pro Endpunkt-Klasse zusammen."""
+        with self._lock:
+            timings = list(self.timings)
+
+        summary = {}
+        for timing in timings:
+            entry = summary.setdefault(timing.endpoint, {
+                "requests": 0, "new_connections": 0, "throttle": 0.0, "connect": 0.0, "wait": 0.0, "transfer": 0.0, "bytes": 0
+            })
+            entry["requests"] += 1
+            entry["new_connections"] += 1 if timing.connect > 0 else 0
+            entry["throttle"] += timing.throttle
+            entry["connect"] += timing.connect
+            entry["wait"] += timing.wait
+            entry["transfer"] += timing.transfer
+            entry["bytes"] += timing.size
+        return summary
+
+    def print_timing_summary(self):
+        for endpoint, entry in sorted(self.timing_summary().items()):
+            count = entry["requests"]
+            print(f"{endpoint}: {count} Anfragen, {entry['new_connections']} neue Verbindungen, "
+                  f"Ø Rate-Limit {entry['throttle'] / count:.3f}s, "
+                  f"Ø Verbindungsaufbau {entry['connect'] / count:.3f}s, "
+                  f"Ø Wartezeit {entry['wait'] / count:.3f}s, "
+                  f"Ø Übertragung {entry['transfer'] / count:.3f}s, "
+                  f"{entry['bytes'] / 1024:.0f} KiB")
+
+    def close(self):
+        self.session.close()
+        if self.response_cache is not None:
+            self.response_cache.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """Gibt den prozessweit geteilten HttpClient zurück und legt ihn beim ersten Aufruf an."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
@@ -0,0 +1,101 @@
+import gzip
+import io
+import json
+import threading
+
+from classes.metrics import get_default_metrics
+from helpers import convert_to_serializable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = ["none", "gzip", "zstd"]
+EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def dumps_line(row):
+    """Serialisiert eine Zeile als eine JSON-Zeile in Bytes, mit orjson falls installiert."""
+    if orjson is not None:
+        # Ohne OPT_SERIALIZE_NUMPY: Die Option lässt orjson beim ersten Aufruf numpy importieren, was bei
+        # gleichzeitigen ersten Aufrufen aus mehreren Threads den Prozess abstürzen lässt. Der Crawl
+        # erzeugt keine numpy-Werte mehr, übrige Typen behandelt convert_to_serializable.
+        return orjson.dumps(row, default=convert_to_serializable) + b"\n"
+    return (json.dumps(row, ensure_ascii=False, default=convert_to_serializable) + "\n").encode("utf-8")
+
+
+def compression_for(path):
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return "none"
+
+
+def open_stream(path, mode, compression=None):
+    """Öffnet eine (komprimierte) JSONL-Datei im Binärmodus."""
+    compression = compression or compression_for(path)
+    if compression == "gzip":
+        return gzip.open(path, mode)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("Für zstd-Kompression muss das Paket 'zstandard' installiert sein")
+        stream = zstandard.open(path, mode)
+        # Der Zstd-Leser kann keine Zeilen lesen, erst der Puffer darüber
+        return io.BufferedReader(stream) if "r" in mode else stream
+    return open(path, mode)
+
+
+def read_jsonl(path):
+    """Liest alle Zeilen einer (komprimierten) JSONL-Datei; eine abgeschnittene letzte Zeile wird ignoriert."""
+    rows = []
+    with open_stream(path, "rb") as f:
+        try:
+            for line in f:
+                if not line.strip():
+                    continue
+                rows.append(json.loads(line))
+        except (ValueError, EOFError):
+            # Abgebrochener Lauf: unvollständige Zeile oder unvollständiger Kompressionsblock
+            pass
+    return rows
+
+
+class JsonlWriter:
+    """
+    Schreibt Spielerzeilen als JSON Lines, jede Zeile sobald der Spieler fertig ist.
+
+    Unkomprimierte Dateien werden nach jeder Zeile geleert, komprimierte nach jedem Team
+    (flush()), damit Leser die Datei schon während des Crawls verarbeiten können.
+    Thread-sicher; der Speicherbedarf hängt nicht von der Größe des Crawls ab.
+    """
+
+    def __init__(self, path, compression=None, append=False):
+        self.path = path
+        self.compression = compression or compression_for(path)
+        self.stream = open_stream(path, "ab" if append else "wb", self.compression)
+        self.rows = 0
+        self.lock = threading.Lock()
+
+    def write(self, row):
+        with get_default_metrics().stage("serialize", "jsonl"):
+            line = dumps_line(row)
+        with self.lock:
+            self.stream.write(line)
+            self.rows += 1
+            if self.compression == "none":
+                self.stream.flush()
+
+    def flush(self):
+        with self.lock:
+            self.stream.flush()
+
+    def close(self):
+        with self.lock:
+            self.stream.close()
@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-sicherer LRU-Cache mit Begrenzung nach Anzahl Einträgen und/oder Bytes.
+
+    Die Größe eines Eintrags gibt der Aufrufer bei put() an. Zählt Treffer, Fehlzugriffe
+    und Verdrängungen, damit die Cache-Größe an den tatsächlichen Bedarf angepasst werden kann.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (value, size)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size=0):
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self.entries[key] = (value, size)
+            self.current_bytes += size
+            self._evict()
+
+    def _evict(self):
+        # Der zuletzt eingefügte Eintrag bleibt immer erhalten, auch wenn er allein das Byte-Budget sprengt
+        while len(self.entries) > 1 and (
+                (self.max_entries is not None and len(self.entries) > self.max_entries) or
+                (self.max_bytes is not None and self.current_bytes > self.max_bytes)):
+            _, (_, size) = self.entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
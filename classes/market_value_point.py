@@ -0,0 +1,28 @@
+class MarketValuePoint:
+    """Ein Eintrag der Marktwert-Historie eines Spielers."""
+
+    __slots__ = ("mw", "datum_mw", "verein", "age")
+
+    def __init__(self, mw, datum_mw, verein, age):
+        self.mw = mw
+        self.datum_mw = datum_mw
+        self.verein = verein
+        self.age = age
+
+    @classmethod
+    def from_api(cls, point):
+        # Eintrag aus der Liste 'list' der Marktwert-API
+        return cls(point.get('y'), point.get('datum_mw'), point.get('verein'), point.get('age'))
+
+    # Lesezugriff wie bei den Dicts aus Journal und älteren Ausgabedateien
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self):
+        return {"mw": self.mw, "datum_mw": self.datum_mw, "verein": self.verein, "age": self.age}
+
+    def __repr__(self):
+        return f"MarketValuePoint({self.datum_mw}: {self.mw})"
@@ -0,0 +1,323 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Obergrenzen der Histogramm-Klassen; Werte darüber landen in +Inf
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRIC_PREFIX = "transfermarkt"
+PROFILERS = ["cprofile", "pyinstrument"]
+STAGES = ["fetch", "parse", "serialize"]
+
+
+class Histogram:
+    """Histogramm mit festen Klassen wie bei Prometheus, dazu Summe und Maximum."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Schätzt ein Quantil als Obergrenze der Klasse, in die es fällt."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def cumulative_counts(self):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            yield bound, cumulative
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+            "buckets": {("+Inf" if bound == float("inf") else str(bound)): count
+                        for bound, count in self.cumulative_counts()},
+        }
+
+
+class StageProfiler:
+    """
+    Profiliert ausgewählte Stufen mit cProfile oder pyinstrument.
+
+    Jeder Thread bekommt pro Stufe einen eigenen Profiler, der nur während der Stufe läuft;
+    verschachtelte Stufen werden dem äußeren Profiler zugerechnet. Ab Python 3.12 erlaubt
+    cProfile nur einen aktiven Profiler pro Prozess, parallele Aufrufe bleiben dann unprofiliert.
+    """
+
+    def __init__(self, stages, profiler="cprofile", output_dir="profiles"):
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unbekannter Profiler: {profiler}")
+        if profiler == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError:
+                raise ImportError("Für --profiler pyinstrument muss das Paket 'pyinstrument' installiert sein")
+        self.stages = set(stages)
+        self.profiler = profiler
+        self.output_dir = output_dir
+        self.profiles = {}  # (Stufe, Thread-ID) -> Profiler
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def _profile_for(self, stage):
+        key = (stage, threading.get_ident())
+        with self.lock:
+            profile = self.profiles.get(key)
+            if profile is None:
+                if self.profiler == "cprofile":
+                    import cProfile
+                    profile = cProfile.Profile()
+                else:
+                    from pyinstrument import Profiler
+                    profile = Profiler(async_mode="disabled")
+                self.profiles[key] = profile
+            return profile
+
+    def start(self, stage):
+        """Startet den Profiler der Stufe; gibt ihn zurück oder None, wenn nicht profiliert wird."""
+        if stage not in self.stages or getattr(self.local, "active", False):
+            return None
+        profile = self._profile_for(stage)
+        try:
+            if self.profiler == "cprofile":
+                profile.enable()
+            else:
+                profile.start()
+        except (ValueError, RuntimeError):
+            return None
+        self.local.active = True
+        return profile
+
+    def stop(self, profile):
+        if self.profiler == "cprofile":
+            profile.disable()
+        else:
+            profile.stop()
+        self.local.active = False
+
+    def dump(self):
+        """Schreibt pro Stufe eine .prof-Datei (cProfile) bzw. .txt-Dateien (pyinstrument)."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        written = []
+        with self.lock:
+            profiles = dict(self.profiles)
+        for stage in sorted(self.stages):
+            stage_profiles = [(thread_id, profile) for (name, thread_id), profile in profiles.items()
+                              if name == stage]
+            if not stage_profiles:
+                continue
+            if self.profiler == "cprofile":
+                import pstats
+                path = os.path.join(self.output_dir, f"{stage}.prof")
+                stats = pstats.Stats(stage_profiles[0][1])
+                for _, profile in stage_profiles[1:]:
+                    stats.add(profile)
+                stats.dump_stats(path)
+                written.append(path)
+            else:
+                for thread_id, profile in stage_profiles:
+                    if profile.last_session is None:
+                        continue
+                    path = os.path.join(self.output_dir, f"{stage}.{thread_id}.txt")
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(profile.output_text())
+                    written.append(path)
+        return written
+
+
+class CrawlMetrics:
+    """
+    Sammelt Zeiten, Größen und Zähler aller Crawl-Stufen als Histogramme pro Endpunkt-Klasse.
+
+    HttpClient meldet Rate-Limit-Wartezeit, Netzwerkzeit, Bytes und Status jeder Anfrage, die
+    Scraper Parse-Zeit und Wiederholungen, crawler.py die Serialisierung. Thread-sicher; in
+    jedem Prozess gibt es eine eigene Instanz (siehe get_default_metrics).
+    """
+
+    def __init__(self, profiler=None):
+        self.histograms = {}  # (Name, Labels) -> Histogram
+        self.counters = {}  # (Name, Labels) -> Zahl
+        self.profiler = profiler
+        self.started = time.time()
+        self.lock = threading.Lock()
+
+    def observe(self, name, value, buckets=DURATION_BUCKETS, **labels):
+        key = (name, tuple(labels.items()))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(labels.items()))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def record_request(self, endpoint, status_code, throttle, network, size):
+        self.increment("requests", endpoint=endpoint, status=str(status_code))
+        self.observe("rate_limit_sleep_seconds", throttle, endpoint=endpoint)
+        self.observe("network_seconds", network, endpoint=endpoint)
+        self.observe("response_bytes", size, SIZE_BUCKETS, endpoint=endpoint)
+
+    def record_cache_hit(self, endpoint):
+        self.increment("cache_hits", endpoint=endpoint)
+
+    def record_retry(self, endpoint, delay):
+        """Zählt eine Wiederholung und die Backoff-Pause, die der Scraper davor einlegt."""
+        self.increment("retries", endpoint=endpoint)
+        self.observe("backoff_seconds", delay, endpoint=endpoint)
+
+    @contextmanager
+    def stage(self, stage, endpoint):
+        """Misst eine Stufe (fetch, parse, serialize) und profiliert sie, falls ausgewählt."""
+        profile = self.profiler.start(stage) if self.profiler is not None else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            if profile is not None:
+                self.profiler.stop(profile)
+            self.observe("stage_seconds", duration, stage=stage, endpoint=endpoint)
+
+    def snapshot(self):
+        with self.lock:
+            histograms = {key: histogram.to_dict() for key, histogram in self.histograms.items()}
+            counters = dict(self.counters)
+        return histograms, counters
+
+    def to_dict(self):
+        histograms, counters = self.snapshot()
+        return {
+            "started": self.started,
+            "duration": time.time() - self.started,
+            "histograms": [{"name": name, "labels": dict(labels), **values}
+                           for (name, labels), values in sorted(histograms.items())],
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for (name, labels), value in sorted(counters.items())],
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """Textformat für den Prometheus Node-Exporter (textfile collector) oder Pushgateway."""
+        histograms, counters = self.snapshot()
+        lines = []
+        for name in sorted({name for name, _ in counters}):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for (counter_name, labels), value in sorted(counters.items()):
+                if counter_name == name:
+                    lines.append(f"{metric}{_format_labels(labels)} {value}")
+        for name in sorted({name for name, _ in histograms}):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for (histogram_name, labels), values in sorted(histograms.items()):
+                if histogram_name != name:
+                    continue
+                for bound, count in values["buckets"].items():
+                    lines.append(f"{metric}_bucket{_format_labels(labels + (('le', bound),))} {count}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {values['sum']}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {values['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Schreibt die Metriken als Prometheus-Text (.prom, .txt) oder sonst als JSON."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def summary_rows(self):
+        """Eine Zeile pro Endpunkt-Klasse mit den wichtigsten Kennzahlen."""
+        histograms, counters = self.snapshot()
+        rows = {}
+        for (name, labels), value in counters.items():
+            labels = dict(labels)
+            row = rows.setdefault(labels["endpoint"], {})
+            row[name] = row.get(name, 0) + value
+        for (name, labels), values in histograms.items():
+            labels = dict(labels)
+            row = rows.setdefault(labels["endpoint"], {})
+            if name == "stage_seconds":
+                name = f"{labels['stage']}_seconds"
+            row[name] = values
+        return rows
+
+    def print_summary(self):
+        print("Metriken pro Endpunkt (Ø / p95):")
+        for endpoint, row in sorted(self.summary_rows().items()):
+            parts = []
+            if "requests" in row:
+                parts.append(f"{row['requests']} Anfragen")
+            if "cache_hits" in row:
+                parts.append(f"{row['cache_hits']} aus dem Cache")
+            if "retries" in row:
+                parts.append(f"{row['retries']} Wiederholungen")
+            for name, label in (("rate_limit_sleep_seconds", "Rate-Limit"), ("network_seconds", "Netzwerk"),
+                                ("fetch_seconds", "Abruf"), ("parse_seconds", "Parsen"),
+                                ("serialize_seconds", "Serialisieren"), ("backoff_seconds", "Backoff")):
+                if name in row:
+                    parts.append(f"{label} {row[name]['mean']:.3f}s / {row[name]['p95']:.3f}s")
+            if "response_bytes" in row:
+                parts.append(f"{row['response_bytes']['sum'] / 1024:.0f} KiB")
+            print(f"  {endpoint}: " + ", ".join(parts))
+        if self.profiler is not None:
+            for path in self.profiler.dump():
+                print(f"  Profil geschrieben: {path}")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+_default_metrics = None
+_default_metrics_lock = threading.Lock()
+
+
+def get_default_metrics():
+    """Gibt die prozessweit geteilten CrawlMetrics zurück und legt sie beim ersten Aufruf an."""
+    global _default_metrics
+    with _default_metrics_lock:
+        if _default_metrics is None:
+            _default_metrics = CrawlMetrics()
+        return _default_metrics
+
+
+def set_default_metrics(metrics):
+    """Ersetzt die prozessweiten CrawlMetrics, z.B. durch eine Instanz mit StageProfiler."""
+    global _default_metrics
+    with _default_metrics_lock:
+        _default_metrics = metrics
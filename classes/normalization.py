@@ -0,0 +1,89 @@
+import re
+from datetime import datetime
+
+# Typisierung der Strings von transfermarkt.de: "-" und leere Zellen werden None, Zahlen haben
+# Tausenderpunkte und Dezimalkommas ("1.091", "1,52"), Datumsangaben die Form "27.03.1996".
+# Die Einzelwert-Funktionen laufen beim Parsen pro Spieler (--typed), die Spalten-Funktionen
+# beim Export über alle Zeilen auf einmal; beide liefern dieselben Werte.
+
+PERFORMANCE_INT_COLUMNS = [
+    "in_squad", "appearances", "goals", "assists", "own_goals", "subbed_in", "subbed_out", "yellow_cards",
+    "yellow_red_cards", "red_cards", "penalty_goals", "goals_against", "clean_sheets", "minutes_per_goal",
+    "minutes_played",
+]
+PERFORMANCE_FLOAT_COLUMNS = ["points_per_game"]
+
+NULL_STRINGS = ("", "-")
+GERMAN_DATE = re.compile(r"(\d{2})\.(\d{2})\.(\d{4})")
+ISO_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+
+
+def german_number(value, number_type=float):
+    """Wandelt "1.091", "1,52", "2.061'" oder "-" in eine Zahl bzw. None um; Zahlen bleiben unverändert."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    text = value.strip().replace("'", "").replace(".", "").replace(",", ".")
+    if text in NULL_STRINGS:
+        return None
+    try:
+        return number_type(float(text))
+    except ValueError:
+        return None
+
+
+def german_date(value):
+    """Wandelt "27.03.1996" oder "27.03.1996 (28)" in "1996-03-27" um, sonst None; ISO-Daten bleiben."""
+    if not isinstance(value, str):
+        return None
+    match = GERMAN_DATE.search(value)
+    if match:
+        day, month, year = match.groups()
+    else:
+        match = ISO_DATE.search(value)
+        if not match:
+            return None
+        year, month, day = match.groups()
+    try:
+        return datetime(int(year), int(month), int(day)).date().isoformat()
+    except ValueError:
+        return None
+
+
+def typed_performance(entries):
+    """Wandelt die int-/float-Spalten der Leistungsdaten eines Spielers an Ort und Stelle um."""
+    for entry in entries:
+        for column in PERFORMANCE_INT_COLUMNS:
+            if column in entry:
+                entry[column] = german_number(entry[column], int)
+        for column in PERFORMANCE_FLOAT_COLUMNS:
+            if column in entry:
+                entry[column] = german_number(entry[column], float)
+    return entries
+
+
+def german_numbers(series, dtype):
+    """Spaltenweise Variante von german_number für eine ganze pandas-Spalte."""
+    import pandas as pd
+
+    is_text = series.map(lambda value: isinstance(value, str)).astype(bool)
+    text = series[is_text].astype("string").str.strip()
+    text = text.str.replace("'", "", regex=False).str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    text = text.mask(text.isin(NULL_STRINGS))
+    numbers = pd.to_numeric(series.where(~is_text), errors="coerce").astype("Float64")
+    numbers[is_text] = pd.to_numeric(text, errors="coerce").astype("Float64")
+    if dtype == "Int64":
+        numbers = numbers.round()
+    return numbers.astype(dtype)
+
+
+def german_dates(series):
+    """Spaltenweise Variante von german_date; liefert datetime64-Werte."""
+    import pandas as pd
+
+    text = series.astype("string")
+    german = text.str.extract(GERMAN_DATE.pattern)
+    iso = text.str.extract(ISO_DATE.pattern)
+    year = german[2].fillna(iso[0])
+    month = german[1].fillna(iso[1])
+    day = german[0].fillna(iso[2])
+    return pd.to_datetime(year + "-" + month + "-" + day, format="%Y-%m-%d", errors="coerce")
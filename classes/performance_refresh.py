@@ -0,0 +1,104 @@
+import logging
+import threading
+
+from classes.team_performance_scraper import TeamPerformanceScraper
+from crawler import load_previous_rows
+
+logger = logging.getLogger(__name__)
+
+PERFORMANCE_MODES = ["career", "team", "season"]
+
+
+class PerformanceRefresh:
+    """
+    Aktualisiert Leistungsdaten aus den Ausgabedateien eines früheren Laufs, statt die ganze
+    Karriere jedes Spielers neu zu laden.
+
+    Saisons vor der Saison, in der ein Spieler zuletzt gespeichert wurde, waren beim Speichern
+    abgeschlossen und werden nicht mehr geholt. Neu geholt werden nur die gespeicherte Saison
+    (sie lief beim Speichern noch) und alle Saisons bis zur laufenden.
+
+    Modus "season": pro Spieler eine Anfrage an die Karriere-Seite, gefiltert auf jede dieser
+    Saisons; die Zeilen ersetzen die gespeicherten Zeilen dieser Saisons.
+
+    Modus "team": Die laufende Saison kommt für den ganzen Kader aus einer Anfrage an die
+    Leistungsdaten-Seite des Vereins (TeamPerformanceScraper) und ersetzt die gespeicherte Zeile
+    dieser Saison in der Liga. Pokal- und Europapokal-Zeilen der laufenden Saison bleiben auf
+    dem gespeicherten Stand, bis der erste Lauf der nächsten Saison die Saison vollständig neu
+    holt. Spieler, die auf der Vereinsseite fehlen oder zuletzt in einer früheren Saison
+    gespeichert wurden, bekommen die Saison-Abfrage.
+
+    Die ganze Karriere wird nur noch für einen Backfill geholt, wenn ein Spieler keine
+    gespeicherten Leistungsdaten hat.
+    """
+
+    def __init__(self, output_dir, mode="team", client=None, parser=None, typed=False, previous=None):
+        self.mode = mode
+        self.client = client
+        self.parser = parser
+        self.typed = typed
+        self.previous = previous if previous is not None else load_previous_rows(output_dir)
+        self.lock = threading.Lock()
+        self.team_pages = 0
+        self.updated = 0
+        self.incremental = 0
+        self.backfilled = 0
+
+    def stored_history(self, player_id):
+        """Gespeicherte Leistungsdaten und Saison eines Spielers, oder (None, None)."""
+        entry = self.previous.get(str(player_id))
+        if entry is None:
+            return None, None
+        row = entry[0]
+        if not row.get("performance_data") or not isinstance(row.get("competition_season"), int):
+            return None, None
+        return row["performance_data"], row["competition_season"]
+
+    def prepare_squad(self, competition, team_obj, squad):
+        """
+        Hängt an die Kader-Einträge, was crawler.scrape_player statt des Karriere-Abrufs
+        braucht ("performance_update"): die gespeicherte Historie und entweder die Zeilen der
+        Vereinsseite ("rows") oder die neu zu holenden Saisons ("seasons"). Spieler ohne
+        gespeicherte Leistungsdaten bekommen keinen Eintrag und damit einen Backfill.
+        """
+        team_rows = {}
+        if self.mode == "team":
+            team_rows = self.fetch_team_rows(competition, team_obj)
+        updated = incremental = backfilled = 0
+        for p_info in squad:
+            history, stored_season = self.stored_history(p_info["player_id"])
+            if history is None or stored_season > competition.season:
+                backfilled += 1
+                continue
+            rows = team_rows.get(str(p_info["player_id"])) if stored_season == competition.season else None
+            if rows is not None:
+                p_info["performance_update"] = {"history": history, "rows": rows}
+                updated += 1
+            else:
+                seasons = list(range(stored_season, competition.season + 1))
+                p_info["performance_update"] = {"history": history, "seasons": seasons}
+                incremental += 1
+        with self.lock:
+            self.updated += updated
+            self.incremental += incremental
+            self.backfilled += backfilled
+
+    def fetch_team_rows(self, competition, team_obj):
+        """Zeilen der Vereinsseite pro player_id; {} wenn die Seite nicht geholt werden konnte."""
+        try:
+            team_rows = TeamPerformanceScraper(team_obj, competition, client=self.client, parser=self.parser,
+                                               typed=self.typed).fetch_performance()
+        except Exception as e:
+            logger.warning("Fehler bei den Leistungsdaten für Team %s: %s", team_obj.name, e)
+            team_rows = None
+        with self.lock:
+            self.team_pages += 1
+        if team_rows is None:
+            logger.warning("Keine Leistungsdaten für Team %s, hole die Saisons einzeln", team_obj.name)
+            return {}
+        return team_rows
+
+    def stats(self):
+        with self.lock:
+            return {"team_pages": self.team_pages, "updated": self.updated, "incremental": self.incremental,
+                    "backfilled": self.backfilled}
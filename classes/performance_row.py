@@ -0,0 +1,87 @@
+class PerformanceRow:
+    """
+    Eine Zeile der Leistungsdaten eines Spielers.
+
+    Feldspieler und Torhüter haben unterschiedliche Spalten; `columns` legt fest, welche Felder
+    gesetzt sind und in welcher Reihenfolge sie ausgegeben werden.
+    """
+
+    FIELD_PLAYER_COLUMNS = (
+        "season", "competition", "club", "in_squad", "appearances", "points_per_game", "goals", "assists",
+        "own_goals", "subbed_in", "subbed_out", "yellow_cards", "yellow_red_cards", "red_cards", "penalty_goals",
+        "minutes_per_goal", "minutes_played",
+    )
+    GOALKEEPER_COLUMNS = (
+        "season", "competition", "club", "in_squad", "appearances", "points_per_game", "goals", "own_goals",
+        "subbed_in", "subbed_out", "yellow_cards", "yellow_red_cards", "red_cards", "goals_against",
+        "clean_sheets", "minutes_played",
+    )
+
+    __slots__ = ("columns",) + FIELD_PLAYER_COLUMNS + ("goals_against", "clean_sheets")
+
+    def __init__(self, columns, **values):
+        self.columns = columns
+        for column in columns:
+            setattr(self, column, values[column])
+
+    # Zugriff wie bei den Dicts aus Journal und älteren Ausgabedateien
+    def __contains__(self, column):
+        return column in self.columns
+
+    def __getitem__(self, column):
+        if column not in self.columns:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    def __setitem__(self, column, value):
+        if column not in self.columns:
+            raise KeyError(column)
+        setattr(self, column, value)
+
+    def get(self, column, default=None):
+        return getattr(self, column) if column in self.columns else default
+
+    def to_dict(self):
+        return {column: getattr(self, column) for column in self.columns}
+
+    def __repr__(self):
+        return f"PerformanceRow({self.season}, {self.competition}, {self.club})"
+
+
+def season_label(season):
+    """Saison wie in den Leistungsdaten, z.B. 2024 -> "24/25"."""
+    return f"{season % 100:02d}/{(season + 1) % 100:02d}"
+
+
+def name_key(name):
+    """Vergleichsschlüssel für Wettbewerbs- und Vereinsnamen: ohne Groß-/Kleinschreibung und Satzzeichen."""
+    return "".join(char for char in str(name or "").casefold() if char.isalnum())
+
+
+def _merge_key(row):
+    return row.get("season"), name_key(row.get("competition")), name_key(row.get("club"))
+
+
+def merge_performance(history, rows, seasons=None):
+    """
+    Ersetzt in einer gespeicherten Historie die Zeilen derselben Saison, desselben Wettbewerbs
+    und desselben Vereins durch die neuen Zeilen; die neuen stehen wie auf Transfermarkt vorn.
+
+    Namen werden über name_key verglichen. Ersetzt eine neue Zeile eine gespeicherte, übernimmt
+    sie deren Schreibweise (Link-Titel der Karriere-Tabelle), damit ein Verein in der Historie
+    nicht unter zwei Namen steht.
+
+    Mit seasons (Saison-Labels wie "24/25") werden alle gespeicherten Zeilen dieser Saisons
+    ersetzt, auch Wettbewerbe, die in den neuen Zeilen nicht mehr vorkommen.
+    """
+    if seasons is not None:
+        seasons = set(seasons)
+        return list(rows) + [row for row in history if row.get("season") not in seasons]
+    stored = {_merge_key(row): row for row in history}
+    for row in rows:
+        match = stored.get(_merge_key(row))
+        if match is not None:
+            row["competition"] = match.get("competition")
+            row["club"] = match.get("club")
+    replaced = {_merge_key(row) for row in rows}
+    return list(rows) + [row for row in history if _merge_key(row) not in replaced]
@@ -0,0 +1,206 @@
+import logging
+import queue
+import threading
+import time
+
+from classes.competition_scraper import CompetitionScraper
+from classes.team import Team
+from classes.team_scraper import TeamScraper
+from crawler import OUTPUT_DIR, crawl_player_row, fetch_squad, finish_team, team_filename, team_is_finished, team_key
+from helpers import extract_team_id
+
+logger = logging.getLogger(__name__)
+
+# Markiert das Ende einer Warteschlange; jeder Worker einer Stufe bekommt einen
+_DONE = object()
+
+
+class PendingRows(list):
+    """
+    Nimmt die Zeilen an, die crawl_player_row in den JSONL-Strom schreiben würde, damit erst
+    die Schreib-Stufe sie schreibt.
+    """
+
+    def write(self, row):
+        self.append(row)
+
+
+class TeamState:
+    """Zeilen eines Teams in Kader-Reihenfolge, bis alle Spieler bearbeitet sind."""
+
+    def __init__(self, comp, team_obj, filename, key, squad_size):
+        self.comp = comp
+        self.team_obj = team_obj
+        self.filename = filename
+        self.key = key
+        self.rows = [None] * squad_size
+        self.pending = [None] * squad_size  # Pro Spieler die Zeilen für den JSONL-Strom
+        self.done = [False] * squad_size
+        self.streamed = 0  # Spieler, deren Zeilen schon im Strom stehen
+        self.remaining = squad_size
+
+
+class PipelineCrawlEngine:
+    """
+    Crawl als Kette von Stufen mit begrenzten Warteschlangen dazwischen:
+    Competitions -> Teams -> Spieler -> Schreiben.
+
+    Jede Stufe hat eigene Worker-Threads. Eine Stufe beginnt, sobald das erste Element der
+    vorigen ankommt: Die Kader der ersten Competition werden geholt, während die Teamliste der
+    nächsten noch lädt, und Spieler laufen, während weitere Kader geparst werden. Volle
+    Warteschlangen bremsen die vorigen Stufen, statt Kader und Spieler ohne Grenze zu sammeln.
+    Alle Anfragen gehen weiter durch den RateLimiter des gemeinsamen HttpClient.
+
+    Ein einziger Schreib-Thread sammelt die Zeilen pro Team und schreibt die Team-Datei, sobald
+    alle Spieler des Teams fertig sind; die Dateien sind dieselben wie im sequentiellen Modus.
+    Auch den JSONL-Strom schreibt nur er: Die Spieler-Stufe gibt ihre Zeilen mit weiter, und
+    sie landen in Kader-Reihenfolge im Strom, sobald alle vorherigen Spieler des Teams fertig sind.
+    """
+
+    def __init__(self, competitions, player_scraper, output_dir=OUTPUT_DIR, client=None, parser=None,
+                 competition_workers=1, team_workers=2, player_workers=8, queue_size=64, journal=None, delta=None,
+                 writer=None, registry=None, lite=False, performance=None):
+        self.competitions = competitions if isinstance(competitions, list) else [competitions]
+        self.player_scraper = player_scraper
+        self.output_dir = output_dir
+        self.client = client
+        self.parser = parser
+        self.workers = {"competition": competition_workers, "team": team_workers, "player": player_workers}
+        self.journal = journal
+        self.delta = delta
+        self.writer = writer
+        self.registry = registry
+        self.lite = lite
+        self.performance = performance
+        self.competition_queue = queue.Queue()
+        self.team_queue = queue.Queue(maxsize=queue_size)
+        self.player_queue = queue.Queue(maxsize=queue_size)
+        self.write_queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.processed = {"competition": 0, "team": 0, "player": 0, "write": 0}
+
+    def _count(self, stage):
+        with self.lock:
+            self.processed[stage] += 1
+
+    def crawl_competition(self, comp):
+        logger.info("Starte Scraping für Competition: %s", comp.name)
+        c_scraper = CompetitionScraper(comp, client=self.client, parser=self.parser)
+        try:
+            c_scraper.fetch_team_urls(comp)
+        except Exception as e:
+            logger.error("Fehler beim Abrufen der Teams für %s: %s", comp.name, e)
+            return
+        logger.info("Found %d teams for %s", len(comp.teams), comp.name)
+        for team_name, team_url in comp.teams.items():
+            self.team_queue.put((comp, team_name, team_url))
+
+    def crawl_team(self, comp, team_name, team_url):
+        team_id = extract_team_id(team_url)
+        team_obj = Team(name=team_name, url=team_url, team_id=team_id)
+
+        # Prüfe, ob das Team bereits gespeichert wurde
+        filename = team_filename(comp, team_name, team_id, self.output_dir)
+        key = team_key(comp, team_id)
+        if team_is_finished(filename, self.journal, key, self.delta, refresh=self.performance is not None):
+            logger.info("Team %s (%s) bereits vorhanden, überspringe...", team_name, team_id)
+            return
+
+        logger.info("Starte Scraping für Team: %s (%s)", team_name, team_id)
+        t_scraper = TeamScraper(team_obj, client=self.client, parser=self.parser, detailed=self.lite)
+        try:
+            player_basic_info_list = fetch_squad(t_scraper, self.journal, key)
+            logger.info("Gefundene Spieler für %s: %d", team_name, len(player_basic_info_list))
+        except Exception as e:
+            logger.error("Fehler beim Abrufen der Spieler für Team %s: %s", team_name, e)
+            return
+        if self.performance is not None:
+            self.performance.prepare_squad(comp, team_obj, player_basic_info_list)
+
+        state = TeamState(comp, team_obj, filename, key, len(player_basic_info_list))
+        if not player_basic_info_list:
+            # Leerer Kader: die Schreib-Stufe legt trotzdem die (leere) Team-Datei an
+            self.write_queue.put((state, None, None, None))
+        for index, p_info in enumerate(player_basic_info_list):
+            self.player_queue.put((state, index, p_info))
+
+    def crawl_player(self, state, index, p_info):
+        # Zeilen für den JSONL-Strom nur sammeln, schreiben darf allein die Schreib-Stufe
+        pending = PendingRows() if self.writer is not None else None
+        try:
+            row = crawl_player_row(self.player_scraper, state.comp, state.team_obj, p_info, None, self.journal,
+                                   self.delta, pending, self.registry)
+        except Exception as e:
+            logger.error("Fehler bei Spieler %s: %s", p_info["player_id"], e)
+            row = None
+        # Auch ohne Zeile weitergeben, sonst wartet die Schreib-Stufe ewig auf das Team
+        self.write_queue.put((state, index, row, pending))
+
+    def write_row(self, state, index, row, pending):
+        if index is not None:
+            state.rows[index] = row
+            state.pending[index] = pending
+            state.done[index] = True
+            state.remaining -= 1
+            self.stream_rows(state)
+        if state.remaining > 0:
+            return
+        team_rows = [row for row in state.rows if row is not None]
+        finish_team(state.filename, team_rows, self.journal, state.key, self.writer)
+
+    def stream_rows(self, state):
+        """Schreibt die Zeilen aller Spieler in den Strom, vor denen im Kader niemand mehr fehlt."""
+        while state.streamed < len(state.done) and state.done[state.streamed]:
+            for row in state.pending[state.streamed] or ():
+                self.writer.write(row)
+            state.pending[state.streamed] = None
+            state.streamed += 1
+
+    def _worker(self, stage, work_queue, handle):
+        """Arbeitet Elemente einer Warteschlange ab, bis das Ende-Signal kommt."""
+        while True:
+            item = work_queue.get()
+            if item is _DONE:
+                return
+            try:
+                handle(*item)
+            except Exception as e:
+                logger.error("Fehler in Stufe %s: %s", stage, e)
+            self._count(stage)
+
+    def _start(self, stage, work_queue, handle, count):
+        threads = [threading.Thread(target=self._worker, args=(stage, work_queue, handle),
+                                    name=f"{stage}-{i}", daemon=True) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def _finish(self, threads, work_queue):
+        """Beendet eine Stufe, nachdem die vorige fertig ist: ein Ende-Signal pro Worker."""
+        for _ in threads:
+            work_queue.put(_DONE)
+        for thread in threads:
+            thread.join()
+
+    def run(self):
+        """Startet alle Stufen und blockiert, bis die letzte Team-Datei geschrieben ist."""
+        start = time.monotonic()
+        for comp in self.competitions:
+            self.competition_queue.put((comp,))
+
+        stages = [
+            (self.competition_queue, self._start("competition", self.competition_queue, self.crawl_competition,
+                                                 self.workers["competition"])),
+            (self.team_queue, self._start("team", self.team_queue, self.crawl_team, self.workers["team"])),
+            (self.player_queue, self._start("player", self.player_queue, self.crawl_player,
+                                            self.workers["player"])),
+            # Ein Schreib-Thread für Team-Dateien, Journal-Abschluss und JSONL-Strom
+            (self.write_queue, self._start("write", self.write_queue, self.write_row, 1)),
+        ]
+        for work_queue, threads in stages:
+            self._finish(threads, work_queue)
+        logger.info("Pipeline-Crawl abgeschlossen in %.1f Sekunden: %s", time.monotonic() - start, self.stats())
+
+    def stats(self):
+        with self.lock:
+            return dict(self.processed)
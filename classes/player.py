@@ -1,4 +1,11 @@
 class Player:
+    __slots__ = (
+        "player_id", "player_url", "name", "birthday", "height", "nationalities", "main_position",
+        "side_positions", "preferred_foot", "social_media", "market_value", "market_value_history",
+        "current_club", "in_team_since", "contract_until", "last_extension", "player_agent", "birth_place",
+        "performance_data",
+    )
+
     def __init__(self, player_id, player_url):
         self.player_id = player_id
         self.player_url = player_url
@@ -62,11 +69,24 @@ class Player:
     def set_performance_data(self, performance_data):
         self.performance_data = performance_data
 
-    def player_to_dict(self):
+    def to_row(self, competition, team):
+        """
+        Flache Ausgabezeile des Spielers für die Team-Datei.
+
+        Marktwert-Historie und Leistungsdaten werden nicht kopiert; ihre Einträge serialisiert
+        erst der JSON-Encoder über convert_to_serializable.
+        """
         return {
+            "competition_name": competition.name,
+            "competition_season": competition.season,
+            "competition_url": competition.get_season_url(),
+            "competition_id": competition.competition_id,
+            "team_name": team.name,
+            "team_id": team.team_id,
+            "team_url": team.url,
             "player_id": self.player_id,
+            "player_name": self.name,
             "player_url": self.player_url,
-            "name": self.name,
             "birthday": self.birthday,
             "height": self.height,
             "nationalities": self.nationalities,
@@ -75,7 +95,7 @@ class Player:
             "preferred_foot": self.preferred_foot,
             "social_media": self.social_media,
             "market_value": self.market_value,
-            "market_value_history": self.market_value_history if self.market_value_history is not None else None,
+            "market_value_history": self.market_value_history,
             "current_club": self.current_club,
             "in_team_since": self.in_team_since,
             "contract_until": self.contract_until,
@@ -0,0 +1,71 @@
+import threading
+from concurrent.futures import Future
+
+from classes.crawl_journal import ENDPOINTS
+from classes.lru_cache import LRUCache
+
+# Ein Player mit Marktwert-Historie und Karriere belegt grob 20-40 KB
+DEFAULT_MAX_PLAYERS = 5000
+
+
+class PlayerRegistry:
+    """
+    Laufweites Verzeichnis der bereits gescrapten Spieler, Schlüssel ist die player_id.
+
+    Zweitmannschaften, Leihspieler und Wechsel in der laufenden Saison bringen denselben
+    Spieler in mehrere Kader eines Laufs. Der erste Kader holt Profil, Marktwert-Historie und
+    Leistungsdaten, jeder weitere bekommt denselben Player und baut daraus nur seine eigene
+    Zeile. Fragen zwei Threads gleichzeitig nach einem Spieler, wartet der zweite auf den
+    ersten. Fehlgeschlagene Spieler (None) werden nicht gemerkt, der nächste Kader versucht es
+    erneut. Thread-sicher; jeder Prozess hat sein eigenes Verzeichnis.
+
+    Fertige Spieler liegen in einem LRUCache mit höchstens `max_players` Einträgen, damit ein
+    langer Lauf nicht jeden Player bis zum Ende im Speicher hält. Ein verdrängter Spieler wird
+    bei einem späteren Kader einfach erneut geholt.
+    """
+
+    def __init__(self, max_players=DEFAULT_MAX_PLAYERS):
+        self.players = LRUCache(max_entries=max_players)  # player_id -> Player
+        self.pending = {}  # player_id -> Future, solange ein Thread den Spieler holt
+        self.lock = threading.Lock()
+        self.scraped = 0
+        self.reused = 0
+
+    def player(self, player_id, scrape, *args):
+        """Gibt den Player zurück; nur beim ersten Aufruf pro player_id wird scrape(*args) ausgeführt."""
+        player_id = str(player_id)
+        with self.lock:
+            p_obj = self.players.get(player_id)
+            if p_obj is not None:
+                self.reused += 1
+                return p_obj
+            future = self.pending.get(player_id)
+            owner = future is None
+            if owner:
+                future = self.pending[player_id] = Future()
+        if not owner:
+            p_obj = future.result()
+            if p_obj is not None:
+                with self.lock:
+                    self.reused += 1
+                return p_obj
+            # Der erste Versuch ist gescheitert; selbst erneut versuchen
+            return self.player(player_id, scrape, *args)
+
+        p_obj = None
+        try:
+            p_obj = scrape(*args)
+        finally:
+            # Auch bei einer Ausnahme die Wartenden freigeben, sie versuchen es dann selbst
+            with self.lock:
+                del self.pending[player_id]
+                if p_obj is not None:
+                    self.players.put(player_id, p_obj)
+                    self.scraped += 1
+            future.set_result(p_obj)
+        return p_obj
+
+    def stats(self):
+        with self.lock:
+            return {"scraped": self.scraped, "reused": self.reused,
+                    "requests_saved": self.reused * len(ENDPOINTS), "evicted": self.players.evictions}
@@ -1,64 +1,147 @@
+import logging
 import re
 import time
-import random
+import zlib
 
-import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+
+from classes.http_client import OfflineCacheMiss, get_default_client
+from classes.lru_cache import LRUCache
+from classes.market_value_point import MarketValuePoint
+from classes.metrics import get_default_metrics
+from classes.normalization import german_date, german_number, typed_performance
+from classes.performance_row import PerformanceRow
+from helpers import ITEMS_TABLE_ONLY, PROFILE_REGIONS_ONLY, make_soup, parse_minutes
+
+logger = logging.getLogger(__name__)
+
+# Ein BeautifulSoup-Baum belegt grob das Zehnfache des rohen HTML im Speicher
+SOUP_SIZE_FACTOR = 10
+
+# Beschriftungen der info-table und die Felder, in die ihr Wert übernommen wird
+INFO_TABLE_LABELS = {
+    "Geb./Alter:": "birthday",
+    "Größe:": "height",
+    "Staatsbürgerschaft:": "nationalities",
+    "Fuß:": "preferred_foot",
+    "Social Media:": "social_media",
+    "Aktueller Verein:": "current_club",
+    "Im Team seit:": "in_team_since",
+    "Vertrag bis:": "contract_until",
+    "Letzte Verlängerung:": "last_extension",
+    "Spielerberater:": "player_agent",
+    "Geburtsort:": "birth_place",
+}
+NATIONALITY_SEPARATOR = re.compile(r'\s{2,}|&nbsp;')
+
+# Werte von parse_basic_data für Felder, die auf der Seite fehlen
+BASIC_DATA_DEFAULTS = {
+    "name": "Unknown", "birthday": "Unknown", "height": "Unknown", "nationalities": [], "main_position": "Unknown",
+    "side_positions": [], "preferred_foot": "Unknown", "player_agent": "Unknown", "birth_place": "Unknown",
+    "social_media": [], "current_club": "Unknown", "in_team_since": None, "contract_until": None,
+    "last_extension": "Unknown",
+}
+# Stammdaten, die auch die ausführliche Kaderansicht enthält (siehe TeamScraper, detailed=True)
+SQUAD_FIELDS = ("name", "birthday", "height", "nationalities", "main_position", "preferred_foot", "in_team_since",
+                "contract_until")
+
+
+# Spalten, die nur die Leistungsdaten-Tabelle eines Torwarts hat
+GOALKEEPER_COLUMNS = ("Gegentore", "Zu-Null-Spiele")
+
+
+def is_goalkeeper_table(performance_table):
+    """Erkennt das Torwart-Layout der Leistungsdaten an den Spaltentiteln im Tabellenkopf."""
+    header = performance_table.find('thead')
+    if header is None:
+        return False
+    for cell in header.find_all(['th', 'span']):
+        label = cell.get('title') or cell.get_text(strip=True)
+        if any(column in label for column in GOALKEEPER_COLUMNS):
+            return True
+    return False
+
+
+def index_info_table(soup):
+    """
+    Durchläuft die info-table einer Profilseite einmal und ordnet jedem bekannten Feld
+    das Wert-Element zu, das auf seine Beschriftung folgt.
+
+    Returns:
+    - dict: Feldname (z.B. 'birthday') -> <span class="info-table__content--bold">
+    """
+    info_table = soup.find('div', class_='info-table')
+    container = info_table if info_table is not None else soup
+    index = {}
+    field = None
+    for span in container.find_all('span', class_='info-table__content', recursive=info_table is None):
+        classes = span.get('class', [])
+        if 'info-table__content--regular' in classes:
+            field = INFO_TABLE_LABELS.get(span.get_text(strip=True))
+        elif field is not None and 'info-table__content--bold' in classes:
+            index.setdefault(field, span)
+            field = None
+    return index
 
 
 class PlayerScraper:
-    HEADERS = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36"
-    }
-
-    def __init__(self):
-        self.soup_cache = {}
-        self.last_request_time = 0
-        self.min_request_delay = 1.0  # Minimale Verzögerung in Sekunden
-        self.max_request_delay = 3.0  # Maximale Verzögerung in Sekunden
-
-    def _delay_between_requests(self):
-        """Fügt eine zufällige Verzögerung zwischen den Anfragen ein, um Rate-Limiting zu vermeiden."""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        
-        # Berechne eine zufällige Verzögerung zwischen min und max
-        random_delay = random.uniform(self.min_request_delay, self.max_request_delay)
-        
-        # Wenn seit der letzten Anfrage weniger Zeit als die zufällige Verzögerung vergangen ist
-        if elapsed < random_delay:
-            # Warte die restliche Zeit
-            time.sleep(random_delay - elapsed)
-        
-        # Aktualisiere die Zeit der letzten Anfrage
-        self.last_request_time = time.time()
+    def __init__(self, client=None, cache_size=32, cache_bytes=None, cache_raw_html=False, parser=None, typed=False,
+                 metrics=None):
+        """
+        Args:
+        - client (HttpClient): Gemeinsamer HTTP-Client, Standard ist der prozessweite Client.
+        - cache_size (int): Maximale Anzahl gecachter Profilseiten (None = unbegrenzt).
+        - cache_bytes (int): Optionales Byte-Budget für den Cache.
+        - cache_raw_html (bool): Speichert zlib-komprimiertes HTML statt geparster Bäume.
+        - parser (str): BeautifulSoup-Parser, Standard ist lxml, falls installiert.
+        - typed (bool): Liefert Leistungsdaten als Zahlen ("-" wird None) und Geburtstag sowie
+          Marktwert-Daten als ISO-Datum statt der Strings der Seite.
+        - metrics (CrawlMetrics): Erfasst Parse-Zeiten und Wiederholungen, Standard sind die
+          prozessweiten Metriken.
+        """
+        self.client = client or get_default_client()
+        self.metrics = metrics or get_default_metrics()
+        self.parser = parser
+        self.typed = typed
+        self.cache_raw_html = cache_raw_html
+        self.soup_cache = LRUCache(max_entries=cache_size, max_bytes=cache_bytes)
+
+    def _cache_page(self, player_url, html_text, soup):
+        if self.cache_raw_html:
+            compressed = zlib.compress(html_text.encode("utf-8"))
+            self.soup_cache.put(player_url, compressed, size=len(compressed))
+        else:
+            self.soup_cache.put(player_url, soup, size=len(html_text) * SOUP_SIZE_FACTOR)
+
+    def _cached_page(self, player_url):
+        cached = self.soup_cache.get(player_url)
+        if cached is None or not self.cache_raw_html:
+            return cached
+        return self.parse_profile(zlib.decompress(cached).decode("utf-8"))
 
     def fetch_player_page(self, player_url):
         """Fetch and cache the HTML page of the player."""
-        if player_url in self.soup_cache:
-            return self.soup_cache[player_url]
+        soup = self._cached_page(player_url)
+        if soup is not None:
+            return soup
 
-        # Füge eine Verzögerung ein, bevor die Anfrage gesendet wird
-        self._delay_between_requests()
-        
-        response = requests.get(player_url, headers=self.HEADERS)
+        response = self.client.get(player_url)
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
-            self.soup_cache[player_url] = soup
+            soup = self.parse_profile(response.text)
+            self._cache_page(player_url, response.text, soup)
             return soup
         elif response.status_code == 503:
             # Bei 503-Fehler: Warte und versuche es noch einmal
-            print(f"503 Service Unavailable for URL {player_url}. Waiting for 5 seconds before retry...")
+            logger.warning("503 Service Unavailable for URL %s. Waiting for 5 seconds before retry...", player_url)
+            self.metrics.record_retry("profile", 5)
             time.sleep(5)
             
-            # Noch ein Versuch mit längerer Verzögerung
-            self._delay_between_requests()
-            response = requests.get(player_url, headers=self.HEADERS)
+            # Noch ein Versuch
+            response = self.client.get(player_url)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, "html.parser")
-                self.soup_cache[player_url] = soup
+                soup = self.parse_profile(response.text)
+                self._cache_page(player_url, response.text, soup)
                 return soup
             else:
                 raise Exception(f"Error fetching the page after retry: {response.status_code}")
@@ -67,9 +150,14 @@ class PlayerScraper:
 
     def parse_html(self, html_text):
         """Parsen des HTML-Textes mit BeautifulSoup und Rückgabe des BeautifulSoup-Objekts."""
-        soup = BeautifulSoup(html_text, "html.parser")
+        soup = make_soup(html_text, parser=self.parser)
         return soup
 
+    def parse_profile(self, html_text):
+        """Parst nur Kopfbereich, info-table und Positionen einer Profilseite."""
+        with self.metrics.stage("parse", "profile"):
+            return make_soup(html_text, PROFILE_REGIONS_ONLY, self.parser)
+
     def get_player_id(self, player_url):
         player_id = player_url.split("/")[-1]
         return player_id
@@ -144,7 +232,7 @@ class PlayerScraper:
                     club_link = current_club_info.find('a', title=True)
                     current_club = club_link.get('title').strip() if club_link else "Unknown"
         except Exception as e:
-            print(f"Error scraping current club: {e}")
+            logger.warning("Error scraping current club: %s", e)
 
         # Im Team seit
         in_team_since = None
@@ -153,7 +241,7 @@ class PlayerScraper:
             if in_team_since_element:
                 in_team_since = in_team_since_element.find_next_sibling('span', class_='info-table__content--bold').text.strip()
         except Exception as e:
-            print(f"Error scraping 'Im Team seit': {e}")
+            logger.warning("Error scraping 'Im Team seit': %s", e)
 
         # Vertrag bis
         contract_until = None
@@ -162,7 +250,7 @@ class PlayerScraper:
             if contract_until_element:
                 contract_until = contract_until_element.find_next_sibling('span', class_='info-table__content--bold').text.strip()
         except Exception as e:
-            print(f"Error scraping 'Vertrag bis': {e}")
+            logger.warning("Error scraping 'Vertrag bis': %s", e)
 
         # Letzte Verlängerung
         last_extension = "Unknown"
@@ -171,7 +259,7 @@ class PlayerScraper:
             if last_extension_element:
                 last_extension = last_extension_element.find_next_sibling('span', class_='info-table__content--bold').text.strip()
         except Exception as e:
-            print(f"Error scraping 'Letzte Verlängerung': {e}")
+            logger.warning("Error scraping 'Letzte Verlängerung': %s", e)
 
         return current_club, in_team_since, contract_until, last_extension
 
@@ -312,8 +400,11 @@ class PlayerScraper:
         - player_id (int): The unique ID of the player on Transfermarkt.
 
         Returns:
-        - pd.DataFrame: A DataFrame containing the market value ('mw'), date ('datum_mw'),
-          club ('verein'), and age ('age') for each entry.
+        - list: One MarketValuePoint per entry with the market value ('mw'), date ('datum_mw'),
+          club ('verein'), and age ('age').
+
+        Raises:
+        - Exception: If the API still answers with 503 after all retries or with another error status.
         """
         # Define the API URL
         url = f"https://www.transfermarkt.de/ceapi/marketValueDevelopment/graph/{player_id}"
@@ -325,18 +416,17 @@ class PlayerScraper:
         
         while retry_count < max_retries:
             try:
-                # Füge eine Verzögerung ein, bevor die Anfrage gesendet wird
-                self._delay_between_requests()
-                
                 # Fetch the API response
-                response = requests.get(url, headers=self.HEADERS)
+                response = self.client.get(url)
                 
                 if response.status_code == 200:
                     break  # Erfolgreiche Antwort, beende Schleife
                 elif response.status_code == 503:
                     # Service Unavailable, versuche erneut
                     retry_count += 1
-                    print(f"503 Service Unavailable for market value history of player_id {player_id}. Retry {retry_count}/{max_retries} in {retry_delay} seconds...")
+                    logger.warning("503 Service Unavailable for market value history of player_id %s. Retry %d/%d in %d seconds...",
+                                   player_id, retry_count, max_retries, retry_delay)
+                    self.metrics.record_retry("market_value", retry_delay)
                     time.sleep(retry_delay)
                     # Erhöhe die Verzögerung für den nächsten Versuch
                     retry_delay *= 2
@@ -346,23 +436,30 @@ class PlayerScraper:
             except requests.exceptions.RequestException as e:
                 # Netzwerkfehler
                 retry_count += 1
-                print(f"Network error for market value history of player_id {player_id}: {e}. Retry {retry_count}/{max_retries} in {retry_delay} seconds...")
+                logger.warning("Network error for market value history of player_id %s: %s. Retry %d/%d in %d seconds...",
+                               player_id, e, retry_count, max_retries, retry_delay)
+                self.metrics.record_retry("market_value", retry_delay)
                 time.sleep(retry_delay)
                 retry_delay *= 2
         
-        # Wenn nach allen Versuchen immer noch kein Erfolg
+        # Wenn nach allen Versuchen immer noch kein Erfolg, als Fehler melden statt eine leere Historie
+        # zurückzugeben, damit ein Crawl-Journal den Abruf erneut versuchen kann
         if retry_count >= max_retries:
-            print(f"Failed to fetch market value history for player_id {player_id} after {max_retries} retries.")
-            return pd.DataFrame()  # Leeres DataFrame zurückgeben
+            raise Exception(f"Failed to fetch market value history for player_id {player_id} "
+                            f"after {max_retries} retries.")
 
-        # Parse the JSON response
-        data = response.json()
+        with self.metrics.stage("parse", "market_value"):
+            # Parse the JSON response
+            data = response.json()
 
-        # Extract relevant information into a DataFrame
-        df = pd.DataFrame(data['list'], columns=['y', 'datum_mw', 'verein', 'age'])
-        df.rename(columns={'y': 'mw'}, inplace=True)
+            # Extract relevant information into MarketValuePoints
+            history = [MarketValuePoint.from_api(point) for point in data['list']]
+            if self.typed:
+                for point in history:
+                    point.datum_mw = german_date(point.datum_mw)
+                    point.age = german_number(point.age, int)
 
-        return df
+        return history
     
     def _convert_minutes(self, minutes_str):
         """Konvertiert einen Minuten-String in einen Integer.
@@ -371,128 +468,154 @@ class PlayerScraper:
             minutes_str (str): String im Format "227'" oder "1.091'" oder "-"
             
         Returns:
-            int: Konvertierte Minuten oder 0 bei "-"
+            int: Konvertierte Minuten oder 0 bei "-"; im typed-Modus der unveränderte String,
+            den typed_performance umwandelt ("-" wird dort None statt 0)
         """
-        if minutes_str == "-":
-            return 0
-            
-        # Entferne das Minuten-Zeichen und Punkte
-        minutes_str = minutes_str.replace("'", "").replace(".", "")
-        
-        try:
-            return int(minutes_str)
-        except ValueError:
-            return 0
+        if self.typed:
+            return minutes_str
+        return parse_minutes(minutes_str)
 
-    def scrape_performance_data(self, player_id, player_url):
-        """Scraped die Leistungsdaten eines Spielers."""
+    def performance_url(self, player_id, player_url, season=""):
+        """Baut die URL der Leistungsdaten; ohne Saison enthält sie die gesamte Karriere."""
         # Extrahiere den Spielernamen aus der URL
         player_name = player_url.split('/')[-4]
-        
+        return f"https://www.transfermarkt.de/{player_name}/leistungsdatendetails/spieler/{player_id}/saison/{season}/verein/0/liga/0/wettbewerb//pos/0/trainer_id/0/plus/1"
+
+    def scrape_performance_data(self, player_id, player_url, main_position=None, season=""):
+        """
+        Scraped die Leistungsdaten eines Spielers.
+
+        Die Methode speichert keinen Zustand auf der Instanz und kann aus mehreren Threads
+        gleichzeitig aufgerufen werden.
+
+        Args:
+        - player_id (str): Transfermarkt-ID des Spielers.
+        - player_url (str): Profil-URL des Spielers.
+        - main_position (str): Bereits bekannte Hauptposition. Ohne sie wird das Torwart-Layout
+          am Tabellenkopf erkannt, eine zusätzliche Profilabfrage ist nicht nötig.
+        - season (int): Nur diese Saison (z.B. 2024) statt der gesamten Karriere.
+        """
         # Baue die URL für die Leistungsdaten
-        performance_url = f"https://www.transfermarkt.de/{player_name}/leistungsdatendetails/spieler/{player_id}/saison//verein/0/liga/0/wettbewerb//pos/0/trainer_id/0/plus/1"
-        
-        # Hole zuerst die Stammdaten des Spielers
-        self.player_data = {}
-        main_position, side_positions = self.scrape_positions(player_url)
-        self.player_data['main_position'] = main_position
-        self.player_data['side_positions'] = side_positions
-        
+        performance_url = self.performance_url(player_id, player_url, season)
+
         max_retries = 3
         retry_delay = 5
         
         for attempt in range(max_retries):
             try:
-                response = requests.get(performance_url, headers=self.HEADERS)
+                response = self.client.get(performance_url)
                 if response.status_code == 503:
-                    print(f"503 Fehler bei {performance_url}. Warte {retry_delay} Sekunden...")
+                    logger.warning("503 Fehler bei %s. Warte %d Sekunden...", performance_url, retry_delay)
+                    self.metrics.record_retry("performance", retry_delay)
                     time.sleep(retry_delay)
                     retry_delay *= 2
                     continue
                     
                 response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Finde die Tabelle mit den Leistungsdaten
-                performance_table = soup.find('table', {'class': 'items'})
-                if not performance_table:
-                    return None
-                
-                performance_data = []
-                rows = performance_table.find_all('tr', {'class': ['odd', 'even']})
-                
-                # Hole die Position des Spielers aus den Stammdaten
-                is_goalkeeper = False
-                if hasattr(self, 'player_data'):
-                    # Prüfe zuerst die Hauptposition
-                    if 'main_position' in self.player_data:
-                        is_goalkeeper = 'Torwart' in self.player_data['main_position']
-                    # Falls nicht gefunden, prüfe auch die Nebenpositionen
-                    elif 'side_positions' in self.player_data:
-                        is_goalkeeper = any('Torwart' in pos for pos in self.player_data['side_positions'])
-                
+                with self.metrics.stage("parse", "performance"):
+                    return self.parse_performance_data(response.text, main_position)
 
-                if not is_goalkeeper:                
-                    for row in rows:
-                        cols = row.find_all('td')
-                        if len(cols) >= 15:  # Mindestens 15 Spalten für die vollständigen Informationen
-                            # Basis-Informationen
-                            performance_entry = {
-                                'season': cols[0].text.strip(),
-                                'competition': cols[2].find('a')['title'] if cols[2].find('a') else cols[2].text.strip(),
-                                'club': cols[3].find('a')['title'] if cols[3].find('a') else cols[3].text.strip(),
-                                'in_squad': cols[4].text.strip(),
-                                'appearances': cols[5].text.strip(),
-                                'points_per_game': cols[6].text.strip(),
-                                'goals': cols[7].text.strip(),
-                                'assists': cols[8].text.strip(),
-                                'own_goals': cols[9].text.strip(),
-                                'subbed_in': cols[10].text.strip(),
-                                'subbed_out': cols[11].text.strip(),
-                                'yellow_cards': cols[12].text.strip(),
-                                'yellow_red_cards': cols[13].text.strip(),
-                                'red_cards': cols[14].text.strip(),
-                                'penalty_goals': cols[15].text.strip(),
-                                'minutes_per_goal': self._convert_minutes(cols[16].text.strip() if len(cols) > 16 else '-'),
-                                'minutes_played': self._convert_minutes(cols[17].text.strip() if len(cols) > 17 else '-')
-                            }
-                            performance_data.append(performance_entry)
-
-                elif is_goalkeeper:
-                    for row in rows:
-                        cols = row.find_all('td')
-                        if len(cols) >= 15:  # Mindestens 15 Spalten für die vollständigen Informationen
-                            # Basis-Informationen
-                            performance_entry = {
-                                'season': cols[0].text.strip(),
-                                'competition': cols[2].find('a')['title'] if cols[2].find('a') else cols[2].text.strip(),
-                                'club': cols[3].find('a')['title'] if cols[3].find('a') else cols[3].text.strip(),
-                                'in_squad': cols[4].text.strip(),
-                                'appearances': cols[5].text.strip(),
-                                'points_per_game': cols[6].text.strip(),
-                                'goals': cols[7].text.strip(),
-                                'own_goals': cols[8].text.strip(),
-                                'subbed_in': cols[9].text.strip(),
-                                'subbed_out': cols[10].text.strip(),
-                                'yellow_cards': cols[11].text.strip(),
-                                'yellow_red_cards': cols[12].text.strip(),
-                                'red_cards': cols[13].text.strip(),
-                                'goals_against': cols[14].text.strip(),
-                                'clean_sheets': cols[15].text.strip() if len(cols) > 15 else '',
-                                'minutes_played': self._convert_minutes(cols[16].text.strip() if len(cols) > 16 else '-')
-                            }
-                            performance_data.append(performance_entry)
-                
-                return performance_data
-                
+            except OfflineCacheMiss as e:
+                logger.warning("Leistungsdaten für Spieler %s nicht abrufbar: %s", player_id, e)
+                return None
             except requests.exceptions.RequestException as e:
-                print(f"Fehler beim Abrufen der Leistungsdaten für Spieler {player_id}: {str(e)}")
+                logger.warning("Fehler beim Abrufen der Leistungsdaten für Spieler %s: %s", player_id, e)
                 if attempt < max_retries - 1:
+                    self.metrics.record_retry("performance", retry_delay)
                     time.sleep(retry_delay)
                     retry_delay *= 2
                 else:
                     return None
 
+    def scrape_season_performance(self, player_id, player_url, seasons, main_position=None):
+        """
+        Scraped die Leistungsdaten einzelner Saisons, z.B. für eine inkrementelle Aktualisierung.
+
+        Eine Anfrage pro Saison; die kleine Tabelle einer Saison ist schneller geladen und
+        geparst als die gesamte Karriere. Gibt die Zeilen aller Saisons (neueste zuerst) zurück,
+        oder None, wenn eine davon nicht geholt werden konnte.
+        """
+        performance_data = []
+        for season in sorted(seasons, reverse=True):
+            rows = self.scrape_performance_data(player_id, player_url, main_position, season=season)
+            if rows is None:
+                return None
+            performance_data.extend(rows)
+        return performance_data
+
+    def parse_performance_data(self, html_text, main_position=None):
+        """Liest die Leistungsdaten-Tabelle aus dem HTML einer leistungsdatendetails-Seite."""
+        soup = make_soup(html_text, ITEMS_TABLE_ONLY, self.parser)
+
+        # Finde die Tabelle mit den Leistungsdaten
+        performance_table = soup.find('table', {'class': 'items'})
+        if not performance_table:
+            # Spieler ohne Einsätze: Transfermarkt zeigt keine Tabelle. Das ist ein gültiges, leeres
+            # Ergebnis; None bleibt Abruffehlern vorbehalten, die das Journal als fehlgeschlagen führt.
+            return []
+
+        performance_data = []
+        rows = performance_table.find_all('tr', {'class': ['odd', 'even']})
+
+        # Torwart-Layout: aus der bekannten Hauptposition, sonst aus den Spalten des Tabellenkopfs
+        if main_position and main_position != "Unknown":
+            is_goalkeeper = 'Torwart' in main_position
+        else:
+            is_goalkeeper = is_goalkeeper_table(performance_table)
+
+        if not is_goalkeeper:
+            for row in rows:
+                cols = row.find_all('td')
+                if len(cols) >= 15:  # Mindestens 15 Spalten für die vollständigen Informationen
+                    performance_data.append(PerformanceRow(
+                        PerformanceRow.FIELD_PLAYER_COLUMNS,
+                        season=cols[0].text.strip(),
+                        competition=cols[2].find('a')['title'] if cols[2].find('a') else cols[2].text.strip(),
+                        club=cols[3].find('a')['title'] if cols[3].find('a') else cols[3].text.strip(),
+                        in_squad=cols[4].text.strip(),
+                        appearances=cols[5].text.strip(),
+                        points_per_game=cols[6].text.strip(),
+                        goals=cols[7].text.strip(),
+                        assists=cols[8].text.strip(),
+                        own_goals=cols[9].text.strip(),
+                        subbed_in=cols[10].text.strip(),
+                        subbed_out=cols[11].text.strip(),
+                        yellow_cards=cols[12].text.strip(),
+                        yellow_red_cards=cols[13].text.strip(),
+                        red_cards=cols[14].text.strip(),
+                        penalty_goals=cols[15].text.strip(),
+                        minutes_per_goal=self._convert_minutes(cols[16].text.strip() if len(cols) > 16 else '-'),
+                        minutes_played=self._convert_minutes(cols[17].text.strip() if len(cols) > 17 else '-'),
+                    ))
+
+        elif is_goalkeeper:
+            for row in rows:
+                cols = row.find_all('td')
+                if len(cols) >= 15:  # Mindestens 15 Spalten für die vollständigen Informationen
+                    performance_data.append(PerformanceRow(
+                        PerformanceRow.GOALKEEPER_COLUMNS,
+                        season=cols[0].text.strip(),
+                        competition=cols[2].find('a')['title'] if cols[2].find('a') else cols[2].text.strip(),
+                        club=cols[3].find('a')['title'] if cols[3].find('a') else cols[3].text.strip(),
+                        in_squad=cols[4].text.strip(),
+                        appearances=cols[5].text.strip(),
+                        points_per_game=cols[6].text.strip(),
+                        goals=cols[7].text.strip(),
+                        own_goals=cols[8].text.strip(),
+                        subbed_in=cols[9].text.strip(),
+                        subbed_out=cols[10].text.strip(),
+                        yellow_cards=cols[11].text.strip(),
+                        yellow_red_cards=cols[12].text.strip(),
+                        red_cards=cols[13].text.strip(),
+                        goals_against=cols[14].text.strip(),
+                        clean_sheets=cols[15].text.strip() if len(cols) > 15 else '',
+                        minutes_played=self._convert_minutes(cols[16].text.strip() if len(cols) > 16 else '-'),
+                    ))
+
+        if self.typed:
+            performance_data = typed_performance(performance_data)
+        return performance_data
+
     def scrape_all_basic_data(self, player_url):
         """
         Scraped alle Stammdaten eines Spielers in einem Durchgang.
@@ -508,174 +631,157 @@ class PlayerScraper:
                 if soup is None:
                     retry_count += 1
                     if retry_count > max_retries:
-                        print(f"Maximale Anzahl von Versuchen für {player_url} erreicht. Breche ab.")
+                        logger.error("Maximale Anzahl von Versuchen für %s erreicht. Breche ab.", player_url)
                         return None
-                    print(f"Stammdaten-Abruf fehlgeschlagen für {player_url}. Versuch {retry_count}/{max_retries}. Warte {retry_delay} Sekunden...")
+                    logger.warning("Stammdaten-Abruf fehlgeschlagen für %s. Versuch %d/%d. Warte %d Sekunden...", player_url,
+                                   retry_count, max_retries, retry_delay)
+                    self.metrics.record_retry("profile", retry_delay)
                     time.sleep(retry_delay)
                     retry_delay *= 2  # Verdopple die Wartezeit für den nächsten Versuch
                     continue
 
-                data = {}
-                
-                # Name
-                try:
-                    data['name'] = soup.select_one('h1[class="data-header__headline-wrapper"]').text.split('\n')[-1].strip()
-                except:
-                    data['name'] = "Unknown"
+                with self.metrics.stage("parse", "profile_fields"):
+                    return self.parse_basic_data(soup)
 
-                # Geburtstag und Größe
-                try:
-                    birthday_tag = soup.find('span', string="Geb./Alter:")
-                    if birthday_tag:
-                        birthday_element = birthday_tag.find_next('span', class_='info-table__content--bold')
-                        if birthday_element:
-                            birthday = birthday_element.text.strip()
-                            data['birthday'] = birthday.split()[0]
-                        else:
-                            data['birthday'] = "Unknown"
-                    else:
-                        data['birthday'] = "Unknown"
-                except:
-                    data['birthday'] = "Unknown"
-
-                # Größe
-                try:
-                    height_tag = soup.find('span', string="Größe:")
-                    if height_tag:
-                        height_element = height_tag.find_next('span', class_='info-table__content--bold')
-                        if height_element:
-                            height = height_element.text.strip().replace('m', '').replace(',', '.').strip()
-                            try:
-                                data['height'] = int(float(height) * 100)
-                            except ValueError:
-                                data['height'] = "Unknown"
-                        else:
-                            data['height'] = "Unknown"
-                    else:
-                        data['height'] = "Unknown"
-                except:
-                    data['height'] = "Unknown"
+            except OfflineCacheMiss as e:
+                logger.error("Stammdaten für %s nicht abrufbar: %s", player_url, e)
+                return None
+            except Exception as e:
+                retry_count += 1
+                if retry_count > max_retries:
+                    logger.error("Maximale Anzahl von Versuchen für %s erreicht. Fehler: %s", player_url, e)
+                    return None
 
-                # Nationalitäten
-                try:
-                    nationality_element = soup.find('span', string="Staatsbürgerschaft:").find_next('span', class_='info-table__content--bold')
-                    if nationality_element:
-                        nationality_text = nationality_element.text.strip()
-                        nationalities = re.split(r'\s{2,}|&nbsp;', nationality_text)
-                        data['nationalities'] = [nat.strip() for nat in nationalities if nat.strip()]
-                    else:
-                        data['nationalities'] = []
-                except:
-                    data['nationalities'] = []
-
-                # Positionen
-                try:
-                    detail_position = soup.find('div', class_='detail-position')
-                    if detail_position:
-                        main_position_element = detail_position.find('dt', string="Hauptposition:")
-                        data['main_position'] = main_position_element.find_next('dd').text.strip() if main_position_element else "Unknown"
-                        
-                        side_position_element = detail_position.find('dt', string="Nebenposition:")
-                        if side_position_element:
-                            side_positions_elements = side_position_element.find_next_siblings('dd')
-                            data['side_positions'] = [pos.text.strip() for pos in side_positions_elements]
-                        else:
-                            data['side_positions'] = []
-                    else:
-                        data['main_position'] = "Unknown"
-                        data['side_positions'] = []
-                except:
-                    data['main_position'] = "Unknown"
-                    data['side_positions'] = []
+                logger.warning("Fehler beim Abrufen der Stammdaten für %s: %s. Versuch %d/%d. Warte %d Sekunden...", player_url, e,
+                               retry_count, max_retries, retry_delay)
+                self.metrics.record_retry("profile", retry_delay)
+                time.sleep(retry_delay)
+                retry_delay *= 2  # Verdopple die Wartezeit für den nächsten Versuch
 
-                # Bevorzugter Fuß
-                try:
-                    foot_element = soup.find('span', string="Fuß:")
-                    if foot_element:
-                        foot_detail = foot_element.find_next('span', class_='info-table__content--bold')
-                        data['preferred_foot'] = foot_detail.text.strip() if foot_detail else "Unknown"
-                    else:
-                        data['preferred_foot'] = "Unknown"
-                except:
-                    data['preferred_foot'] = "Unknown"
-
-                # Social Media
-                try:
-                    social_media_section = soup.find('span', string="Social Media:")
-                    if social_media_section:
-                        data['social_media'] = [a['href'] for a in social_media_section.find_next('div').find_all('a')]
-                    else:
-                        data['social_media'] = []
-                except:
-                    data['social_media'] = []
-
-                # Vertragsinformationen
-                try:
-                    current_club_element = soup.find('span', text=re.compile(r"\s*Aktueller Verein:\s*"))
-                    if current_club_element:
-                        current_club_info = current_club_element.find_next('span', class_='info-table__content--flex')
-                        if current_club_info:
-                            club_link = current_club_info.find('a', title=True)
-                            data['current_club'] = club_link.get('title').strip() if club_link else "Unknown"
-                        else:
-                            data['current_club'] = "Unknown"
-                    else:
-                        data['current_club'] = "Unknown"
-                except:
-                    data['current_club'] = "Unknown"
-
-                # Im Team seit
-                try:
-                    in_team_since_element = soup.find('span', text=re.compile(r"\s*Im Team seit:\s*"))
-                    data['in_team_since'] = in_team_since_element.find_next_sibling('span', class_='info-table__content--bold').text.strip() if in_team_since_element else None
-                except:
-                    data['in_team_since'] = None
+    def scrape_lite_basic_data(self, player_url, squad_data):
+        """
+        Stammdaten aus der ausführlichen Kaderansicht statt von der Profilseite.
 
-                # Vertrag bis
-                try:
-                    contract_until_element = soup.find('span', text=re.compile(r"\s*Vertrag bis:\s*"))
-                    data['contract_until'] = contract_until_element.find_next_sibling('span', class_='info-table__content--bold').text.strip() if contract_until_element else None
-                except:
-                    data['contract_until'] = None
+        Die Profilseite wird nur geholt, wenn der Kader eine Spalte aus SQUAD_FIELDS nicht hat,
+        und ergänzt dann genau diese Felder. Was nur das Profil kennt (Berater, Social Media,
+        Geburtsort, Nebenpositionen, aktueller Verein, letzte Verlängerung), bleibt leer.
+        Returns None, wenn die nötige Profilseite nicht geholt werden konnte.
+        """
+        data = {field: list(value) if isinstance(value, list) else value
+                for field, value in BASIC_DATA_DEFAULTS.items()}
+        for field, value in squad_data.items():
+            if value is not None:
+                data[field] = value
+        if self.typed:
+            data['birthday'] = german_date(data['birthday'])
+
+        missing = [field for field in SQUAD_FIELDS if field not in squad_data]
+        if missing:
+            basic_data = self.scrape_all_basic_data(player_url)
+            if basic_data is None:
+                return None
+            for field in missing:
+                data[field] = basic_data[field]
+        return data
+
+    def parse_basic_data(self, soup):
+        """
+        Liest alle Stammdaten aus einer geparsten Profilseite.
 
-                # Letzte Verlängerung
-                try:
-                    last_extension_element = soup.find('span', text=re.compile(r"\s*Letzte Verlängerung:\s*"))
-                    data['last_extension'] = last_extension_element.find_next_sibling('span', class_='info-table__content--bold').text.strip() if last_extension_element else "Unknown"
-                except:
-                    data['last_extension'] = "Unknown"
+        Die info-table wird genau einmal durchlaufen (siehe index_info_table), alle Felder
+        werden anschließend aus dem Index befüllt.
+        """
+        info = index_info_table(soup)
+        data = {}
 
-                # Spielerberater
-                try:
-                    agency_label = soup.find('span', string="Spielerberater:")
-                    if agency_label:
-                        agency_info = agency_label.find_next('span', class_='info-table__content--bold')
-                        data['player_agent'] = agency_info.text.strip() if agency_info else "Unknown"
-                    else:
-                        data['player_agent'] = "Unknown"
-                except:
-                    data['player_agent'] = "Unknown"
-
-                # Geburtsort
+        # Name
+        try:
+            data['name'] = soup.select_one('h1[class="data-header__headline-wrapper"]').text.split('\n')[-1].strip()
+        except:
+            data['name'] = "Unknown"
+
+        # Geburtstag
+        try:
+            data['birthday'] = info['birthday'].text.strip().split()[0] if 'birthday' in info else "Unknown"
+        except:
+            data['birthday'] = "Unknown"
+        if self.typed:
+            data['birthday'] = german_date(data['birthday'])
+
+        # Größe
+        try:
+            if 'height' in info:
+                height = info['height'].text.strip().replace('m', '').replace(',', '.').strip()
                 try:
-                    birth_place_label = soup.find('span', string="Geburtsort:")
-                    if birth_place_label:
-                        birth_place_element = birth_place_label.find_next('span', class_='info-table__content--bold')
-                        data['birth_place'] = birth_place_element.text.strip() if birth_place_element else "Unknown"
-                    else:
-                        data['birth_place'] = "Unknown"
-                except:
-                    data['birth_place'] = "Unknown"
+                    data['height'] = int(float(height) * 100)
+                except ValueError:
+                    data['height'] = "Unknown"
+            else:
+                data['height'] = "Unknown"
+        except:
+            data['height'] = "Unknown"
 
-                return data
+        # Nationalitäten
+        try:
+            if 'nationalities' in info:
+                nationalities = NATIONALITY_SEPARATOR.split(info['nationalities'].text.strip())
+                data['nationalities'] = [nat.strip() for nat in nationalities if nat.strip()]
+            else:
+                data['nationalities'] = []
+        except:
+            data['nationalities'] = []
 
-            except Exception as e:
-                retry_count += 1
-                if retry_count > max_retries:
-                    print(f"Maximale Anzahl von Versuchen für {player_url} erreicht. Fehler: {e}")
-                    return None
-                
-                print(f"Fehler beim Abrufen der Stammdaten für {player_url}: {e}. Versuch {retry_count}/{max_retries}. Warte {retry_delay} Sekunden...")
-                time.sleep(retry_delay)
-                retry_delay *= 2  # Verdopple die Wartezeit für den nächsten Versuch
+        # Positionen
+        try:
+            detail_position = soup.find('div', class_='detail-position')
+            if detail_position:
+                main_position_element = detail_position.find('dt', string="Hauptposition:")
+                data['main_position'] = main_position_element.find_next('dd').text.strip() if main_position_element else "Unknown"
+
+                side_position_element = detail_position.find('dt', string="Nebenposition:")
+                if side_position_element:
+                    side_positions_elements = side_position_element.find_next_siblings('dd')
+                    data['side_positions'] = [pos.text.strip() for pos in side_positions_elements]
+                else:
+                    data['side_positions'] = []
+            else:
+                data['main_position'] = "Unknown"
+                data['side_positions'] = []
+        except:
+            data['main_position'] = "Unknown"
+            data['side_positions'] = []
+
+        # Bevorzugter Fuß, Spielerberater und Geburtsort
+        for field in ('preferred_foot', 'player_agent', 'birth_place'):
+            try:
+                data[field] = info[field].text.strip() if field in info else "Unknown"
+            except:
+                data[field] = "Unknown"
+
+        # Social Media
+        try:
+            data['social_media'] = [a['href'] for a in info['social_media'].find_all('a')] if 'social_media' in info else []
+        except:
+            data['social_media'] = []
+
+        # Vertragsinformationen
+        try:
+            club_link = info['current_club'].find('a', title=True) if 'current_club' in info else None
+            data['current_club'] = club_link.get('title').strip() if club_link else "Unknown"
+        except:
+            data['current_club'] = "Unknown"
+
+        # Im Team seit und Vertrag bis
+        for field in ('in_team_since', 'contract_until'):
+            try:
+                data[field] = info[field].text.strip() if field in info else None
+            except:
+                data[field] = None
+
+        # Letzte Verlängerung
+        try:
+            data['last_extension'] = info['last_extension'].text.strip() if 'last_extension' in info else "Unknown"
+        except:
+            data['last_extension'] = "Unknown"
 
+        return data
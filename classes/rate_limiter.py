@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+# Status-Codes, mit denen Transfermarkt signalisiert, dass wir zu schnell sind
+THROTTLE_STATUS_CODES = (429, 503)
+
+logger = logging.getLogger(__name__)
+
+
+def endpoint_class(url):
+    """HTML-Seiten und die JSON-API (/ceapi/) haben getrennte Budgets."""
+    return "api" if "/ceapi/" in url else "html"
+
+
+class TokenBucket:
+    """Thread-sicherer Token-Bucket mit veränderbarer Rate (Tokens pro Sekunde)."""
+
+    def __init__(self, rate, capacity=1.0):
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self):
+        """Nimmt ein Token und blockiert, bis eines verfügbar ist. Gibt die Wartezeit zurück."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def set_rate(self, rate):
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def adjust(self, factor=1.0, step=0.0, min_rate=0.0):
+        """
+        Setzt die Rate atomar auf rate * factor + step, begrenzt auf [min_rate, max_rate].
+        Gibt (alte Rate, neue Rate) zurück.
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            old_rate = self.rate
+            self.rate = min(self.max_rate, max(min_rate, old_rate * factor + step))
+            return old_rate, self.rate
+
+
+class RateLimiter:
+    """
+    Prozessweiter Rate-Limiter mit einem Token-Bucket pro Host und Endpunkt-Klasse.
+
+    Bei 503/429-Antworten wird die Rate des betroffenen Buckets multiplikativ gesenkt,
+    jede erfolgreiche Antwort hebt sie wieder schrittweise bis zur konfigurierten Rate an.
+    Eine Rate von None oder 0 schaltet die Begrenzung für die Endpunkt-Klasse ab.
+    """
+
+    def __init__(self, html_rate=0.5, api_rate=1.0, burst=1.0, min_rate=0.02, backoff_factor=0.5,
+                 recovery_step=0.02):
+        self.rates = {"html": html_rate, "api": api_rate}
+        self.burst = burst
+        self.min_rate = min_rate
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def _bucket(self, url):
+        cls = endpoint_class(url)
+        rate = self.rates.get(cls)
+        if not rate:
+            return None
+        key = (urlparse(url).netloc, cls)
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = TokenBucket(rate, self.burst)
+            return bucket
+
+    def acquire(self, url):
+        """Wartet, bis eine Anfrage an die URL erlaubt ist. Gibt die Wartezeit in Sekunden zurück."""
+        bucket = self._bucket(url)
+        if bucket is None:
+            return 0.0
+        return bucket.acquire()
+
+    def report(self, url, status_code):
+        """Passt die Rate an die Antwort des Servers an (adaptives Backoff)."""
+        bucket = self._bucket(url)
+        if bucket is None:
+            return
+        if status_code in THROTTLE_STATUS_CODES:
+            old_rate, new_rate = bucket.adjust(factor=self.backoff_factor, min_rate=self.min_rate)
+            if new_rate < old_rate:
+                logger.warning("Rate-Limit für %s (%s) gesenkt auf %.3f Anfragen/s", urlparse(url).netloc,
+                               endpoint_class(url), new_rate)
+        else:
+            # Lesen und Schreiben der Rate unter dem Lock des Buckets, sonst gehen parallele Anpassungen verloren
+            bucket.adjust(step=self.recovery_step)
+
+    def current_rates(self):
+        """Aktuelle Raten pro (Host, Endpunkt-Klasse)."""
+        with self.lock:
+            return {key: bucket.rate for key, bucket in self.buckets.items()}
+
+
+_default_rate_limiter = None
+_default_rate_limiter_lock = threading.Lock()
+
+
+def get_default_rate_limiter():
+    """Gibt den prozessweit geteilten RateLimiter zurück und legt ihn beim ersten Aufruf an."""
+    global _default_rate_limiter
+    with _default_rate_limiter_lock:
+        if _default_rate_limiter is None:
+            _default_rate_limiter = RateLimiter()
+        return _default_rate_limiter
@@ -0,0 +1,197 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date
+
+import requests
+
+from classes.http_client import OfflineCacheMiss, classify_endpoint
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Gültigkeitsdauer pro Endpunkt-Klasse in Sekunden
+DEFAULT_TTLS = {
+    "competition": 7 * DAY,
+    "squad": 12 * HOUR,
+    "profile": 1 * DAY,
+    "market_value": 1 * DAY,
+    "performance": 1 * DAY,
+    "team_performance": 1 * DAY,
+    "other": 1 * DAY,
+}
+# Leistungsdaten abgeschlossener Saisons ändern sich nicht mehr
+HISTORIC_PERFORMANCE_TTL = 365 * DAY
+
+SEASON_PATTERN = re.compile(r"/saison/(\d{4})/")
+
+
+def current_season():
+    """Transfermarkt-Saison zum heutigen Datum (die Saison 2024 beginnt im Juli 2024)."""
+    today = date.today()
+    return today.year if today.month >= 7 else today.year - 1
+
+
+class CachedResponse:
+    """Antwort aus dem Cache mit der Schnittstelle von requests.Response, die die Scraper nutzen."""
+
+    def __init__(self, url, status_code, content, encoding, headers, from_cache=True):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding or "utf-8"
+        self.headers = headers
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class ResponseCache:
+    """
+    Persistenter HTTP-Antwort-Cache in SQLite, Schlüssel ist die URL.
+
+    Frische Einträge werden ohne Netzwerk beantwortet. Abgelaufene Einträge werden mit
+    If-None-Match/If-Modified-Since revalidiert, sofern der Server ETag oder Last-Modified
+    geliefert hat. Im Offline-Modus wird nur aus dem Cache geantwortet; fehlende URLs
+    lösen OfflineCacheMiss aus, damit die Scraper sie nicht mit Wartezeit wiederholen.
+    """
+
+    def __init__(self, path, ttls=None, offline=False):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stores = 0
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status_code INTEGER NOT NULL,
+                body BLOB NOT NULL,
+                encoding TEXT,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.connection.commit()
+
+    def ttl_for(self, url):
+        endpoint = classify_endpoint(url)
+        if endpoint == "performance":
+            match = SEASON_PATTERN.search(url)
+            if match and int(match.group(1)) < current_season():
+                return HISTORIC_PERFORMANCE_TTL
+        return self.ttls.get(endpoint, self.ttls["other"])
+
+    def lookup(self, url):
+        """Gibt (CachedResponse, frisch, Validatoren) zurück oder None, wenn die URL nicht im Cache ist."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT status_code, body, encoding, content_type, etag, last_modified, fetched_at "
+                "FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        status_code, body, encoding, content_type, etag, last_modified, fetched_at = row
+        headers = {"Content-Type": content_type} if content_type else {}
+        response = CachedResponse(url, status_code, zlib.decompress(body), encoding, headers)
+        fresh = time.time() - fetched_at < self.ttl_for(url)
+        validators = {}
+        if etag:
+            validators["If-None-Match"] = etag
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+        return response, fresh, validators
+
+    def store(self, url, response):
+        """Speichert eine erfolgreiche Antwort."""
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, response.status_code, zlib.compress(response.content), response.encoding,
+                 response.headers.get("Content-Type"), response.headers.get("ETag"),
+                 response.headers.get("Last-Modified"), time.time())
+            )
+            self.connection.commit()
+            self.stores += 1
+
+    def touch(self, url):
+        """Markiert einen Eintrag nach erfolgreicher Revalidierung (304) wieder als frisch."""
+        with self.lock:
+            self.connection.execute("UPDATE responses SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self.connection.commit()
+            self.revalidated += 1
+
+    def get(self, url, fetch):
+        """
+        Beantwortet eine Anfrage aus dem Cache oder über `fetch(url, headers)`.
+
+        Args:
+        - url (str): Angefragte URL.
+        - fetch (callable): Führt die echte Anfrage mit zusätzlichen Headern aus.
+
+        Returns:
+        - requests.Response oder CachedResponse
+
+        Raises:
+        - OfflineCacheMiss: Im Offline-Modus, wenn die URL nicht im Cache steht.
+        """
+        cached = self.lookup(url)
+        if cached is not None:
+            response, fresh, validators = cached
+            if fresh or self.offline:
+                self._record("hits")
+                return response
+        elif self.offline:
+            self._record("misses")
+            raise OfflineCacheMiss(f"Nicht im Cache (offline): {url}")
+        else:
+            validators = {}
+
+        self._record("misses")
+        fetched = fetch(url, validators)
+        if fetched.status_code == 304 and cached is not None:
+            self.touch(url)
+            return cached[0]
+        if fetched.status_code == 200:
+            self.store(url, fetched)
+        return fetched
+
+    def _record(self, counter):
+        """Zählt einen Treffer oder Fehlgriff; der Cache wird von mehreren Threads gleichzeitig genutzt."""
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "stores": self.stores,
+            }
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,103 @@
+import logging
+import os
+
+from classes.normalization import PERFORMANCE_FLOAT_COLUMNS, PERFORMANCE_INT_COLUMNS, german_dates, german_numbers
+
+logger = logging.getLogger(__name__)
+
+# pandas und pyarrow werden erst beim Export geladen, der Crawl selbst braucht sie nicht
+
+PARTITION_COLUMNS = ["competition_id", "competition_season"]
+KEY_COLUMNS = PARTITION_COLUMNS + ["team_id", "player_id"]
+
+PLAYER_COLUMNS = [
+    "competition_name", "competition_id", "competition_season", "team_id", "team_name", "player_id",
+    "player_name", "player_url", "birthday", "height", "nationalities", "main_position", "side_positions",
+    "preferred_foot", "social_media", "market_value", "current_club", "in_team_since", "contract_until",
+    "last_extension", "player_agent", "birth_place",
+]
+PLAYER_DATE_COLUMNS = ["birthday", "in_team_since", "contract_until", "last_extension"]
+PLAYER_INT_COLUMNS = ["height", "market_value"]
+
+MARKET_VALUE_COLUMNS = KEY_COLUMNS + ["date", "mw", "verein", "age"]
+
+PERFORMANCE_TEXT_COLUMNS = ["season", "competition", "club"]
+PERFORMANCE_COLUMNS = KEY_COLUMNS + PERFORMANCE_TEXT_COLUMNS + PERFORMANCE_FLOAT_COLUMNS + PERFORMANCE_INT_COLUMNS
+
+FORMATS = {"parquet": "parquet", "arrow": "ipc"}
+
+
+def build_tables(rows):
+    """
+    Zerlegt Spielerzeilen in normalisierte Tabellen mit Zahlen- und Datumsspalten.
+
+    Die Typisierung läuft spaltenweise über alle Zeilen auf einmal; Zeilen, die schon mit
+    --typed gescraped wurden, ergeben dieselben Tabellen.
+
+    Returns:
+    - dict: "players", "market_value_history" und "performance" als DataFrames; Marktwert-Historie
+      und Leistungsdaten haben eine Zeile pro Eintrag und den Schlüssel des Spielers.
+    """
+    import pandas as pd
+
+    players, market_values, performances = [], [], []
+    for row in rows:
+        key = {column: row.get(column) for column in KEY_COLUMNS}
+        players.append({column: row.get(column) for column in PLAYER_COLUMNS})
+        for point in row.get("market_value_history") or []:
+            market_values.append({**key, "date": point.get("datum_mw"), "mw": point.get("mw"),
+                                  "verein": point.get("verein"), "age": point.get("age")})
+        for entry in row.get("performance_data") or []:
+            performances.append({**key, **{column: entry.get(column) for column in PERFORMANCE_COLUMNS
+                                           if column not in key}})
+
+    players = pd.DataFrame(players, columns=PLAYER_COLUMNS)
+    for column in PLAYER_DATE_COLUMNS:
+        players[column] = german_dates(players[column])
+    for column in PLAYER_INT_COLUMNS:
+        players[column] = german_numbers(players[column], "Int64")
+
+    market_values = pd.DataFrame(market_values, columns=MARKET_VALUE_COLUMNS)
+    market_values["date"] = german_dates(market_values["date"])
+    market_values["mw"] = german_numbers(market_values["mw"], "Int64")
+    market_values["age"] = german_numbers(market_values["age"], "Int64")
+
+    performances = pd.DataFrame(performances, columns=PERFORMANCE_COLUMNS)
+    for column in PERFORMANCE_INT_COLUMNS:
+        performances[column] = german_numbers(performances[column], "Int64")
+    for column in PERFORMANCE_FLOAT_COLUMNS:
+        performances[column] = german_numbers(performances[column], "Float64")
+
+    tables = {"players": players, "market_value_history": market_values, "performance": performances}
+    for table in tables.values():
+        for column in ("competition_id", "team_id", "player_id"):
+            table[column] = table[column].astype("string")
+        table["competition_season"] = table["competition_season"].astype("Int64")
+    return tables
+
+
+def write_tables(tables, target_dir, file_format="parquet"):
+    """
+    Schreibt die Tabellen als Parquet- oder Arrow-Datasets, partitioniert nach Competition und Saison
+    (Hive-Layout, z.B. performance/competition_id=L1/competition_season=2024/part-0.parquet).
+    Vorhandene Partitionen derselben Competition und Saison werden ersetzt.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError:
+        raise ImportError("Für den Tabellen-Export muss das Paket 'pyarrow' installiert sein")
+
+    for name, df in tables.items():
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        partitioning = ds.partitioning(pa.schema([table.schema.field(column) for column in PARTITION_COLUMNS]),
+                                       flavor="hive")
+        ds.write_dataset(table, os.path.join(target_dir, name), format=FORMATS[file_format],
+                         partitioning=partitioning, existing_data_behavior="delete_matching")
+        logger.info("%d Zeilen nach %s exportiert", len(df), os.path.join(target_dir, name))
+
+
+def export_rows(rows, target_dir, file_format="parquet"):
+    tables = build_tables(rows)
+    write_tables(tables, target_dir, file_format)
+    return tables
@@ -1,4 +1,6 @@
 class Team:
+    __slots__ = ("name", "url", "team_id", "players")
+
     def __init__(self, name, url, team_id):
         self.name = name
         self.url = url
@@ -0,0 +1,139 @@
+import logging
+import re
+import time
+
+import requests
+
+from classes.http_client import OfflineCacheMiss, get_default_client
+from classes.metrics import get_default_metrics
+from classes.normalization import typed_performance
+from classes.performance_row import PerformanceRow, season_label
+from helpers import CLUB_PERFORMANCE_REGIONS_ONLY, make_soup, parse_minutes
+
+logger = logging.getLogger(__name__)
+
+PLAYER_ID = re.compile(r"/spieler/(\d+)")
+
+# Spaltentitel der Leistungsdaten-Seite eines Vereins und die Felder der PerformanceRow
+TEAM_PERFORMANCE_COLUMNS = {
+    "Im Kader": "in_squad",
+    "Einsätze": "appearances",
+    "Punkte pro Spiel": "points_per_game",
+    "Tore": "goals",
+    "Vorlagen": "assists",
+    "Eigentore": "own_goals",
+    "Einwechslungen": "subbed_in",
+    "Auswechslungen": "subbed_out",
+    "Gelbe Karten": "yellow_cards",
+    "Gelb-Rote Karten": "yellow_red_cards",
+    "Rote Karten": "red_cards",
+    "Elfmetertore": "penalty_goals",
+    "Minuten pro Tor": "minutes_per_goal",
+    "Gegentore": "goals_against",
+    "Zu-Null-Spiele": "clean_sheets",
+    "Einsatzminuten": "minutes_played",
+    "Gespielte Minuten": "minutes_played",
+}
+MINUTE_FIELDS = ("minutes_per_goal", "minutes_played")
+
+
+class TeamPerformanceScraper:
+    """
+    Holt die Leistungsdaten eines ganzen Kaders für eine Saison mit einer Anfrage.
+
+    Die Leistungsdaten-Seite des Vereins (leistungsdaten/verein/...) listet Einsätze, Tore,
+    Karten und Minuten aller Spieler im Wettbewerb der Competition. Jede Zeile wird zu einer
+    PerformanceRow im Format der Karriere-Tabelle eines Spielers, Spalten ohne Gegenstück auf
+    der Vereinsseite bleiben "-". Der Vereinsname kommt aus dem Seitenkopf, wie in den
+    Link-Titeln der Karriere-Tabelle. Die Seite deckt nur die Liga ab, nicht Pokal- und
+    Europapokal-Spiele.
+    """
+
+    def __init__(self, team, competition, client=None, parser=None, metrics=None, typed=False):
+        self.team = team
+        self.competition = competition
+        self.client = client or get_default_client()
+        self.parser = parser
+        self.metrics = metrics or get_default_metrics()
+        self.typed = typed
+
+    def performance_url(self):
+        club_name = self.team.url.split("/")[3]
+        return (f"https://www.transfermarkt.de/{club_name}/leistungsdaten/verein/{self.team.team_id}"
+                f"/reldata/{self.competition.competition_id}%26{self.competition.season}/plus/1")
+
+    def fetch_performance(self):
+        """Gibt player_id -> [PerformanceRow] zurück, oder None, wenn die Seite nicht geholt werden konnte."""
+        url = self.performance_url()
+        max_retries = 3
+        retry_delay = 5
+
+        for attempt in range(max_retries):
+            try:
+                response = self.client.get(url)
+                if response.status_code == 503:
+                    logger.warning("503 Fehler bei %s. Warte %d Sekunden...", url, retry_delay)
+                    self.metrics.record_retry("team_performance", retry_delay)
+                    time.sleep(retry_delay)
+                    retry_delay *= 2
+                    continue
+
+                response.raise_for_status()
+                with self.metrics.stage("parse", "team_performance"):
+                    return self.parse_performance(response.text)
+
+            except OfflineCacheMiss as e:
+                logger.warning("Leistungsdaten für Team %s nicht abrufbar: %s", self.team.name, e)
+                return None
+            except requests.exceptions.RequestException as e:
+                logger.warning("Fehler beim Abrufen der Leistungsdaten für Team %s: %s", self.team.name, e)
+                if attempt < max_retries - 1:
+                    self.metrics.record_retry("team_performance", retry_delay)
+                    time.sleep(retry_delay)
+                    retry_delay *= 2
+        return None
+
+    def parse_performance(self, html_text):
+        """Liest die Zeilen der Vereins-Leistungsdaten, Schlüssel ist die player_id."""
+        soup = make_soup(html_text, CLUB_PERFORMANCE_REGIONS_ONLY, self.parser)
+        table = soup.find("table", class_="items")
+        if table is None:
+            return None
+        headline = soup.find("h1", class_="data-header__headline-wrapper")
+        club = headline.get_text(" ", strip=True) if headline is not None else ""
+
+        columns = {}
+        header = table.find("thead")
+        position = 0
+        for cell in header.find_all("th") if header is not None else []:
+            title = cell.find(title=True)
+            label = title["title"] if title is not None else cell.get_text(strip=True)
+            field = TEAM_PERFORMANCE_COLUMNS.get(label)
+            if field is not None:
+                columns[field] = position
+            position += int(cell.get("colspan", 1))
+
+        performance = {}
+        for row in table.find_all("tr", class_=["odd", "even"]):
+            link = row.find("td", class_="hauptlink")
+            match = PLAYER_ID.search(link.find("a")["href"]) if link and link.find("a") else None
+            if match is None:
+                continue
+            cells = row.find_all("td", recursive=False)
+            inline_rows = row.find("table", class_="inline-table")
+            inline_rows = inline_rows.find_all("tr") if inline_rows else []
+            goalkeeper = len(inline_rows) > 1 and "Torwart" in inline_rows[1].get_text()
+
+            values = {"season": season_label(self.competition.season), "competition": self.competition.name,
+                      "club": club or self.team.name}
+            layout = PerformanceRow.GOALKEEPER_COLUMNS if goalkeeper else PerformanceRow.FIELD_PLAYER_COLUMNS
+            for field in layout[3:]:
+                position = columns.get(field)
+                text = cells[position].get_text(strip=True) if position is not None and position < len(cells) else "-"
+                # Im typed-Modus wandelt typed_performance die Minuten um, "-" wird dort None statt 0
+                values[field] = parse_minutes(text) if field in MINUTE_FIELDS and not self.typed else text
+            performance[match.group(1)] = [PerformanceRow(layout, **values)]
+
+        if self.typed:
+            performance = {player_id: typed_performance(rows) for player_id, rows in performance.items()}
+        return performance
@@ -1,39 +1,89 @@
+import logging
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import json
 import time
-import random
+
+from classes.http_client import get_default_client
+from classes.metrics import get_default_metrics
+from helpers import ITEMS_TABLE_ONLY, make_soup, parse_market_value
+
+logger = logging.getLogger(__name__)
+
+# Spaltentitel der ausführlichen Kaderansicht und die Stammdaten-Felder, die daraus gelesen werden
+SQUAD_COLUMNS = {
+    "Geb./Alter": "birthday",
+    "Nat.": "nationalities",
+    "Größe": "height",
+    "Fuß": "preferred_foot",
+    "Im Team seit": "in_team_since",
+    "Vertrag": "contract_until",
+}
+
+
+def squad_column_index(players_table):
+    """Ordnet jedem Feld aus SQUAD_COLUMNS die Spaltennummer im Tabellenkopf zu."""
+    index = {}
+    header = players_table.find("thead")
+    if header is None:
+        return index
+    position = 0
+    for cell in header.find_all("th"):
+        field = SQUAD_COLUMNS.get(cell.get_text(strip=True))
+        if field is not None:
+            index[field] = position
+        position += int(cell.get("colspan", 1))
+    return index
+
+
+def squad_cell_text(cell):
+    """Text einer Zelle; leere Zellen und "-" werden zu None."""
+    text = cell.get_text(" ", strip=True)
+    return None if text in ("", "-") else text
+
+
+def parse_squad_fields(row, columns, player_name):
+    """
+    Liest die Stammdaten eines Spielers aus einer Zeile der ausführlichen Kaderansicht.
+
+    Enthält nur die Felder, deren Spalte die Tabelle hat; None steht für eine leere Zelle.
+    """
+    cells = row.find_all("td", recursive=False)
+    data = {"name": player_name}
+    inline_rows = row.find("table", class_="inline-table")
+    inline_rows = inline_rows.find_all("tr") if inline_rows else []
+    if len(inline_rows) > 1:
+        data["main_position"] = squad_cell_text(inline_rows[1])
+    for field, position in columns.items():
+        if position >= len(cells):
+            continue
+        cell = cells[position]
+        if field == "nationalities":
+            data[field] = [img["title"] for img in cell.find_all("img", title=True)] or None
+            continue
+        text = squad_cell_text(cell)
+        if text is not None and field == "birthday":
+            text = text.split()[0]  # Datum ohne Alter
+        elif text is not None and field == "height":
+            try:
+                text = int(float(text.replace("m", "").replace(",", ".").strip()) * 100)
+            except ValueError:
+                text = None
+        data[field] = text
+    return data
 
 # Anpassung am TeamScraper, damit wir die team_id mitgeben:
 class TeamScraper:
-    HEADERS = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/129.0.0.0 Safari/537.36"
-    }
-
-    def __init__(self, team):
+    def __init__(self, team, client=None, parser=None, metrics=None, detailed=False):
         self.team = team
-        self.last_request_time = 0
-        self.min_request_delay = 3.0  # Minimale Verzögerung in Sekunden
-        self.max_request_delay = 7.0  # Maximale Verzögerung in Sekunden
-
-    def _delay_between_requests(self):
-        """Fügt eine zufällige Verzögerung zwischen den Anfragen ein."""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        
-        # Berechne eine zufällige Verzögerung zwischen min und max
-        random_delay = random.uniform(self.min_request_delay, self.max_request_delay)
-        
-        # Wenn seit der letzten Anfrage weniger Zeit als die zufällige Verzögerung vergangen ist
-        if elapsed < random_delay:
-            # Warte die restliche Zeit
-            time.sleep(random_delay - elapsed)
-        
-        # Aktualisiere die Zeit der letzten Anfrage
-        self.last_request_time = time.time()
+        self.client = client or get_default_client()
+        self.parser = parser
+        self.metrics = metrics or get_default_metrics()
+        self.detailed = detailed
+
+    def squad_url(self):
+        """Kaderseite des Teams; mit detailed die ausführliche Ansicht mit Stammdaten aller Spieler."""
+        if not self.detailed:
+            return self.team.url
+        return self.team.url.replace("/startseite/", "/kader/", 1).rstrip("/") + "/plus/1"
 
     def fetch_player_urls(self):
         max_retries = 5
@@ -42,32 +92,16 @@ class TeamScraper:
         
         while retry_count < max_retries:
             try:
-                # Verzögerung zwischen Anfragen
-                self._delay_between_requests()
-                
-                response = requests.get(self.team.url, headers=self.HEADERS)
+                response = self.client.get(self.squad_url())
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, "html.parser")
-                    players_table = soup.find("table", class_="items")
-            
-                    players = []
-                    if players_table:
-                        for row in players_table.find_all("tr", class_=["odd", "even"]):
-                            main_link_td = row.find("td", class_="hauptlink")
-                            if main_link_td and main_link_td.find('a'):
-                                player_name = main_link_td.find('a').get_text(strip=True)
-                                player_url = main_link_td.find('a')['href']
-                                player_url = "https://www.transfermarkt.de" + player_url
-                                # player_id aus URL extrahieren:
-                                # "https://www.transfermarkt.de/manuel-neuer/profil/spieler/27004"
-                                # player_id = letzter Teil der URL
-                                player_id = player_url.split("/")[-1]
-                                players.append({"player_name": player_name, "player_url": player_url, "player_id": player_id})
-                    return players
+                    with self.metrics.stage("parse", "squad"):
+                        return self.parse_player_urls(response.text)
                 
                 elif response.status_code == 503:
                     retry_count += 1
-                    print(f"503 Service Unavailable für Team {self.team.name}. Versuch {retry_count}/{max_retries}. Warte {retry_delay} Sekunden...")
+                    logger.warning("503 Service Unavailable für Team %s. Versuch %d/%d. Warte %d Sekunden...",
+                                   self.team.name, retry_count, max_retries, retry_delay)
+                    self.metrics.record_retry("squad", retry_delay)
                     time.sleep(retry_delay)
                     retry_delay *= 2  # Exponentielles Backoff
                     continue
@@ -77,10 +111,45 @@ class TeamScraper:
                     
             except requests.exceptions.RequestException as e:
                 retry_count += 1
-                print(f"Netzwerkfehler für Team {self.team.name}: {str(e)}. Versuch {retry_count}/{max_retries}. Warte {retry_delay} Sekunden...")
+                logger.warning("Netzwerkfehler für Team %s: %s. Versuch %d/%d. Warte %d Sekunden...", self.team.name, e,
+                               retry_count, max_retries, retry_delay)
+                self.metrics.record_retry("squad", retry_delay)
                 time.sleep(retry_delay)
                 retry_delay *= 2
                 continue
                 
         # Wenn nach allen Versuchen immer noch kein Erfolg
-        raise Exception(f"Konnte nach {max_retries} Versuchen keine Spieler für Team {self.team.name} abrufen")
\ No newline at end of file
+        raise Exception(f"Konnte nach {max_retries} Versuchen keine Spieler für Team {self.team.name} abrufen")
+
+    def parse_player_urls(self, html_text):
+        """
+        Liest Name, URL, ID und aktuellen Marktwert der Spieler aus der Kaderseite.
+
+        Mit detailed steht unter "squad_data" zusätzlich, was die ausführliche Ansicht an
+        Stammdaten enthält (siehe parse_squad_fields).
+        """
+        soup = make_soup(html_text, ITEMS_TABLE_ONLY, self.parser)
+        players_table = soup.find("table", class_="items")
+
+        players = []
+        if players_table:
+            columns = squad_column_index(players_table) if self.detailed else None
+            for row in players_table.find_all("tr", class_=["odd", "even"]):
+                main_link_td = row.find("td", class_="hauptlink")
+                if main_link_td and main_link_td.find('a'):
+                    player_name = main_link_td.find('a').get_text(strip=True)
+                    player_url = main_link_td.find('a')['href']
+                    player_url = "https://www.transfermarkt.de" + player_url
+                    # player_id aus URL extrahieren:
+                    # "https://www.transfermarkt.de/manuel-neuer/profil/spieler/27004"
+                    # player_id = letzter Teil der URL
+                    player_id = player_url.split("/")[-1]
+                    # Aktueller Marktwert steht in der letzten rechtsbündigen Spalte
+                    value_cells = row.find_all("td", class_="rechts")
+                    market_value = parse_market_value(value_cells[-1].get_text(strip=True)) if value_cells else None
+                    p_info = {"player_name": player_name, "player_url": player_url, "player_id": player_id,
+                              "market_value": market_value}
+                    if self.detailed:
+                        p_info["squad_data"] = parse_squad_fields(row, columns, player_name)
+                    players.append(p_info)
+        return players
@@ -0,0 +1,185 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+PENDING = "pending"
+CLAIMED = "claimed"
+DONE = "done"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    SQLite-Warteschlange für den verteilten Crawl, ein Shard entspricht einem Team.
+
+    Worker-Prozesse holen sich Shards mit claim(); das Beanspruchen läuft in einer
+    BEGIN IMMEDIATE-Transaktion, damit zwei Prozesse nie denselben Shard bekommen.
+    Shards eines abgestürzten Workers werden nach Ablauf der Lease wieder vergeben, solange sie
+    noch Versuche übrig haben, sonst gelten sie als fehlgeschlagen. Ein laufender Worker
+    verlängert seine Lease mit lease() regelmäßig, damit lange Teams nicht doppelt laufen.
+    Die Datei kann auf einem geteilten Laufwerk liegen, solange dieses SQLite-Sperren unterstützt.
+    """
+
+    def __init__(self, path, lease_seconds=30 * 60, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS shards (
+                shard_id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                claimed_at REAL,
+                finished_at REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT
+            )
+        """)
+
+    def add(self, shard_id, payload):
+        """Legt einen Shard an; bereits vorhandene Shards bleiben unverändert. Gibt True zurück, wenn er neu ist."""
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO shards (shard_id, payload) VALUES (?, ?)",
+            (shard_id, json.dumps(payload, ensure_ascii=False))
+        )
+        return cursor.rowcount == 1
+
+    def claim(self, worker_id):
+        """
+        Beansprucht den nächsten offenen Shard.
+
+        Returns:
+        - tuple: (shard_id, payload) oder None, wenn nichts mehr zu tun ist.
+        """
+        now = time.time()
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Abgelaufene Leases ohne verbleibende Versuche würden sonst für immer als beansprucht gelten
+            self.connection.execute(
+                "UPDATE shards SET status = ?, worker = NULL, finished_at = ?, error = ? "
+                "WHERE status = ? AND claimed_at < ? AND attempts >= ?",
+                (FAILED, now, "Lease abgelaufen", CLAIMED, now - self.lease_seconds, self.max_attempts)
+            )
+            row = self.connection.execute(
+                "SELECT shard_id, payload FROM shards "
+                "WHERE (status = ? OR (status = ? AND claimed_at < ?)) AND attempts < ? "
+                "ORDER BY rowid LIMIT 1",
+                (PENDING, CLAIMED, now - self.lease_seconds, self.max_attempts)
+            ).fetchone()
+            if row is not None:
+                self.connection.execute(
+                    "UPDATE shards SET status = ?, worker = ?, claimed_at = ?, attempts = attempts + 1 "
+                    "WHERE shard_id = ?",
+                    (CLAIMED, worker_id, now, row[0])
+                )
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def heartbeat(self, shard_id, worker_id):
+        """Verlängert die Lease; gibt False zurück, wenn der Shard dem Worker nicht mehr gehört."""
+        cursor = self.connection.execute(
+            "UPDATE shards SET claimed_at = ? WHERE shard_id = ? AND worker = ? AND status = ?",
+            (time.time(), shard_id, worker_id, CLAIMED)
+        )
+        return cursor.rowcount == 1
+
+    def lease(self, shard_id, worker_id):
+        """Kontextmanager, der die Lease während der Bearbeitung im Hintergrund verlängert."""
+        return LeaseHeartbeat(self.path, shard_id, worker_id, self.lease_seconds / 3)
+
+    def complete(self, shard_id, worker_id, result=None):
+        """Schließt einen Shard ab; gibt False zurück, wenn er inzwischen einem anderen Worker gehört."""
+        cursor = self.connection.execute(
+            "UPDATE shards SET status = ?, finished_at = ?, result = ?, error = NULL "
+            "WHERE shard_id = ? AND worker = ? AND status = ?",
+            (DONE, time.time(), result, shard_id, worker_id, CLAIMED)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, shard_id, worker_id, error):
+        """Gibt einen Shard zurück; er wird erneut vergeben, bis max_attempts erreicht ist."""
+        cursor = self.connection.execute(
+            "UPDATE shards SET status = CASE WHEN attempts < ? THEN ? ELSE ? END, worker = NULL, "
+            "finished_at = ?, error = ? WHERE shard_id = ? AND worker = ? AND status = ?",
+            (self.max_attempts, PENDING, FAILED, time.time(), str(error), shard_id, worker_id, CLAIMED)
+        )
+        return cursor.rowcount == 1
+
+    def retry_failed(self):
+        """Setzt endgültig fehlgeschlagene Shards für einen neuen Lauf zurück."""
+        cursor = self.connection.execute(
+            "UPDATE shards SET status = ?, attempts = 0, error = NULL WHERE status = ?", (PENDING, FAILED)
+        )
+        return cursor.rowcount
+
+    def results(self):
+        """Ergebnisse der erledigten Shards in der Reihenfolge, in der sie angelegt wurden."""
+        return [row[0] for row in self.connection.execute(
+            "SELECT result FROM shards WHERE status = ? AND result IS NOT NULL ORDER BY rowid", (DONE,)
+        )]
+
+    def counts(self):
+        counts = {PENDING: 0, CLAIMED: 0, DONE: 0, FAILED: 0}
+        for status, count in self.connection.execute("SELECT status, COUNT(*) FROM shards GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def close(self):
+        self.connection.close()
+
+
+class LeaseHeartbeat:
+    """
+    Verlängert die Lease eines Shards aus einem Hintergrund-Thread, solange der Block läuft.
+
+    Der Thread hat eine eigene SQLite-Verbindung, weil Verbindungen nicht zwischen Threads
+    geteilt werden dürfen.
+    """
+
+    def __init__(self, path, shard_id, worker_id, interval):
+        self.path = path
+        self.shard_id = shard_id
+        self.worker_id = worker_id
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self._run, name=f"lease-{self.shard_id}", daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+        return False
+
+    def _run(self):
+        queue = WorkQueue(self.path)
+        try:
+            while not self.stopped.wait(self.interval):
+                if not queue.heartbeat(self.shard_id, self.worker_id):
+                    logger.warning("Lease für Shard %s verloren, er wurde neu vergeben", self.shard_id)
+                    return
+        finally:
+            queue.close()
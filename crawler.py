@@ -0,0 +1,383 @@
+import contextvars
+import glob
+import json
+import logging
+import os
+
+from classes.competition import Competition
+from classes.crawl_journal import DONE, FAILED
+from classes.crawl_logging import log_context
+from classes.jsonl_writer import read_jsonl
+from classes.metrics import get_default_metrics
+from classes.performance_row import merge_performance, season_label
+from classes.player import Player
+from helpers import convert_to_serializable
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_DIR = "output"
+MERGED_FILENAME = "all_data.json"
+JSONL_FILENAME = "players.jsonl"
+JSONL_PATTERNS = ["*.jsonl", "*.jsonl.gz", "*.jsonl.zst"]
+DEFAULT_COMPETITIONS = ["Bundesliga", "2. Bundesliga", "3. Liga", "Regionalliga West"]
+
+
+def load_competitions(path="competitions_tm_germany.json", names=None, season=2024):
+    """Lädt die Competitions aus der JSON-Datei und filtert sie nach Namen."""
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+
+    competitions = []
+    for entry in entries:
+        if names and entry["name"] not in names:
+            continue
+        competition = Competition(
+            name=entry["name"],
+            base_url=entry["url"],
+            season=season
+        )
+        competitions.append(competition)
+    return competitions
+
+
+def team_filename(competition, team_name, team_id, output_dir=OUTPUT_DIR):
+    return f"{output_dir}/{competition.name}_{team_name}_{team_id}.json"
+
+
+def iter_output_files(output_dir=OUTPUT_DIR):
+    """
+    Lädt die Ausgabedateien eines Laufs, Datei für Datei: erst JSONL-Ströme, dann Team-Dateien.
+
+    Yields:
+    - tuple: (Pfad, Änderungszeit, Liste der Spielerzeilen)
+    """
+    paths = [path for pattern in JSONL_PATTERNS for path in sorted(glob.glob(os.path.join(output_dir, pattern)))]
+    paths += sorted(glob.glob(os.path.join(output_dir, "*.json")))
+    for path in paths:
+        if os.path.basename(path) == MERGED_FILENAME:
+            continue
+        try:
+            if path.endswith(".json"):
+                with open(path, encoding='utf-8') as f:
+                    rows = json.load(f)
+            else:
+                rows = read_jsonl(path)
+        except (OSError, ValueError, ImportError) as e:
+            logger.warning("%s konnte nicht gelesen werden: %s", path, e)
+            continue
+        yield path, os.path.getmtime(path), rows
+
+
+def load_previous_rows(output_dir=OUTPUT_DIR):
+    """
+    Lädt die Spielerzeilen eines früheren Laufs aus den Team-Dateien und JSONL-Ausgaben.
+
+    Returns:
+    - dict: player_id -> (Zeile, Änderungszeit der Datei). Steht ein Spieler in mehreren
+      Dateien, gewinnt die zuletzt geschriebene, bei gleicher Zeit die Team-Datei.
+    """
+    previous = {}
+    for _, mtime, rows in iter_output_files(output_dir):
+        for row in rows:
+            player_id = str(row.get("player_id"))
+            if player_id not in previous or previous[player_id][1] <= mtime:
+                previous[player_id] = (row, mtime)
+    return previous
+
+
+def team_key(competition, team_id):
+    """Eindeutiger Schlüssel eines Teams in Journal und Warteschlange."""
+    return f"{competition.competition_id}/{competition.season}/{team_id}"
+
+
+def team_is_finished(filename, journal=None, key=None, delta=None, refresh=False):
+    """
+    Prüft, ob ein Team übersprungen werden kann.
+
+    Mit Journal entscheidet dessen Status, damit Teams mit fehlgeschlagenen Spielern erneut
+    bearbeitet werden. Teams, die das Journal nicht kennt, gelten wie bisher als fertig,
+    wenn ihre Datei existiert, außer im Delta-Modus und mit `refresh` (Aktualisierung der
+    Leistungsdaten), die vorhandene Dateien aktualisieren.
+    """
+    if journal is not None:
+        status = journal.team_status(key)
+        if status is not None:
+            return status == DONE
+    return delta is None and not refresh and os.path.exists(filename)
+
+
+def fetch_squad(t_scraper, journal=None, key=None):
+    """Kaderliste eines Teams, mit Journal nur einmal pro Crawl abgerufen."""
+    if journal is not None:
+        squad = journal.squad(key)
+        if squad is not None:
+            return squad
+    squad = t_scraper.fetch_player_urls()
+    if journal is not None:
+        journal.record_squad(key, squad)
+    return squad
+
+
+def finish_team(filename, team_rows, journal=None, key=None, writer=None):
+    """
+    Speichert die Team-Datei und schließt das Team im Journal ab.
+
+    Mit `writer` (JsonlWriter) stehen die Zeilen bereits im Ausgabestrom; es wird keine
+    Team-Datei geschrieben, nur der Strom geleert.
+    """
+    if writer is None:
+        save_team_rows(filename, team_rows)
+    else:
+        writer.flush()
+    if journal is not None and journal.finish_team(key) != DONE:
+        logger.warning("Team %s unvollständig, wird beim nächsten Lauf erneut bearbeitet", key)
+
+
+def save_team_rows(filename, team_rows):
+    """Speichert die Daten eines Teams in einer JSON-Datei."""
+    with get_default_metrics().stage("serialize", "team_file"):
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(team_rows, f, ensure_ascii=False, indent=2, default=convert_to_serializable)
+    logger.info("Team-Daten gespeichert in %s", filename)
+
+
+def fetch_endpoint(journal, player_id, endpoint, fetch, *args):
+    """
+    Ruft einen Endpunkt eines Spielers ab.
+
+    Mit Journal wird ein bereits erfolgreich abgerufenes Ergebnis wiederverwendet und jeder
+    neue Abruf protokolliert; None gilt als fehlgeschlagen.
+    """
+    if journal is not None:
+        found, payload = journal.endpoint_payload(player_id, endpoint)
+        if found:
+            return payload
+    try:
+        payload = fetch(*args)
+    except Exception as e:
+        if journal is not None:
+            journal.record_endpoint(player_id, endpoint, FAILED, error=e)
+        raise
+    if journal is not None:
+        if payload is None:
+            journal.record_endpoint(player_id, endpoint, FAILED, error="keine Daten")
+        else:
+            journal.record_endpoint(player_id, endpoint, DONE, payload)
+    return payload
+
+
+def update_performance(player_scraper, p_info, main_position=None):
+    """
+    Leistungsdaten aus der gespeicherten Karriere und p_info["performance_update"]
+    (PerformanceRefresh): Die Zeilen der Vereinsseite werden ohne Anfrage eingearbeitet, sonst
+    werden nur die nicht abgeschlossenen Saisons geholt. Schlägt das fehl, bleibt es bei den
+    gespeicherten Leistungsdaten.
+    """
+    update = p_info["performance_update"]
+    if "rows" in update:
+        return merge_performance(update["history"], update["rows"])
+    rows = player_scraper.scrape_season_performance(p_info["player_id"], p_info["player_url"], update["seasons"],
+                                                    main_position=main_position)
+    if rows is None:
+        logger.warning("Saisons %s für Spieler %s nicht abrufbar, behalte die gespeicherten Leistungsdaten",
+                       update["seasons"], p_info["player_id"])
+        return update["history"]
+    labels = [season_label(season) for season in update["seasons"]]
+    return merge_performance(update["history"], rows, seasons=labels)
+
+
+def scrape_player(player_scraper, p_info, fetch_executor=None, journal=None):
+    """
+    Scraped Stammdaten, Marktwert-Historie und Leistungsdaten eines Spielers.
+
+    Args:
+    - player_scraper (PlayerScraper): Scraper, der für die Anfragen verwendet wird.
+    - p_info (dict): Eintrag aus TeamScraper.fetch_player_urls.
+    - fetch_executor (Executor): Optional. Marktwert-Historie und Leistungsdaten werden dann
+      parallel zum Profil abgerufen.
+    - journal (CrawlJournal): Optional. Protokolliert jeden Endpunkt und überspringt bereits
+      erfolgreich abgerufene.
+
+    Returns:
+    - Player: Der befüllte Spieler oder None, wenn keine Stammdaten geholt werden konnten.
+    """
+    p_obj = Player(player_id=p_info["player_id"], player_url=p_info["player_url"])
+    player_url_name = p_info["player_url"].split("/")[-4]
+
+    logger.debug("Starte Scraping für Spieler: %s", player_url_name)
+
+    def fetch_performance_data(main_position=None):
+        if p_info.get("performance_update") is None:
+            return player_scraper.scrape_performance_data(p_obj.player_id, p_obj.player_url,
+                                                          main_position=main_position)
+        return update_performance(player_scraper, p_info, main_position)
+
+    market_value_future = performance_future = None
+    if fetch_executor is not None:
+        # Beide Abrufe hängen nicht vom Profil ab, das Torwart-Layout erkennt der Scraper am Tabellenkopf.
+        # Die Abruf-Threads übernehmen den Log-Kontext des Spielers.
+        market_value_future = fetch_executor.submit(contextvars.copy_context().run, fetch_endpoint, journal,
+                                                    p_obj.player_id, "market_value",
+                                                    player_scraper.scrape_market_value_history, p_obj.player_id)
+        performance_future = fetch_executor.submit(contextvars.copy_context().run, fetch_endpoint, journal,
+                                                   p_obj.player_id, "performance", fetch_performance_data)
+
+    # Hole alle Stammdaten in einem Durchgang, im Lite-Modus aus der ausführlichen Kaderansicht
+    if "squad_data" in p_info:
+        basic_data = fetch_endpoint(journal, p_obj.player_id, "profile", player_scraper.scrape_lite_basic_data,
+                                    p_obj.player_url, p_info["squad_data"])
+    else:
+        basic_data = fetch_endpoint(journal, p_obj.player_id, "profile", player_scraper.scrape_all_basic_data,
+                                    p_obj.player_url)
+    if basic_data is None:
+        logger.error("Konnte keine Stammdaten für Spieler %s holen", p_obj.player_id)
+        for future in (market_value_future, performance_future):
+            if future is not None:
+                future.cancel()
+        return None
+
+    logger.debug("Stammdaten erfolgreich für %s", player_url_name)
+
+    # Setze die Stammdaten
+    p_obj.set_name(basic_data['name'])
+    p_obj.set_birthday_height(basic_data['birthday'], basic_data['height'])
+    p_obj.set_nationalities(basic_data['nationalities'])
+    p_obj.set_positions(basic_data['main_position'], basic_data['side_positions'])
+    p_obj.set_preferred_foot(basic_data['preferred_foot'])
+    p_obj.set_social_media(basic_data['social_media'])
+    p_obj.set_contract_info(
+        basic_data['current_club'],
+        basic_data['in_team_since'],
+        basic_data['contract_until'],
+        basic_data['last_extension']
+    )
+    p_obj.set_player_agent(basic_data['player_agent'])
+    p_obj.set_birth_place(basic_data['birth_place'])
+
+    # Hole die zusätzlichen Daten
+    logger.debug("Hole Marktwert-Historie für %s", player_url_name)
+    try:
+        if market_value_future is not None:
+            history = market_value_future.result()
+        else:
+            history = fetch_endpoint(journal, p_obj.player_id, "market_value",
+                                     player_scraper.scrape_market_value_history, p_obj.player_id)
+        p_obj.set_market_value_history(history)
+        p_obj.set_market_value(history[-1]["mw"] if history else None)
+    except Exception as e:
+        logger.error("Fehler bei Marktwert-Historie für %s: %s", player_url_name, e)
+        p_obj.set_market_value_history([])
+        p_obj.set_market_value(None)
+
+    logger.debug("Hole Leistungsdaten für %s", player_url_name)
+    try:
+        if performance_future is not None:
+            performance_data = performance_future.result()
+        else:
+            performance_data = fetch_endpoint(journal, p_obj.player_id, "performance", fetch_performance_data,
+                                              p_obj.main_position)
+        p_obj.set_performance_data(performance_data if performance_data else [])
+    except Exception as e:
+        logger.error("Fehler bei Leistungsdaten für %s: %s", player_url_name, e)
+        p_obj.set_performance_data([])
+
+    return p_obj
+
+
+def crawl_player_row(player_scraper, competition, team_obj, p_info, fetch_executor=None, journal=None,
+                     delta=None, writer=None, registry=None):
+    """
+    Scraped einen Spieler und gibt seine Zeile zurück, oder None bei Fehlern.
+
+    Mit Journal wird die Zeile eines bereits fertigen Spielers ohne Anfrage zurückgegeben. Ein
+    Spieler gilt erst als fertig, wenn alle seine Endpunkte erfolgreich abgerufen wurden.
+    Mit `delta` (DeltaRefresh) wird die Zeile des letzten Laufs übernommen, solange sich der
+    Spieler nicht geändert hat; trägt p_info ein "performance_update", werden ihre Leistungsdaten
+    trotzdem aktualisiert. Mit `writer` wird jede neue Zeile sofort in den JSONL-Strom
+    geschrieben; Zeilen aus dem Journal stehen dort bereits vom abgebrochenen Lauf.
+    Mit `registry` (PlayerRegistry) wird ein Spieler, der schon in einem anderen Kader dieses
+    Laufs vorkam, nicht erneut abgerufen.
+    Alle Log-Einträge tragen Competition-, Team- und Spieler-ID.
+    """
+    with log_context(competition_id=competition.competition_id, team_id=team_obj.team_id,
+                     player_id=p_info["player_id"]):
+        return _crawl_player_row(player_scraper, competition, team_obj, p_info, fetch_executor, journal, delta,
+                                 writer, registry)
+
+
+def _crawl_player_row(player_scraper, competition, team_obj, p_info, fetch_executor, journal, delta, writer,
+                      registry):
+    key = team_key(competition, team_obj.team_id)
+    if journal is not None:
+        row = journal.player_row(key, p_info["player_id"])
+        if row is not None:
+            return row
+    if delta is not None:
+        row = delta.reusable_row(competition, team_obj, p_info)
+        if row is not None:
+            if p_info.get("performance_update") is not None:
+                # Profil und Marktwert bleiben, die Leistungsdaten werden trotzdem aktualisiert
+                row = dict(row)
+                try:
+                    row["performance_data"] = fetch_endpoint(journal, p_info["player_id"], "performance",
+                                                             update_performance, player_scraper, p_info,
+                                                             row.get("main_position"))
+                except Exception as e:
+                    logger.error("Fehler bei Leistungsdaten für Spieler %s: %s", p_info["player_id"], e)
+            if journal is not None:
+                journal.record_player(key, p_info["player_id"], DONE, row)
+            if writer is not None:
+                writer.write(row)
+            return row
+    try:
+        if registry is not None:
+            p_obj = registry.player(p_info["player_id"], scrape_player, player_scraper, p_info, fetch_executor,
+                                    journal)
+        else:
+            p_obj = scrape_player(player_scraper, p_info, fetch_executor, journal)
+        if p_obj is None:
+            if journal is not None:
+                journal.record_player(key, p_info["player_id"], FAILED, error="keine Stammdaten")
+            return None
+        row = p_obj.to_row(competition, team_obj)
+        if delta is not None:
+            delta.mark_scraped(p_obj.player_id)
+        if journal is not None:
+            complete = journal.endpoints_complete(p_obj.player_id)
+            journal.record_player(key, p_obj.player_id, DONE if complete else FAILED, row,
+                                  None if complete else "Endpunkte fehlgeschlagen")
+        if writer is not None and (journal is None or complete):
+            writer.write(row)
+        logger.debug("Spieler %s erfolgreich verarbeitet", p_obj.player_url.split('/')[-4])
+        return row
+    except Exception as e:
+        logger.error("Fehler bei Verarbeitung von Spieler %s: %s", p_info['player_id'], e)
+        if journal is not None:
+            journal.record_player(key, p_info["player_id"], FAILED, error=e)
+        return None
+
+
+def crawl_team_rows(player_scraper, competition, team_obj, player_basic_info_list, player_executor=None,
+                    fetch_executor=None, journal=None, delta=None, writer=None, registry=None):
+    """
+    Scraped alle Spieler eines Kaders und gibt ihre Zeilen in Kader-Reihenfolge zurück.
+
+    Mit `player_executor` laufen mehrere Spieler gleichzeitig; die Ergebnisse werden in der
+    Reihenfolge des Kaders eingesammelt, damit die Team-Datei deterministisch bleibt.
+    """
+    if player_executor is None:
+        rows = [crawl_player_row(player_scraper, competition, team_obj, p_info, fetch_executor, journal, delta,
+                                 writer, registry)
+                for p_info in player_basic_info_list]
+    else:
+        futures = [player_executor.submit(crawl_player_row, player_scraper, competition, team_obj, p_info,
+                                          fetch_executor, journal, delta, writer, registry)
+                   for p_info in player_basic_info_list]
+        rows = [future.result() for future in futures]
+    return [row for row in rows if row is not None]
+
+
+def ensure_output_dir(output_dir=OUTPUT_DIR):
+    # Erstelle output Verzeichnis falls es nicht existiert
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
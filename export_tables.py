@@ -0,0 +1,46 @@
+"""
+Exportiert die Ausgabe eines Crawls als normalisierte Parquet- oder Arrow-Tabellen.
+
+Beispiele:
+    python export_tables.py                                  # output/ -> output/tables/
+    python export_tables.py --input-dir output --target-dir tables --format arrow
+"""
+import argparse
+import logging
+import os
+
+from classes.table_export import FORMATS, KEY_COLUMNS, export_rows
+from classes.crawl_logging import add_logging_arguments, configure_logging
+from crawler import OUTPUT_DIR, iter_output_files
+
+logger = logging.getLogger("export_tables")
+
+
+def load_rows(input_dir):
+    """Alle Spielerzeilen aus Team-Dateien und JSONL-Strömen; doppelte Spieler eines Teams nur einmal."""
+    rows = {}
+    for _, _, file_rows in iter_output_files(input_dir):
+        for row in file_rows:
+            rows[tuple(str(row.get(column)) for column in KEY_COLUMNS)] = row
+    return list(rows.values())
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Exportiert Spieler, Marktwert-Historie und Leistungsdaten als Tabellen")
+    parser.add_argument("--input-dir", default=OUTPUT_DIR, help="Ausgabeverzeichnis von app.py")
+    parser.add_argument("--target-dir", default=None, help="Zielverzeichnis (Standard: <input-dir>/tables)")
+    parser.add_argument("--format", choices=list(FORMATS), default="parquet")
+    add_logging_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    configure_logging(args.log_level, args.log_format, args.log_file, args.log_sample_rate)
+    rows = load_rows(args.input_dir)
+    logger.info("%d Spieler aus %s geladen", len(rows), args.input_dir)
+    export_rows(rows, args.target_dir or os.path.join(args.input_dir, "tables"), args.format)
+
+
+if __name__ == "__main__":
+    main()
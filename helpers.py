@@ -1,17 +1,86 @@
-import numpy as np
-import pandas as pd
+from bs4 import BeautifulSoup, SoupStrainer
+
+from classes.market_value_point import MarketValuePoint
+from classes.performance_row import PerformanceRow
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = "lxml"
+except ImportError:
+    DEFAULT_PARSER = "html.parser"
+
+PARSERS = ["lxml", "html.parser"]
+
+
+def _class_filter(*class_names):
+    """Filter für SoupStrainer: trifft Elemente, die eine der Klassen tragen.
+
+    Beim Parsen sieht der Strainer das class-Attribut noch als ungeteilten String.
+    """
+    wanted = set(class_names)
+
+    def matches(value):
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return not wanted.isdisjoint(classes)
+
+    return matches
+
+
+# Nur die Bereiche parsen, die die Scraper tatsächlich lesen
+ITEMS_TABLE_ONLY = SoupStrainer("table", class_=_class_filter("items"))
+PROFILE_REGIONS_ONLY = SoupStrainer(["h1", "div"], class_=_class_filter(
+    "data-header__headline-wrapper", "info-table", "detail-position"))
+CLUB_PERFORMANCE_REGIONS_ONLY = SoupStrainer(["h1", "table"], class_=_class_filter(
+    "data-header__headline-wrapper", "items"))
+
+
+def make_soup(html_text, parse_only=None, parser=None):
+    """Parst HTML mit dem schnellsten verfügbaren Parser, optional nur die Bereiche aus `parse_only`."""
+    return BeautifulSoup(html_text, parser or DEFAULT_PARSER, parse_only=parse_only)
+
 
 def convert_to_serializable(obj):
-    if isinstance(obj, np.integer):
-        return int(obj)  # numpy-Int zu Python-Int
-    elif isinstance(obj, np.floating):
-        return float(obj)  # numpy-Float zu Python-Float
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()  # numpy-Array zu Python-Liste
-    elif isinstance(obj, pd.Timestamp):
+    if isinstance(obj, (MarketValuePoint, PerformanceRow)):
+        return obj.to_dict()
+    # numpy- und pandas-Werte erkennen, ohne die Pakete beim Start zu importieren
+    module = type(obj).__module__.split(".")[0]
+    if module == "numpy" and hasattr(obj, "tolist"):
+        return obj.tolist()  # numpy-Int/-Float zu Python-Zahl, numpy-Array zu Python-Liste
+    elif module == "pandas" and hasattr(obj, "isoformat"):
         return obj.isoformat()  # Timestamp zu String
     raise TypeError(f"Type {type(obj)} not serializable")
 
+MARKET_VALUE_UNITS = {"Tsd.": 1_000, "Mio.": 1_000_000, "Mrd.": 1_000_000_000}
+
+def parse_market_value(text):
+    """
+    Wandelt einen angezeigten Marktwert in Euro um.
+
+    Beispiele: "1,50 Mio. €" -> 1500000, "100 Tsd. €" -> 100000, "-" -> None
+    """
+    if not text:
+        return None
+    parts = text.replace("€", "").split()
+    if not parts:
+        return None
+    try:
+        number = float(parts[0].replace(".", "").replace(",", "."))
+    except ValueError:
+        return None
+    unit = MARKET_VALUE_UNITS.get(parts[1], 1) if len(parts) > 1 else 1
+    return int(round(number * unit))
+
+def parse_minutes(text):
+    """Wandelt "227'" oder "1.091'" in Minuten um; "-" und Unlesbares ergeben 0."""
+    if text == "-":
+        return 0
+    try:
+        return int(text.replace("'", "").replace(".", ""))
+    except ValueError:
+        return 0
+
 def extract_team_id(team_url):
     # Beispielhafte URL: "https://www.transfermarkt.de/holstein-kiel/startseite/verein/269/saison_id/2024"
     # Wir splitten nach '/verein/' und dann nehmen wir den nächsten Abschnitt bis zum nächsten '/'
@@ -22,26 +91,3 @@ def extract_team_id(team_url):
         return team_id
     except:
         return None
-
-def player_to_dict(player):
-    return {
-        "player_id": player.player_id,
-        "player_name": player.name,
-        "player_url": player.player_url,
-        "birthday": player.birthday,
-        "height": player.height,
-        "nationalities": player.nationalities,
-        "main_position": player.main_position,
-        "side_positions": player.side_positions,
-        "preferred_foot": player.preferred_foot,
-        "social_media": player.social_media,
-        "market_value": player.market_value,
-        "market_value_history": player.market_value_history.to_dict(orient='records') if hasattr(player.market_value_history, 'to_dict') else player.market_value_history,
-        "current_club": player.current_club,
-        "in_team_since": player.in_team_since,
-        "contract_until": player.contract_until,
-        "last_extension": player.last_extension,
-        "player_agent": player.player_agent,
-        "birth_place": player.birth_place,
-        "performance_data": player.performance_data
-    }
\ No newline at end of file
@@ -0,0 +1,307 @@
+"""
+Verteilter Crawl über mehrere Prozesse oder Rechner.
+
+Der Koordinator (plan) holt die Teams der Competitions und legt pro Team einen Shard in
+einer SQLite-Warteschlange an. Worker-Prozesse (work) beanspruchen Shards, scrapen das
+Team wie app.py und schreiben die gewohnte Team-Datei. merge fasst alle Team-Dateien in
+Reihenfolge der Warteschlange zu all_data.json zusammen.
+
+Beispiele:
+    python sharded_crawl.py run --processes 4
+    python sharded_crawl.py plan --queue queue.sqlite --competition Bundesliga
+    python sharded_crawl.py work --queue /mnt/shared/queue.sqlite --processes 2   # auf jedem Rechner
+    python sharded_crawl.py merge --queue queue.sqlite
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import warnings
+
+from classes.competition import Competition
+from classes.competition_scraper import CompetitionScraper
+from classes.crawl_journal import CrawlJournal
+from classes.crawl_logging import add_logging_arguments, configure_logging, shutdown_logging
+from classes.http_client import HttpClient
+from classes.metrics import PROFILERS, STAGES, CrawlMetrics, StageProfiler, set_default_metrics
+from classes.performance_refresh import PERFORMANCE_MODES, PerformanceRefresh
+from classes.player_registry import DEFAULT_MAX_PLAYERS, PlayerRegistry
+from classes.player_scraper import PlayerScraper
+from classes.rate_limiter import RateLimiter
+from classes.response_cache import ResponseCache
+from classes.team import Team
+from classes.team_scraper import TeamScraper
+from classes.work_queue import WorkQueue, default_worker_id
+from crawler import (DEFAULT_COMPETITIONS, MERGED_FILENAME, OUTPUT_DIR, crawl_team_rows, ensure_output_dir,
+                     fetch_squad, finish_team, load_competitions, team_filename, team_is_finished, team_key)
+from helpers import DEFAULT_PARSER, PARSERS, extract_team_id
+
+warnings.simplefilter(action='ignore', category=FutureWarning)
+
+logger = logging.getLogger("sharded_crawl")
+
+DEFAULT_QUEUE = "crawl_queue.sqlite"
+
+
+def create_client(options):
+    """Eigener HTTP-Pool und RateLimiter pro Prozess; die Rate wird auf die Prozesse eines Rechners aufgeteilt."""
+    processes = max(1, options.get("processes", 1))
+    html_rate = options["requests_per_second"] / processes if options["requests_per_second"] else 0
+    api_rate = options["api_requests_per_second"] / processes if options["api_requests_per_second"] else 0
+    rate_limiter = RateLimiter(html_rate=html_rate, api_rate=api_rate)
+    response_cache = ResponseCache(options["cache_db"]) if options.get("cache_db") else None
+    return HttpClient(rate_limiter=rate_limiter, response_cache=response_cache, base_url=options.get("base_url"))
+
+
+def plan(queue_path, competitions, options):
+    """Koordinator: legt pro Team der Competitions einen Shard an."""
+    client = create_client(options)
+    c_scraper = CompetitionScraper(competitions, client=client, parser=options["parser"])
+    queue = WorkQueue(queue_path)
+    added = 0
+    for comp in competitions:
+        try:
+            c_scraper.fetch_team_urls(comp)
+        except Exception as e:
+            logger.error("Fehler beim Abrufen der Teams für %s: %s", comp.name, e)
+            continue
+        for team_name, team_url in comp.teams.items():
+            team_id = extract_team_id(team_url)
+            payload = {
+                "competition_name": comp.name,
+                "competition_url": comp.base_url,
+                "season": comp.season,
+                "team_name": team_name,
+                "team_url": team_url,
+                "team_id": team_id,
+            }
+            if queue.add(team_key(comp, team_id), payload):
+                added += 1
+    logger.info("%d neue Shards angelegt, Stand der Warteschlange: %s", added, queue.counts())
+    queue.close()
+    client.close()
+
+
+def crawl_shard(payload, output_dir, client, player_scraper, parser, journal=None, registry=None, lite=False,
+                performance=None):
+    """Scraped ein Team und gibt den Namen der Team-Datei zurück."""
+    comp = Competition(name=payload["competition_name"], base_url=payload["competition_url"],
+                       season=payload["season"])
+    team_obj = Team(name=payload["team_name"], url=payload["team_url"], team_id=payload["team_id"])
+
+    filename = team_filename(comp, team_obj.name, team_obj.team_id, output_dir)
+    key = team_key(comp, team_obj.team_id)
+    if team_is_finished(filename, journal, key, refresh=performance is not None):
+        logger.info("Team %s (%s) bereits vorhanden, überspringe...", team_obj.name, team_obj.team_id)
+        return os.path.basename(filename)
+
+    logger.info("Starte Scraping für Team: %s (%s)", team_obj.name, team_obj.team_id)
+    t_scraper = TeamScraper(team_obj, client=client, parser=parser, detailed=lite)
+    player_basic_info_list = fetch_squad(t_scraper, journal, key)
+    logger.info("Gefundene Spieler für %s: %d", team_obj.name, len(player_basic_info_list))
+    if performance is not None:
+        performance.prepare_squad(comp, team_obj, player_basic_info_list)
+
+    team_rows = crawl_team_rows(player_scraper, comp, team_obj, player_basic_info_list, journal=journal,
+                                registry=registry)
+    finish_team(filename, team_rows, journal, key)
+    return os.path.basename(filename)
+
+
+def create_metrics(options, worker_id):
+    """Eigene Metriken pro Prozess; Profile landen in einem Unterverzeichnis pro Worker."""
+    profiler = None
+    if options.get("profile_stages"):
+        profiler = StageProfiler(options["profile_stages"], options["profiler"],
+                                 os.path.join(options["profile_dir"], worker_id))
+    metrics = CrawlMetrics(profiler)
+    set_default_metrics(metrics)
+    return metrics
+
+
+def write_metrics(metrics, metrics_out, worker_id):
+    """Schreibt die Metriken eines Workers, z.B. metrics.prom -> metrics.<worker_id>.prom."""
+    root, ext = os.path.splitext(metrics_out)
+    path = f"{root}.{worker_id}{ext}"
+    metrics.write(path)
+    logger.info("Metriken gespeichert in %s", path)
+
+
+def work(queue_path, output_dir, options):
+    """Worker: beansprucht Shards, bis die Warteschlange leer ist."""
+    worker_id = default_worker_id()
+    metrics = create_metrics(options, worker_id)
+    ensure_output_dir(output_dir)
+    client = create_client(options)
+    player_scraper = PlayerScraper(client=client, parser=options["parser"], typed=options.get("typed", False))
+    journal = CrawlJournal(options["journal"]) if options.get("journal") else None
+    # Dedupliziert nur innerhalb des Workers; Shards anderer Worker sehen ihre Spieler nicht
+    registry = PlayerRegistry(options.get("player_registry_size", DEFAULT_MAX_PLAYERS))
+    performance = None
+    if options.get("performance", "career") != "career":
+        performance = PerformanceRefresh(output_dir, options["performance"], client=client, parser=options["parser"],
+                                         typed=options.get("typed", False))
+    queue = WorkQueue(queue_path)
+    finished = 0
+    while True:
+        claimed = queue.claim(worker_id)
+        if claimed is None:
+            break
+        shard_id, payload = claimed
+        try:
+            with queue.lease(shard_id, worker_id):
+                result = crawl_shard(payload, output_dir, client, player_scraper, options["parser"], journal,
+                                     registry, options.get("lite", False), performance)
+        except Exception as e:
+            logger.error("Fehler in Shard %s: %s", shard_id, e)
+            if not queue.fail(shard_id, worker_id, e):
+                logger.warning("Shard %s gehört inzwischen einem anderen Worker", shard_id)
+            continue
+        if queue.complete(shard_id, worker_id, result):
+            finished += 1
+        else:
+            logger.warning("Shard %s gehört inzwischen einem anderen Worker, Abschluss übersprungen", shard_id)
+    logger.info("Worker %s fertig, %d Shards bearbeitet, Spieler-Registry: %s", worker_id, finished,
+                registry.stats())
+    if performance is not None:
+        logger.info("Leistungsdaten: %s", performance.stats())
+    queue.close()
+    if journal is not None:
+        journal.close()
+    metrics.print_summary()
+    if options.get("metrics_out"):
+        write_metrics(metrics, options["metrics_out"], worker_id)
+    client.close()
+
+
+def work_process(queue_path, output_dir, options):
+    """Einstiegspunkt eines gestarteten Worker-Prozesses: eigenes Logging, das vor dem Beenden geleert wird."""
+    configure_logging(**options["logging"])
+    try:
+        work(queue_path, output_dir, options)
+    finally:
+        shutdown_logging()
+
+
+def run_workers(queue_path, output_dir, options):
+    """Startet `processes` Worker-Prozesse auf diesem Rechner und wartet auf sie."""
+    processes = options["processes"]
+    if processes <= 1:
+        work(queue_path, output_dir, options)
+        return
+    # spawn statt fork: kein geerbter Session-Pool, keine geerbten SQLite-Verbindungen
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=work_process, args=(queue_path, output_dir, options), name=f"worker-{i}")
+               for i in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def merge(queue_path, output_dir, merged_filename=MERGED_FILENAME):
+    """Fasst die Team-Dateien aller erledigten Shards in einer Datei zusammen."""
+    queue = WorkQueue(queue_path)
+    counts = queue.counts()
+    if counts["pending"] or counts["claimed"]:
+        logger.warning("Warteschlange noch nicht abgearbeitet: %s", counts)
+    all_rows = []
+    for name in queue.results():
+        path = os.path.join(output_dir, name)
+        if not os.path.exists(path):
+            logger.warning("%s fehlt, wird beim Zusammenführen übersprungen", path)
+            continue
+        with open(path, encoding='utf-8') as f:
+            all_rows.extend(json.load(f))
+    queue.close()
+
+    merged_path = os.path.join(output_dir, merged_filename)
+    with open(merged_path, 'w', encoding='utf-8') as f:
+        json.dump(all_rows, f, ensure_ascii=False, indent=2)
+    logger.info("%d Spieler in %s zusammengeführt", len(all_rows), merged_path)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Verteilter Crawl über eine SQLite-Warteschlange")
+    parser.add_argument("command", choices=["plan", "work", "merge", "run"],
+                        help="plan: Shards anlegen, work: Shards abarbeiten, merge: all_data.json schreiben, "
+                             "run: alles nacheinander auf diesem Rechner")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE, help="SQLite-Datei der Warteschlange")
+    parser.add_argument("--competitions-file", default="competitions_tm_germany.json")
+    parser.add_argument("--competition", action="append", dest="competitions",
+                        help="Name einer Competition (mehrfach möglich, Standard: die vier Ligen aus app.py)")
+    parser.add_argument("--season", type=int, default=2024)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                        help="Anzahl Worker-Prozesse auf diesem Rechner")
+    parser.add_argument("--requests-per-second", type=float, default=0.5,
+                        help="HTML-Rate pro Rechner, wird auf die Worker-Prozesse aufgeteilt (0 = unbegrenzt)")
+    parser.add_argument("--api-requests-per-second", type=float, default=1.0,
+                        help="Rate der Marktwert-API pro Rechner (0 = unbegrenzt)")
+    parser.add_argument("--parser", choices=PARSERS, default=DEFAULT_PARSER)
+    parser.add_argument("--base-url", default=None,
+                        help="Schickt alle Anfragen an diesen Server statt an transfermarkt.de (z.B. Benchmark-Server)")
+    parser.add_argument("--typed", action="store_true",
+                        help="Speichert Leistungsdaten als Zahlen und Datumsangaben als ISO-Datum")
+    parser.add_argument("--cache-db", default=None, help="SQLite-Datei für den persistenten HTTP-Antwort-Cache")
+    parser.add_argument("--player-registry-size", type=int, default=DEFAULT_MAX_PLAYERS,
+                        help="Maximale Anzahl Spieler, die pro Worker für weitere Shards im Speicher bleiben")
+    parser.add_argument("--lite", action="store_true",
+                        help="Liest die Stammdaten aus der ausführlichen Kaderansicht statt von jeder Profilseite")
+    parser.add_argument("--performance", choices=PERFORMANCE_MODES, default="career",
+                        help="season: nur nicht abgeschlossene Saisons pro Spieler, team: laufende Saison des "
+                             "Kaders von der Leistungsdaten-Seite des Vereins")
+    parser.add_argument("--journal", default=None,
+                        help="Gemeinsames Crawl-Journal; Teams mit fehlgeschlagenen Spielern werden erneut bearbeitet")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="Setzt endgültig fehlgeschlagene Shards vor dem Abarbeiten zurück")
+    parser.add_argument("--metrics-out", default=None,
+                        help="Metriken pro Worker, z.B. metrics.prom -> metrics.<rechner>-<pid>.prom")
+    parser.add_argument("--profile-stage", action="append", choices=STAGES, default=[],
+                        help="Profiliert eine Stufe in jedem Worker (mehrfach möglich)")
+    parser.add_argument("--profiler", choices=PROFILERS, default="cprofile")
+    parser.add_argument("--profile-dir", default="profiles", help="Zielverzeichnis, ein Unterverzeichnis pro Worker")
+    add_logging_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    options = {
+        "processes": args.processes,
+        "requests_per_second": args.requests_per_second,
+        "api_requests_per_second": args.api_requests_per_second,
+        "parser": args.parser,
+        "cache_db": args.cache_db,
+        "journal": args.journal,
+        "typed": args.typed,
+        "lite": args.lite,
+        "player_registry_size": args.player_registry_size,
+        "performance": args.performance,
+        "base_url": args.base_url,
+        "metrics_out": args.metrics_out,
+        "profile_stages": args.profile_stage,
+        "profiler": args.profiler,
+        "profile_dir": args.profile_dir,
+        "logging": {"level": args.log_level, "log_format": args.log_format, "log_file": args.log_file,
+                    "sample_rate": args.log_sample_rate},
+    }
+    configure_logging(**options["logging"])
+
+    if args.command in ("plan", "run"):
+        competitions = load_competitions(args.competitions_file, args.competitions or DEFAULT_COMPETITIONS,
+                                         args.season)
+        plan(args.queue, competitions, options)
+    if args.command in ("work", "run"):
+        if args.retry_failed:
+            queue = WorkQueue(args.queue)
+            logger.info("%d fehlgeschlagene Shards zurückgesetzt", queue.retry_failed())
+            queue.close()
+        run_workers(args.queue, args.output_dir, options)
+    if args.command in ("merge", "run"):
+        merge(args.queue, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()